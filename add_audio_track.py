@@ -3,10 +3,13 @@ import pyJianYingDraft as draft
 import time
 from util import generate_draft_url, url_to_hash, build_draft_asset_path
 from typing import Optional, Dict, Tuple, List
-from pyJianYingDraft import exceptions, Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type, CapCut_Voice_filters_effect_type,CapCut_Voice_characters_effect_type,CapCut_Speech_to_song_effect_type, trange
+from pyJianYingDraft import exceptions, trange
 from create_draft import get_or_create_draft
+from draft_cache import update_cache, with_draft_lock
 from settings.local import IS_CAPCUT_ENV
+from pyJianYingDraft.metadata import get_catalog_resolver
 
+@with_draft_lock
 def add_audio_track(
     audio_url: str,
     draft_folder: Optional[str] = None,
@@ -104,38 +107,9 @@ def add_audio_track(
     # Add scene sound effects
     if sound_effects:
         for effect_name, params in sound_effects:
-            # Choose different effect types based on IS_CAPCUT_ENV
-            effect_type = None
-            
-            if IS_CAPCUT_ENV:
-                # In CapCut environment, look for effects in CapCut_Voice_filters_effect_type
-                try:
-                    effect_type = getattr(CapCut_Voice_filters_effect_type, effect_name)
-                except AttributeError:
-                    try:
-                        # Look for effects in CapCut_Voice_characters_effect_type
-                        effect_type = getattr(CapCut_Voice_characters_effect_type, effect_name)
-                    except AttributeError:
-                        # If still not found, look for effects in CapCut_Speech_to_song_effect_type
-                        try:
-                            effect_type = getattr(CapCut_Speech_to_song_effect_type, effect_name)
-                        except AttributeError:
-                            effect_type = None
-            else:
-                # In JianYing environment, look for effects in Audio_scene_effect_type
-                try:
-                    effect_type = getattr(Audio_scene_effect_type, effect_name)
-                except AttributeError:
-                    # If not found in Audio_scene_effect_type, continue searching in other effect types
-                    try:
-                        effect_type = getattr(Tone_effect_type, effect_name)
-                    except AttributeError:
-                        # If still not found, look for effects in Speech_to_song_type
-                        try:
-                            effect_type = getattr(Speech_to_song_type, effect_name)
-                        except AttributeError:
-                            effect_type = None
-            
+            # Voice filters/characters/speech-to-song effects in CapCut, scene/tone/speech-to-song effects in JianYing
+            effect_type = get_catalog_resolver(IS_CAPCUT_ENV).resolve("audio_effect", effect_name)
+
             # If corresponding effect type is found, add it to the audio segment
             if effect_type:
                 audio_segment.add_effect(effect_type, params)
@@ -145,6 +119,9 @@ def add_audio_track(
     # Add audio segment to track
     script.add_segment(audio_segment, track_name=track_name)
     
+    # Persist the updated draft
+    update_cache(draft_id, script)
+
     return {
         "draft_id": draft_id,
         "draft_url": generate_draft_url(draft_id)
@@ -1,10 +1,13 @@
-from pyJianYingDraft import trange, Video_scene_effect_type, Video_character_effect_type, CapCut_Video_scene_effect_type, CapCut_Video_character_effect_type, exceptions
+from pyJianYingDraft import trange, exceptions
 import pyJianYingDraft as draft
 from typing import Optional, Dict, List, Union, Literal
 from create_draft import get_or_create_draft
+from draft_cache import update_cache, with_draft_lock
 from util import generate_draft_url
 from settings import IS_CAPCUT_ENV
+from pyJianYingDraft.metadata import get_catalog_resolver
 
+@with_draft_lock
 def add_effect_impl(
     effect_type: str,  # Changed to string type
     effect_category: Literal["scene", "character"],
@@ -42,31 +45,9 @@ def add_effect_impl(
 
     # Select the corresponding effect type based on effect category and environment
     effect_enum = None
-    if IS_CAPCUT_ENV:
-        # If in CapCut environment, use CapCut effects
-        if effect_category == "scene":
-            try:
-                effect_enum = CapCut_Video_scene_effect_type[effect_type]
-            except:
-                effect_enum = None
-        elif effect_category == "character":
-            try:
-                effect_enum = CapCut_Video_character_effect_type[effect_type]
-            except:
-                effect_enum = None
-    else:
-        # Default to using JianYing effects
-        if effect_category == "scene":
-            try:
-                effect_enum = Video_scene_effect_type[effect_type]
-            except:
-                effect_enum = None
-        elif effect_category == "character":
-            try:
-                effect_enum = Video_character_effect_type[effect_type]
-            except:
-                effect_enum = None
-    
+    if effect_category in ("scene", "character"):
+        effect_enum = get_catalog_resolver(IS_CAPCUT_ENV).resolve(f"{effect_category}_effect", effect_type)
+
     if effect_enum is None:
         raise ValueError(f"Unknown {effect_category} effect type: {effect_type}")
 
@@ -84,6 +65,9 @@ def add_effect_impl(
     # Add effect
     script.add_effect(effect_enum, t_range, params=params[::-1], track_name=track_name)
 
+    # Persist the updated draft
+    update_cache(draft_id, script)
+
     return {
         "draft_id": draft_id,
         "draft_url": generate_draft_url(draft_id)
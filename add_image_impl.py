@@ -2,12 +2,15 @@ import uuid
 import pyJianYingDraft as draft
 import time
 from settings.local import IS_CAPCUT_ENV
+from pyJianYingDraft.metadata import get_catalog_resolver
 from util import generate_draft_url, url_to_hash, build_draft_asset_path
 from pyJianYingDraft import trange, Clip_settings
 from typing import Optional, Dict
 from pyJianYingDraft import exceptions
 from create_draft import get_or_create_draft
+from draft_cache import update_cache, with_draft_lock
 
+@with_draft_lock
 def add_image_impl(
     image_url: str,
     draft_folder: Optional[str] = None,
@@ -142,61 +145,46 @@ def add_image_impl(
         )
     )
     
+    catalogs = get_catalog_resolver(IS_CAPCUT_ENV)
+
     # Add entrance animation (prioritize intro_animation, then use animation)
     intro_anim = intro_animation if intro_animation is not None else animation
     intro_animation_duration = intro_animation_duration if intro_animation_duration is not None else animation_duration
     if intro_anim:
-        try:
-            if IS_CAPCUT_ENV:
-                animation_type = getattr(draft.CapCut_Intro_type, intro_anim)
-            else:
-                animation_type = getattr(draft.Intro_type, intro_anim)
-            image_segment.add_animation(animation_type, intro_animation_duration * 1e6)  # Use microsecond unit for animation duration
-        except AttributeError:
+        animation_type = catalogs.resolve("intro", intro_anim)
+        if animation_type is None:
             raise ValueError(f"Warning: Unsupported entrance animation type {intro_anim}, this parameter will be ignored")
+        image_segment.add_animation(animation_type, intro_animation_duration * 1e6)  # Use microsecond unit for animation duration
     
     # Add exit animation
     if outro_animation:
-        try:
-            if IS_CAPCUT_ENV:
-                outro_type = getattr(draft.CapCut_Outro_type, outro_animation)
-            else:
-                outro_type = getattr(draft.Outro_type, outro_animation)
-            image_segment.add_animation(outro_type, outro_animation_duration * 1e6)  # Use microsecond unit for animation duration
-        except AttributeError:
+        outro_type = catalogs.resolve("outro", outro_animation)
+        if outro_type is None:
             raise ValueError(f"Warning: Unsupported exit animation type {outro_animation}, this parameter will be ignored")
+        image_segment.add_animation(outro_type, outro_animation_duration * 1e6)  # Use microsecond unit for animation duration
     
     # Add combo animation
     if combo_animation:
-        try:
-            if IS_CAPCUT_ENV:
-                combo_type = getattr(draft.CapCut_Group_animation_type, combo_animation)
-            else:
-                combo_type = getattr(draft.Group_animation_type, combo_animation)
-            image_segment.add_animation(combo_type, combo_animation_duration * 1e6)  # Use microsecond unit for animation duration
-        except AttributeError:
+        combo_type = catalogs.resolve("group_animation", combo_animation)
+        if combo_type is None:
             raise ValueError(f"Warning: Unsupported combo animation type {combo_animation}, this parameter will be ignored")
+        image_segment.add_animation(combo_type, combo_animation_duration * 1e6)  # Use microsecond unit for animation duration
     
     # Add transition effect
     if transition:
-        try:
-            if IS_CAPCUT_ENV:
-                transition_type = getattr(draft.CapCut_Transition_type, transition)
-            else:
-                transition_type = getattr(draft.Transition_type, transition)
-            # Convert seconds to microseconds (multiply by 1000000)
-            duration_microseconds = int(transition_duration * 1000000) if transition_duration is not None else None
-            image_segment.add_transition(transition_type, duration=duration_microseconds)
-        except AttributeError:
+        transition_type = catalogs.resolve("transition", transition)
+        if transition_type is None:
             raise ValueError(f"Warning: Unsupported transition type {transition}, this parameter will be ignored")
+        # Convert seconds to microseconds (multiply by 1000000)
+        duration_microseconds = int(transition_duration * 1000000) if transition_duration is not None else None
+        image_segment.add_transition(transition_type, duration=duration_microseconds)
     
     # Add mask effect
     if mask_type:
         try:
-            if IS_CAPCUT_ENV:
-                mask_type_enum = getattr(draft.CapCut_Mask_type, mask_type)
-            else:
-                mask_type_enum = getattr(draft.Mask_type, mask_type)
+            mask_type_enum = catalogs.resolve("mask", mask_type)
+            if mask_type_enum is None:
+                raise ValueError(f"Unsupported mask type {mask_type}")
             image_segment.add_mask(
                 script,
                 mask_type_enum,  # Remove keyword name, pass as positional argument
@@ -232,6 +220,9 @@ def add_image_impl(
     # Add image segment to track
     script.add_segment(image_segment, track_name=track_name)
     
+    # Persist the updated draft
+    update_cache(draft_id, script)
+
     return {
         "draft_id": draft_id,
         "draft_url": generate_draft_url(draft_id)
@@ -3,8 +3,10 @@ from pyJianYingDraft import trange
 from typing import Optional, Dict
 from pyJianYingDraft import exceptions
 from create_draft import get_or_create_draft
+from draft_cache import update_cache, with_draft_lock
 from util import generate_draft_url
 
+@with_draft_lock
 def add_sticker_impl(
     resource_id: str,
     start: float,
@@ -80,6 +82,9 @@ def add_sticker_impl(
     # Add sticker segment to track
     script.add_segment(sticker_segment, track_name=track_name)
 
+    # Persist the updated draft
+    update_cache(draft_id, script)
+
     return {
         "draft_id": draft_id,
         "draft_url": generate_draft_url(draft_id)
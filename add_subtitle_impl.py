@@ -1,11 +1,13 @@
 import pyJianYingDraft as draft
 from util import generate_draft_url, hex_to_rgb
 from create_draft import get_or_create_draft
+from draft_cache import update_cache, with_draft_lock
 from pyJianYingDraft.text_segment import TextBubble, TextEffect
 from typing import Optional
 import requests
 import os
 
+@with_draft_lock
 def add_subtitle_impl(
     srt_path: str,
     draft_id: str = None,
@@ -163,6 +165,9 @@ def add_subtitle_impl(
         effect=text_effect
     )
 
+    # Persist the updated draft
+    update_cache(draft_id, script)
+
     return {
         "draft_id": draft_id,
         "draft_url": generate_draft_url(draft_id)
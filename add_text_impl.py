@@ -1,12 +1,15 @@
 import pyJianYingDraft as draft
 from settings.local import IS_CAPCUT_ENV
+from pyJianYingDraft.metadata import get_catalog_resolver
 from util import generate_draft_url, hex_to_rgb
-from pyJianYingDraft import trange, Font_type
+from pyJianYingDraft import trange
 from typing import Optional, List  # add List type hint
 from pyJianYingDraft import exceptions
 from create_draft import get_or_create_draft
+from draft_cache import update_cache, with_draft_lock
 from pyJianYingDraft.text_segment import TextBubble, TextEffect, TextStyleRange
 
+@with_draft_lock
 def add_text_impl(
     text: str,
     start: float,
@@ -102,14 +105,13 @@ def add_text_impl(
     :return: Updated draft information
     """
     # Validate if font is in Font_type
+    catalogs = get_catalog_resolver(IS_CAPCUT_ENV)
     if font is None:
         font_type = None
     else:
-        try:
-            font_type = getattr(Font_type, font)
-        except:
-            available_fonts = [attr for attr in dir(Font_type) if not attr.startswith('_')]
-            raise ValueError(f"Unsupported font: {font}, please use one of the fonts in Font_type: {available_fonts}")
+        font_type = catalogs.resolve("font", font)
+        if font_type is None:
+            raise ValueError(f"Unsupported font: {font}, please use one of the fonts in Font_type: {catalogs.names('font')}")
     
     # Validate alpha value range
     if not 0.0 <= font_alpha <= 1.0:
@@ -239,33 +241,30 @@ def add_text_impl(
 
     # Add intro animation
     if intro_animation:
-        try:
-            if IS_CAPCUT_ENV:
-                animation_type = getattr(draft.CapCut_Text_intro, intro_animation)
-            else:
-                animation_type = getattr(draft.Text_intro, intro_animation)
+        animation_type = catalogs.resolve("text_intro", intro_animation)
+        if animation_type is None:
+            print(f"Warning: Unsupported intro animation type {intro_animation}, this parameter will be ignored")
+        else:
             # Convert seconds to microseconds
             duration_microseconds = int(intro_duration * 1000000)
             text_segment.add_animation(animation_type, duration_microseconds)  # Add intro animation, set duration
-        except:
-            print(f"Warning: Unsupported intro animation type {intro_animation}, this parameter will be ignored")
 
     # Add outro animation
     if outro_animation:
-        try:
-            if IS_CAPCUT_ENV:
-                animation_type = getattr(draft.CapCut_Text_outro, outro_animation)
-            else:
-                animation_type = getattr(draft.Text_outro, outro_animation)
+        animation_type = catalogs.resolve("text_outro", outro_animation)
+        if animation_type is None:
+            print(f"Warning: Unsupported outro animation type {outro_animation}, this parameter will be ignored")
+        else:
             # Convert seconds to microseconds
             duration_microseconds = int(outro_duration * 1000000)
             text_segment.add_animation(animation_type, duration_microseconds)  # Add outro animation, set duration
-        except:
-            print(f"Warning: Unsupported outro animation type {outro_animation}, this parameter will be ignored")
 
     # Add text segment to track
     script.add_segment(text_segment, track_name=track_name)
 
+    # Persist the updated draft
+    update_cache(draft_id, script)
+
     return {
         "draft_id": draft_id,
         "draft_url": generate_draft_url(draft_id)
@@ -1,10 +1,13 @@
 import pyJianYingDraft as draft
 from pyJianYingDraft import exceptions
 from create_draft import get_or_create_draft
+from draft_cache import update_cache, with_draft_lock
+from draft_store import DraftVersionConflict
 from typing import Optional, Dict, List
 
 from util import generate_draft_url
 
+@with_draft_lock
 def add_video_keyframe_impl(
     draft_id: Optional[str] = None,
     track_name: str = "main",
@@ -99,6 +102,9 @@ def add_video_keyframe_impl(
             except Exception as e:
                 raise Exception(f"Failed to add keyframe #{i+1} (property_type={kf['property_type']}, time={kf['time']}, value={kf['value']}): {str(e)}")
         
+        # Persist the updated draft
+        update_cache(draft_id, script)
+
         result = {
             "draft_id": draft_id,
             "draft_url": generate_draft_url(draft_id)
@@ -112,6 +118,9 @@ def add_video_keyframe_impl(
         
     except exceptions.TrackNotFound:
         raise Exception(f"Track named {track_name} not found")
+    except DraftVersionConflict:
+        # Let with_draft_lock replay the edit on the latest version
+        raise
     except Exception as e:
         raise Exception(f"Failed to add keyframe: {str(e)}")
 
@@ -1,12 +1,15 @@
 import pyJianYingDraft as draft
 import time
 from settings.local import IS_CAPCUT_ENV
+from pyJianYingDraft.metadata import get_catalog_resolver
 from util import generate_draft_url, url_to_hash, build_draft_asset_path
 from pyJianYingDraft import trange, Clip_settings
 from typing import Optional, Dict
 from pyJianYingDraft import exceptions
 from create_draft import get_or_create_draft
+from draft_cache import update_cache, with_draft_lock
 
+@with_draft_lock
 def add_video_track(
     video_url: str,
     draft_folder: Optional[str] = None,
@@ -159,30 +162,27 @@ def add_video_track(
         volume=volume
     )
     
+    catalogs = get_catalog_resolver(IS_CAPCUT_ENV)
+
     # Add transition effect
     if transition:
-        try:
-            # Get transition type
-            if IS_CAPCUT_ENV:
-                transition_type = getattr(draft.CapCut_Transition_type, transition)
-            else:
-                transition_type = getattr(draft.Transition_type, transition)
-            
-            # Set transition duration (convert to microseconds)
-            duration_microseconds = int(transition_duration * 1e6)
-            
-            # Add transition
-            video_segment.add_transition(transition_type, duration=duration_microseconds)
-        except AttributeError:
+        # Get transition type
+        transition_type = catalogs.resolve("transition", transition)
+        if transition_type is None:
             raise ValueError(f"Unsupported transition type: {transition}, transition setting skipped")
+
+        # Set transition duration (convert to microseconds)
+        duration_microseconds = int(transition_duration * 1e6)
+
+        # Add transition
+        video_segment.add_transition(transition_type, duration=duration_microseconds)
     
     # Add mask effect
     if mask_type:
         try:
-            if IS_CAPCUT_ENV:
-                mask_type_enum = getattr(draft.CapCut_Mask_type, mask_type)
-            else:
-                mask_type_enum = getattr(draft.Mask_type, mask_type)
+            mask_type_enum = catalogs.resolve("mask", mask_type)
+            if mask_type_enum is None:
+                raise ValueError(f"Unsupported mask type {mask_type}")
             video_segment.add_mask(
                 script,
                 mask_type_enum,
@@ -221,6 +221,9 @@ def add_video_track(
     # else:
     script.add_segment(video_segment, track_name=track_name)
     
+    # Persist the updated draft
+    update_cache(draft_id, script)
+
     return {
         "draft_id": draft_id,
         "draft_url": generate_draft_url(draft_id)
@@ -0,0 +1,200 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional
+
+from downloader import download_file
+from settings.local import ASSET_CACHE_CONFIG
+from util import link_or_copy, url_to_hash
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    """Content checksum of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetCache:
+    """Shared on-disk cache of downloaded media, addressed by content
+
+    Each URL hash maps to the SHA-256 checksum of what was downloaded from it, and every distinct
+    content is stored once under `<root>/blobs`. Draft folders receive hardlinks (or reflinks, or
+    copies) of the cached blobs, so an asset used by many drafts is downloaded once. Blobs are
+    evicted least recently used first once their total size exceeds `max_bytes`.
+
+    The index is a SQLite database in the cache directory, so several worker processes can share one cache.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        """
+        :param root: Cache directory, created on first use
+        :param max_bytes: Maximum total size of cached blobs
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes_saved": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads, keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.join(self.root, "blobs"), exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.root, "index.db"), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS urls ("
+                    "url_hash TEXT PRIMARY KEY, "
+                    "checksum TEXT NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS blobs ("
+                    "checksum TEXT PRIMARY KEY, "
+                    "size INTEGER NOT NULL, "
+                    "last_used REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS blobs_last_used ON blobs (last_used)")
+            self._local.conn = conn
+        return conn
+
+    def blob_path(self, checksum: str) -> str:
+        return os.path.join(self.root, "blobs", checksum[:2], checksum)
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Path of the cached blob for `url`, None if it is not cached"""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT blobs.checksum FROM urls JOIN blobs ON blobs.checksum = urls.checksum WHERE urls.url_hash = ?",
+            (url_to_hash(url, 64),)
+        ).fetchone()
+        if row is None:
+            return None
+        path = self.blob_path(row[0])
+        if not os.path.exists(path):
+            # Removed behind our back, forget it so it is downloaded again
+            with conn:
+                conn.execute("DELETE FROM blobs WHERE checksum = ?", (row[0],))
+            return None
+        with conn:
+            conn.execute("UPDATE blobs SET last_used = ? WHERE checksum = ?", (time.time(), row[0]))
+        return path
+
+    def fetch(self, url: str, local_filename: str, download: Callable[[str, str], bool]) -> bool:
+        """Place the content of `url` at `local_filename`, downloading it only on a cache miss
+
+        :param url: Remote URL
+        :param local_filename: Destination path inside the draft folder
+        :param download: Function downloading a URL to a path, returning whether it succeeded
+        :return: Whether the file is now at `local_filename`
+        """
+        cached = self.lookup(url)
+        if cached is not None:
+            try:
+                size = os.path.getsize(cached)
+                link_or_copy(cached, local_filename)
+            except FileNotFoundError:
+                # Evicted by another process in the meantime, download it again
+                pass
+            else:
+                with self._stats_lock:
+                    self._stats["hits"] += 1
+                    self._stats["bytes_saved"] += size
+                return True
+
+        with self._stats_lock:
+            self._stats["misses"] += 1
+        # Download inside the cache directory so the blob can be renamed into place atomically
+        temp_path = os.path.join(self.root, f"incoming-{uuid.uuid4().hex}")
+        os.makedirs(self.root, exist_ok=True)
+        try:
+            if not download(url, temp_path) or not os.path.exists(temp_path):
+                return False
+            blob = self.add(url, temp_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        link_or_copy(blob, local_filename)
+        return True
+
+    def add(self, url: str, path: str) -> str:
+        """Store the file at `path` as the content of `url`, consuming the file
+
+        :return: Path of the cached blob
+        """
+        checksum = file_sha256(path)
+        size = os.path.getsize(path)
+        blob = self.blob_path(checksum)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        if os.path.exists(blob):
+            # Same content already cached under another URL
+            os.remove(path)
+        else:
+            os.replace(path, blob)
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO blobs (checksum, size, last_used) VALUES (?, ?, ?) "
+                "ON CONFLICT(checksum) DO UPDATE SET last_used = excluded.last_used",
+                (checksum, size, time.time())
+            )
+            conn.execute(
+                "INSERT INTO urls (url_hash, checksum) VALUES (?, ?) "
+                "ON CONFLICT(url_hash) DO UPDATE SET checksum = excluded.checksum",
+                (url_to_hash(url, 64), checksum)
+            )
+        self._evict(keep=checksum)
+        return blob
+
+    def _evict(self, keep: str) -> None:
+        conn = self._connect()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for checksum, size in conn.execute("SELECT checksum, size FROM blobs ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            if checksum == keep:
+                continue
+            with conn:
+                conn.execute("DELETE FROM blobs WHERE checksum = ?", (checksum,))
+                conn.execute("DELETE FROM urls WHERE checksum = ?", (checksum,))
+            # Drafts holding a hardlink keep their copy of the data
+            try:
+                os.remove(self.blob_path(checksum))
+            except FileNotFoundError:
+                pass
+            total -= size
+            with self._stats_lock:
+                self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        conn = self._connect()
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        with self._stats_lock:
+            return dict(self._stats, entries=entries, size_bytes=size, max_bytes=self.max_bytes)
+
+
+ASSET_CACHE: Optional[AssetCache] = None
+if ASSET_CACHE_CONFIG.get("enabled", True):
+    ASSET_CACHE = AssetCache(ASSET_CACHE_CONFIG["path"], int(ASSET_CACHE_CONFIG["max_size_mb"] * 1024 * 1024))
+
+
+def download_asset(url: str, local_filename: str) -> bool:
+    """Download a draft asset through the shared asset cache
+
+    Local files and disabled caches fall through to `download_file`.
+    """
+    if ASSET_CACHE is None or os.path.isfile(url):
+        return download_file(url, local_filename)
+    return ASSET_CACHE.fetch(url, local_filename, download_file)
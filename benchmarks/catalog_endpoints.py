@@ -0,0 +1,85 @@
+"""Benchmark of the /get_*_types catalog endpoints
+
+Run from the repository root:
+
+    python benchmarks/catalog_endpoints.py [--requests 200] [--repeat 5]
+
+Serves the largest catalogs through the Flask test client with the pre-encoded responses, next to the
+previous handlers (mounted under /previous) that rebuilt and jsonified the list on every request, and
+with a conditional request answered by 304. Also reports the size of the combined /catalog payload, plain and gzip-compressed.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import jsonify  # noqa: E402
+
+import capcut_server  # noqa: E402
+from catalog_responses import AUDIO_EFFECT_CATALOGS, NAME_CATALOGS  # noqa: E402
+from pyJianYingDraft import metadata  # noqa: E402
+from pyJianYingDraft.metadata import get_catalog_resolver  # noqa: E402
+
+ENDPOINTS = ("video_scene_effect", "audio_effect", "font")
+
+
+def previous_handler(name: str):
+    """The previous handlers: iterate the enum members and jsonify on every request"""
+    is_capcut_env = capcut_server.IS_CAPCUT_ENV
+    output = []
+    if name == "audio_effect":
+        for enum_name, effect_type in AUDIO_EFFECT_CATALOGS[is_capcut_env]:
+            for member_name, member in getattr(metadata, enum_name).__members__.items():
+                params_info = []
+                for param in member.value.params:
+                    params_info.append({"name": param.name, "default_value": param.default_value * 100,
+                                        "min_value": param.min_value * 100, "max_value": param.max_value * 100})
+                output.append({"name": member_name, "type": effect_type, "params": params_info})
+    else:
+        for catalog in get_catalog_resolver(is_capcut_env).catalogs(NAME_CATALOGS[name]):
+            for member_name in catalog.__members__:
+                output.append({"name": member_name})
+    return jsonify({"success": True, "output": output, "error": ""})
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = capcut_server.app
+    app.add_url_rule("/previous/<name>", "previous", previous_handler)
+    client = app.test_client()
+    print(f"{'endpoint':>20} {'previous':>10} {'encoded':>10} {'304':>10}")
+    for name in ENDPOINTS:
+        route = f"/get_{name}_types"
+        etag = client.get(route).headers["ETag"]
+
+        previous_seconds = best_of(args.repeat, lambda: [client.get(f"/previous/{name}").get_data()
+                                                         for _ in range(args.requests)])
+        encoded_seconds = best_of(args.repeat, lambda: [client.get(route).get_data() for _ in range(args.requests)])
+        cached_seconds = best_of(args.repeat, lambda: [client.get(route, headers={"If-None-Match": etag})
+                                                       for _ in range(args.requests)])
+        print(f"{name:>20} {previous_seconds / args.requests * 1e6:>8.0f}us "
+              f"{encoded_seconds / args.requests * 1e6:>8.0f}us {cached_seconds / args.requests * 1e6:>8.0f}us")
+
+    plain = client.get("/catalog").get_data()
+    compressed = client.get("/catalog", headers={"Accept-Encoding": "gzip"}).get_data()
+    print(f"/catalog: {len(plain) / 1024:.0f}KB plain, {len(compressed) / 1024:.0f}KB gzip")
+
+
+if __name__ == "__main__":
+    main()
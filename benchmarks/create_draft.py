@@ -0,0 +1,65 @@
+"""Benchmark of draft creation throughput
+
+Run from the repository root:
+
+    python benchmarks/create_draft.py [--count 5000] [--repeat 5]
+
+Times constructing Script_file objects with the template parsed once per process, next to the previous
+constructor that opened and parsed draft_content_template.json for every draft, and create_draft, which
+also registers the new draft in the draft store configured in settings.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyJianYingDraft as draft  # noqa: E402
+from create_draft import create_draft  # noqa: E402
+from pyJianYingDraft import script_file  # noqa: E402
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(script_file.__file__), draft.Script_file.TEMPLATE_FILE)
+
+
+def previous_construct() -> draft.Script_file:
+    """The previous constructor: the template is read and parsed for every draft"""
+    script = draft.Script_file.__new__(draft.Script_file)
+    script.save_path = None
+    script.width, script.height, script.fps, script.duration = 1080, 1920, 30, 0
+    script.materials = script_file.Script_material()
+    script.tracks = {}
+    script.imported_materials = {}
+    script.imported_tracks = []
+    with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
+        script.content = json.load(f)
+    return script
+
+
+def throughput(repeat: int, count: int, func) -> float:
+    """Best drafts per second over `repeat` runs of `count` creations"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'':>22} {'drafts/s':>10}")
+    print(f"{'Script_file, previous':>22} {throughput(args.repeat, args.count, previous_construct):>10.0f}")
+    print(f"{'Script_file, cached':>22} {throughput(args.repeat, args.count, lambda: draft.Script_file(1080, 1920)):>10.0f}")
+    print(f"{'create_draft':>22} {throughput(args.repeat, args.count, create_draft):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark of draft serialization with Script_file.dumps
+
+Run from the repository root:
+
+    python benchmarks/draft_dumps.py [--sizes 1000 10000] [--repeat 5]
+
+Builds a draft with one video track and one text track holding the given number of segments each (the
+table reports the total), then times the indented output, the compact standard library output and the compact orjson output (if installed).
+"""
+
+import argparse
+import os
+import sys
+import time
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyJianYingDraft as draft  # noqa: E402
+from pyJianYingDraft import script_file  # noqa: E402
+
+SEGMENT_DURATION = 1_500_000
+
+
+def build_script(count: int) -> draft.Script_file:
+    script = draft.Script_file(1080, 1920)
+    script.add_track(draft.Track_type.video).add_track(draft.Track_type.text)
+    material = draft.Video_material(material_type="photo", replace_path="/tmp/frame.png", remote_url="https://example.com/frame.png",
+                                    material_name="frame.png", duration=10_800_000_000, width=1080, height=1920)
+    for index in range(count):
+        timerange = draft.Timerange(index * SEGMENT_DURATION, SEGMENT_DURATION)
+        script.add_segment(draft.Video_segment(material, timerange))
+        script.add_segment(draft.Text_segment(f"字幕 line {index}", timerange))
+    return script
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    orjson = script_file.orjson
+    print(f"{'segments':>9} {'indent=4':>10} {'compact json':>13} {'compact orjson':>15} {'size indent':>12} {'size compact':>13}")
+    for size in args.sizes:
+        script = build_script(size)
+        pretty = script.dumps()
+        compact = script.dumps(indent=None)
+        assert json.loads(pretty) == json.loads(compact)
+
+        pretty_seconds = best_of(args.repeat, script.dumps)
+        script_file.orjson = None
+        try:
+            json_seconds = best_of(args.repeat, lambda: script.dumps(indent=None))
+        finally:
+            script_file.orjson = orjson
+        orjson_seconds = best_of(args.repeat, lambda: script.dumps(indent=None)) if orjson is not None else float("nan")
+        print(f"{2 * size:>9} {pretty_seconds:>9.3f}s {json_seconds:>12.3f}s {orjson_seconds:>14.3f}s "
+              f"{len(pretty.encode()) / 2 ** 20:>10.1f}MB {len(compact.encode()) / 2 ** 20:>11.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark of resolving effect names with Effect_enum.from_name
+
+Run from the repository root:
+
+    python benchmarks/effect_lookup.py [--repeat 5]
+
+Looks up every member of the largest effect catalogs by name, with the indexed from_name and with the
+previous linear scan, and times suggest() for a misspelt name of every member.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyJianYingDraft as draft  # noqa: E402
+
+
+def linear_from_name(enum_cls, name: str):
+    """The previous Effect_enum.from_name"""
+    name = name.lower().replace(" ", "").replace("_", "")
+    for effect in enum_cls:
+        if effect.name.lower().replace(" ", "").replace("_", "") == name:
+            return effect
+    raise ValueError(f"Effect named '{name}' not found")
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'catalog':>32} {'members':>8} {'linear/lookup':>14} {'indexed/lookup':>15} {'suggest':>9}")
+    for enum_cls in (draft.Video_scene_effect_type, draft.CapCut_Video_scene_effect_type, draft.Filter_type):
+        names = [effect.name for effect in enum_cls]
+        typos = [name[:-1] for name in names]
+        enum_cls.from_name(names[0])  # build the index outside the timings
+        linear = best_of(args.repeat, lambda: [linear_from_name(enum_cls, name) for name in names])
+        indexed = best_of(args.repeat, lambda: [enum_cls.from_name(name) for name in names])
+        suggest = best_of(args.repeat, lambda: [enum_cls.suggest(name) for name in typos])
+        print(f"{enum_cls.__name__:>32} {len(names):>8} {linear / len(names) * 1e6:>12.1f}us "
+              f"{indexed / len(names) * 1e6:>13.2f}us {suggest / len(names) * 1e6:>7.0f}us")
+
+
+if __name__ == "__main__":
+    main()
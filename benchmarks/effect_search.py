@@ -0,0 +1,83 @@
+"""Benchmark of searching the effect catalogs with Catalog_search
+
+Run from the repository root:
+
+    python benchmarks/effect_search.py [--repeat 5] [--capcut]
+
+Reports the time to build the index, then the latency of one page (50 results) of prefix, substring
+and fuzzy queries with and without filters, next to a linear scan over every member that applies the
+same matching and filters.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyJianYingDraft.metadata import Catalog_search, get_catalog_resolver  # noqa: E402
+
+QUERIES = {
+    False: [("prefix", "爱心", {}), ("substring", "光", {}), ("substring", "爱心光", {"is_vip": False}),
+            ("fuzzy", "爱心光坡", {}), ("substring", "", {"params": ["effects_adjust_blur"]})],
+    True: [("prefix", "Ret", {}), ("substring", "light", {}), ("substring", "glow", {"is_vip": False}),
+           ("fuzzy", "sparkel", {}), ("substring", "", {"params": ["effects_adjust_blur"]})],
+}
+
+
+def linear_search(search: Catalog_search, query: str, mode: str, is_vip=None, params=()):
+    """Match every member in turn, the way a client filtering the full list does"""
+    query = query.lower().replace(" ", "").replace("_", "")
+    matches = []
+    for category, member in search.entries:
+        name = member.name.lower().replace(" ", "").replace("_", "")
+        if mode == "prefix" and not name.startswith(query):
+            continue
+        if mode == "substring" and query not in name:
+            continue
+        if is_vip is not None and member.value.is_vip != is_vip:
+            continue
+        if any(param not in [p.name for p in member.value.params] for param in params):
+            continue
+        matches.append((category, member))
+    return matches[:50]
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--capcut", action="store_true", help="search the CapCut catalogs")
+    args = parser.parse_args()
+
+    resolver = get_catalog_resolver(args.capcut)
+    for category in ("scene_effect", "character_effect", "filter", "audio_effect", "font"):
+        resolver.catalogs(category)  # import the catalogs outside the timings
+    build = best_of(args.repeat, lambda: Catalog_search(resolver))
+    search = Catalog_search(resolver)
+    print(f"{len(search.entries)} members, index built in {build * 1000:.1f}ms")
+
+    print(f"{'query':>50} {'results':>8} {'linear':>9} {'indexed':>9}")
+    for mode, query, filters in QUERIES[args.capcut]:
+        total = search.search(query, mode, **filters).total
+        runs = 200
+        indexed = best_of(args.repeat, lambda: [search.search(query, mode, **filters) for _ in range(runs)]) / runs
+        label = f"{mode} '{query}' {filters or ''}"
+        if mode == "fuzzy":
+            print(f"{label:>50} {total:>8} {'':>9} {indexed * 1e6:>7.0f}us")
+            continue
+        linear = best_of(args.repeat, lambda: [linear_search(search, query, mode, **filters) for _ in range(runs)]) / runs
+        print(f"{label:>50} {total:>8} {linear * 1e6:>7.0f}us {indexed * 1e6:>7.0f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark of cold-start import time and memory
+
+Run from the repository root:
+
+    python benchmarks/import_time.py [--repeat 5]
+
+Imports each target in a fresh interpreter and reports the best wall time of the import and the
+peak RSS of the process. "all catalogs" additionally touches every metadata enum after importing
+pyJianYingDraft, which is what a process that does use the catalogs pays in total.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import resource, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+TARGETS = {
+    "python": "pass",
+    "pyJianYingDraft": "import pyJianYingDraft",
+    "all catalogs": "import pyJianYingDraft as draft\n"
+                    "[getattr(draft, name) for name in draft.__all__]",
+    "mcp_server": "import mcp_server",
+}
+
+
+def measure(statement: str, repeat: int):
+    best_seconds, rss_kb = float("inf"), 0
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(statement=statement)], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.split()
+        seconds, rss = float(output[-2]), int(output[-1])
+        if seconds < best_seconds:
+            best_seconds, rss_kb = seconds, rss
+    return best_seconds, rss_kb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'target':>16} {'import':>9} {'peak RSS':>10}")
+    for name, statement in TARGETS.items():
+        seconds, rss_kb = measure(statement, args.repeat)
+        print(f"{name:>16} {seconds * 1000:>7.0f}ms {rss_kb / 1024:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark of repeated draft exports with the per-segment export cache
+
+Run from the repository root:
+
+    python benchmarks/incremental_export.py [--sizes 1000 10000] [--repeat 5]
+
+Builds a draft with one video track and one text track holding the given number of segments each, then
+times Script_file.export_content with every segment marked dirty (the previous behaviour), with nothing
+changed since the last export, and after editing one text segment.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from draft_dumps import build_script  # noqa: E402
+
+
+def mark_all_dirty(script) -> None:
+    for track in script.tracks.values():
+        for segment in track.segments:
+            segment.mark_dirty()
+
+
+def best_of(repeat: int, func, before=None) -> float:
+    timings = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'segments':>9} {'full export':>12} {'unchanged':>10} {'one edit':>9}")
+    for size in args.sizes:
+        script = build_script(size)
+        text_segments = next(track for track in script.tracks.values() if track.name == "text").segments
+
+        def edit_one() -> None:
+            segment = text_segments[size // 2]
+            segment.text = f"edited {time.perf_counter()}"
+            segment.mark_dirty()
+
+        full_seconds = best_of(args.repeat, script.export_content, lambda: mark_all_dirty(script))
+        unchanged_seconds = best_of(args.repeat, script.export_content)
+        edit_seconds = best_of(args.repeat, script.export_content, edit_one)
+        print(f"{2 * size:>9} {full_seconds:>11.3f}s {unchanged_seconds:>9.3f}s {edit_seconds:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark of adding many video segments to a draft
+
+Run from the repository root:
+
+    python benchmarks/material_index.py [--sizes 1000 5000 20000]
+
+Adds photo segments with their own material and animations to a video track via Script_file.add_segment,
+which checks each material against the draft's material lists, with the indexed membership check and with
+the previous list scans.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyJianYingDraft as draft  # noqa: E402
+from pyJianYingDraft.animation import Segment_animations  # noqa: E402
+from pyJianYingDraft.script_file import Script_material  # noqa: E402
+
+
+def linear_contains(self, item) -> bool:
+    """The previous Script_material.__contains__, for the two lists this benchmark fills"""
+    if isinstance(item, draft.Video_material):
+        return item.material_id in [video.material_id for video in self.videos]
+    return item.animation_id in [ani.animation_id for ani in self.animations]
+
+
+def build_segments(count: int):
+    segments = []
+    for index in range(count):
+        material = draft.Video_material(material_type="photo", replace_path=f"/tmp/frame{index}.png",
+                                        remote_url=f"https://example.com/frame{index}.png",
+                                        material_name=f"frame{index}.png", duration=10_000_000, width=1080, height=1920)
+        segment = draft.Video_segment(material, draft.Timerange(index * 1_000_000, 1_000_000))
+        segment.animations_instance = Segment_animations()
+        segments.append(segment)
+    return segments
+
+
+def add_all(count: int) -> float:
+    script = draft.Script_file(1080, 1920)
+    script.add_track(draft.Track_type.video)
+    segments = build_segments(count)
+    start = time.perf_counter()
+    for segment in segments:
+        script.add_segment(segment)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    args = parser.parse_args()
+
+    indexed_contains = Script_material.__contains__
+    print(f"{'segments':>9} {'linear':>9} {'indexed':>9}")
+    for size in args.sizes:
+        Script_material.__contains__ = linear_contains
+        try:
+            linear_seconds = add_all(size)
+        finally:
+            Script_material.__contains__ = indexed_contains
+        indexed_seconds = add_all(size)
+        print(f"{size:>9} {linear_seconds:>8.3f}s {indexed_seconds:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
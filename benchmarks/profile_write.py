@@ -0,0 +1,72 @@
+"""Benchmark of writing a draft document to every file of the jianying_pro_10 profile
+
+Run from the repository root:
+
+    python benchmarks/profile_write.py [--sizes 1000 10000 50000] [--repeat 5]
+
+Encodes a draft with the given number of segments per track, then writes it to the content file,
+its mirrors and one timeline directory, the way save_draft_background does. Compares the previous
+writer, which parsed the document again for its id and encoded and wrote every copy separately,
+with write_profile_content.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from draft_dumps import build_script  # noqa: E402
+from draft_profiles import get_draft_profile, write_profile_content  # noqa: E402
+
+
+def previous_write(profile, draft_dir: Path, content: str) -> None:
+    content_data = json.loads(content)
+    targets = [profile.content_file, *profile.content_mirrors]
+    for relative_path in targets:
+        (draft_dir / relative_path).write_text(content, encoding="utf-8")
+    timeline_dir = draft_dir / "Timelines" / content_data["id"]
+    for relative_path in {*targets, profile.timeline_content_file}:
+        (timeline_dir / relative_path).write_text(content, encoding="utf-8")
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    profile = get_draft_profile("jianying_pro_10")
+    print(f"{'segments':>9} {'size':>8} {'previous':>9} {'write once':>11}")
+    for size in args.sizes:
+        script = build_script(size)
+        content = script.dumps(profile, indent=None)
+        timeline_id = script.content["id"]
+        draft_dir = Path(tempfile.mkdtemp())
+        try:
+            (draft_dir / "Timelines" / timeline_id).mkdir(parents=True)
+            previous_seconds = best_of(args.repeat, lambda: previous_write(profile, draft_dir, content))
+            current_seconds = best_of(args.repeat,
+                                      lambda: write_profile_content(profile, draft_dir, content, timeline_id))
+        finally:
+            shutil.rmtree(draft_dir)
+        megabytes = len(content.encode("utf-8")) / 1_000_000
+        print(f"{2 * size:>9} {megabytes:>6.1f}MB {previous_seconds:>8.3f}s {current_seconds:>10.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark of building long tracks and resolving keyframes by time
+
+Run from the repository root:
+
+    python benchmarks/track_index.py [--sizes 1000 5000 20000]
+
+Builds a subtitle-like text track segment by segment, then looks up the segment under one keyframe
+per segment the way `process_pending_keyframes` does, with the indexed track and with linear scans.
+The linear runs take close to two minutes at 20k segments.
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyJianYingDraft as draft  # noqa: E402
+from pyJianYingDraft.exceptions import SegmentOverlap  # noqa: E402
+from pyJianYingDraft.track import Track  # noqa: E402
+
+SEGMENT_DURATION = 1_500_000
+
+
+def build_segments(count: int) -> List[draft.Text_segment]:
+    return [draft.Text_segment(f"line {index}", draft.Timerange(index * SEGMENT_DURATION, SEGMENT_DURATION))
+            for index in range(count)]
+
+
+def linear_build(segments) -> Track:
+    """The previous add_segment: compare against every existing segment"""
+    track = Track(draft.Track_type.text, "text", 0, False)
+    for segment in segments:
+        for seg in track.segments:
+            if seg.overlaps(segment):
+                raise SegmentOverlap("overlap")
+        track.segments.append(segment)
+    return track
+
+
+def indexed_build(segments) -> Track:
+    track = Track(draft.Track_type.text, "text", 0, False)
+    for segment in segments:
+        track.add_segment(segment)
+    return track
+
+
+def linear_lookup(track: Track, times) -> None:
+    for target_time in times:
+        next((segment for segment in track.segments
+              if segment.target_timerange.start <= target_time <= segment.target_timerange.end), None)
+
+
+def indexed_lookup(track: Track, times) -> None:
+    for target_time in times:
+        track.segment_at(target_time)
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    args = parser.parse_args()
+
+    print(f"{'segments':>9} {'build linear':>13} {'build indexed':>14} {'lookup linear':>14} {'lookup indexed':>15}")
+    for size in args.sizes:
+        segments = build_segments(size)
+        times = [index * SEGMENT_DURATION + SEGMENT_DURATION // 2 for index in range(size)]
+        build_linear = timed(linear_build, segments)
+        track = indexed_build(segments)
+        build_indexed = timed(indexed_build, segments)
+        lookup_linear = timed(linear_lookup, track, times)
+        lookup_indexed = timed(indexed_lookup, track, times)
+        print(f"{size:>9} {build_linear:>12.3f}s {build_indexed:>13.4f}s {lookup_linear:>13.3f}s {lookup_indexed:>14.4f}s")
+
+
+if __name__ == "__main__":
+    main()
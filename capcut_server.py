@@ -1,20 +1,7 @@
 import requests
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, jsonify, Response, stream_with_context
 from datetime import datetime
 import pyJianYingDraft as draft
-from pyJianYingDraft.metadata.animation_meta import Intro_type, Outro_type, Group_animation_type
-from pyJianYingDraft.metadata.capcut_animation_meta import CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type
-from pyJianYingDraft.metadata.transition_meta import Transition_type
-from pyJianYingDraft.metadata.capcut_transition_meta import CapCut_Transition_type
-from pyJianYingDraft.metadata.mask_meta import Mask_type
-from pyJianYingDraft.metadata.capcut_mask_meta import CapCut_Mask_type
-from pyJianYingDraft.metadata.audio_effect_meta import Tone_effect_type, Audio_scene_effect_type, Speech_to_song_type
-from pyJianYingDraft.metadata.capcut_audio_effect_meta import CapCut_Voice_filters_effect_type, CapCut_Voice_characters_effect_type, CapCut_Speech_to_song_effect_type
-from pyJianYingDraft.metadata.font_meta import Font_type
-from pyJianYingDraft.metadata.animation_meta import Text_intro, Text_outro, Text_loop_anim
-from pyJianYingDraft.metadata.capcut_text_animation_meta import CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim
-from pyJianYingDraft.metadata.video_effect_meta import Video_scene_effect_type, Video_character_effect_type
-from pyJianYingDraft.metadata.capcut_effect_meta import CapCut_Video_scene_effect_type, CapCut_Video_character_effect_type
 import random
 import uuid
 import json
@@ -25,16 +12,25 @@ from add_text_impl import add_text_impl
 from add_subtitle_impl import add_subtitle_impl
 from add_image_impl import add_image_impl
 from add_video_keyframe_impl import add_video_keyframe_impl
-from save_draft_impl import save_draft_impl, query_task_status, query_script_impl
+from save_draft_impl import save_draft_impl, query_task_status, query_script_impl, cancel_save_task
 from add_effect_impl import add_effect_impl
 from add_sticker_impl import add_sticker_impl
 from create_draft import create_draft
+from draft_cache import get_cache_stats
+from asset_cache import ASSET_CACHE
+from catalog_responses import CACHE_CONTROL, EncodedResponse, effect_params, get_catalog_responses
+from downloader import get_download_stats
+from save_task_cache import FINISHED_STATUSES
 from util import generate_draft_url as utilgenerate_draft_url, hex_to_rgb
 from pyJianYingDraft.text_segment import TextStyleRange, Text_style, Text_border
+from pyJianYingDraft.metadata import get_catalog_search
 
 from settings.local import IS_CAPCUT_ENV, DRAFT_DOMAIN, PREVIEW_ROUTER, PORT
 
 app = Flask(__name__)
+
+# Largest page the /search_effects endpoint returns
+SEARCH_LIMIT_MAX = 200
  
 @app.route('/add_video', methods=['POST'])
 def add_video():
@@ -715,7 +711,7 @@ def query_script():
             return jsonify(result)
         
         # Convert script object to JSON serializable dictionary
-        script_str = script.dumps()
+        script_str = script.dumps(indent=None)
         
         result["success"] = True
         result["output"] = script_str
@@ -733,6 +729,7 @@ def save_draft():
     # Get required parameters
     draft_id = data.get('draft_id')
     draft_folder = data.get('draft_folder')  # Draft folder parameter
+    is_async = data.get('async', False)  # Queue the save and poll /query_draft_status instead of waiting
     
     result = {
         "success": False,
@@ -748,7 +745,11 @@ def save_draft():
     
     try:
         # Call save_draft_impl method, start background task
-        draft_result = save_draft_impl(draft_id, draft_folder)
+        draft_result = save_draft_impl(draft_id, draft_folder, is_async=is_async)
+
+        if is_async and not draft_result["success"]:
+            result["error"] = f"Error occurred while queueing draft save: {draft_result['error']}. "
+            return jsonify(result)
         
         result["success"] = True
         result["output"] = draft_result
@@ -759,6 +760,89 @@ def save_draft():
         result["error"] = error_message
         return jsonify(result)
 
+# Upper bound for a single long-poll or SSE heartbeat interval
+MAX_STATUS_WAIT_SECONDS = 30
+
+@app.route('/stream_draft_status', methods=['GET'])
+def stream_draft_status():
+    """Push task status changes as server-sent events until the task finishes"""
+    task_id = request.args.get('task_id')
+    if not task_id:
+        return jsonify({
+            "success": False,
+            "output": "",
+            "error": "Hi, the required parameter 'task_id' is missing. Please add it and try again."
+        })
+
+    # Reconnecting EventSource clients resume from the last event they received
+    try:
+        since_version = int(request.headers.get('Last-Event-ID') or request.args.get('since_version', 0))
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "output": "",
+            "error": "Hi, 'Last-Event-ID' and 'since_version' must be integer versions."
+        })
+
+    task_status = query_task_status(task_id)
+    if task_status["status"] in FINISHED_STATUSES and task_status["version"] <= since_version:
+        # The client already received the final event, 204 stops EventSource from reconnecting
+        return Response(status=204)
+
+    def generate():
+        version = since_version
+        while True:
+            task_status = query_task_status(task_id, version, MAX_STATUS_WAIT_SECONDS)
+            if task_status["status"] == "not_found":
+                yield f"event: error\ndata: {json.dumps(task_status)}\n\n"
+                return
+            # The final status is always sent, so the client learns the task finished before the stream closes
+            if task_status["version"] > version or task_status["status"] in FINISHED_STATUSES:
+                version = task_status["version"]
+                yield f"id: {version}\ndata: {json.dumps(task_status)}\n\n"
+            else:
+                # Nothing changed within the wait, keep the connection alive through proxies
+                yield ": heartbeat\n\n"
+            if task_status["status"] in FINISHED_STATUSES:
+                return
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/cancel_draft_task', methods=['POST'])
+def cancel_draft_task():
+    data = request.get_json()
+
+    # Get required parameters
+    task_id = data.get('task_id')
+
+    result = {
+        "success": False,
+        "output": "",
+        "error": ""
+    }
+
+    # Validate required parameters
+    if not task_id:
+        error_message = "Hi, the required parameter 'task_id' is missing. Please add it and try again."
+        result["error"] = error_message
+        return jsonify(result)
+
+    try:
+        cancel_result = cancel_save_task(task_id)
+        if not cancel_result["success"]:
+            result["error"] = cancel_result["error"]
+            return jsonify(result)
+
+        result["success"] = True
+        result["output"] = cancel_result
+        return jsonify(result)
+
+    except Exception as e:
+        error_message = f"Error occurred while cancelling task: {str(e)}."
+        result["error"] = error_message
+        return jsonify(result)
+
 # Add new query status interface
 @app.route('/query_draft_status', methods=['POST'])
 def query_draft_status():
@@ -766,6 +850,8 @@ def query_draft_status():
     
     # Get required parameters
     task_id = data.get('task_id')
+    since_version = data.get('since_version')  # Optional, wait until the task changes after this version
+    timeout = data.get('timeout', 30)
     
     result = {
         "success": False,
@@ -778,10 +864,18 @@ def query_draft_status():
         error_message = "Hi, the required parameter 'task_id' is missing. Please add it and try again."
         result["error"] = error_message
         return jsonify(result)
+
+    try:
+        if since_version is not None:
+            since_version = int(since_version)
+        timeout = min(max(float(timeout), 0), MAX_STATUS_WAIT_SECONDS)
+    except (TypeError, ValueError):
+        result["error"] = "Hi, 'since_version' must be an integer version and 'timeout' a number of seconds."
+        return jsonify(result)
     
     try:
-        # Get task status
-        task_status = query_task_status(task_id)
+        # Get task status, long-polling when since_version is given
+        task_status = query_task_status(task_id, since_version, timeout)
         
         if task_status["status"] == "not_found":
             error_message = f"Task with ID {task_id} not found. Please check if the task ID is correct."
@@ -797,6 +891,60 @@ def query_draft_status():
         result["error"] = error_message
         return jsonify(result)
 
+@app.route('/get_draft_cache_stats', methods=['GET'])
+def get_draft_cache_stats():
+    """Return draft cache size and eviction counters for monitoring"""
+    result = {
+        "success": True,
+        "output": "",
+        "error": ""
+    }
+
+    try:
+        result["output"] = get_cache_stats()
+        return jsonify(result)
+
+    except Exception as e:
+        result["success"] = False
+        result["error"] = f"Error occurred while getting draft cache stats: {str(e)}"
+        return jsonify(result)
+
+@app.route('/get_asset_cache_stats', methods=['GET'])
+def get_asset_cache_stats():
+    """Return shared asset cache size, hit and eviction counters for monitoring"""
+    result = {
+        "success": True,
+        "output": "",
+        "error": ""
+    }
+
+    try:
+        result["output"] = ASSET_CACHE.stats() if ASSET_CACHE is not None else {"enabled": False}
+        return jsonify(result)
+
+    except Exception as e:
+        result["success"] = False
+        result["error"] = f"Error occurred while getting asset cache stats: {str(e)}"
+        return jsonify(result)
+
+@app.route('/get_download_stats', methods=['GET'])
+def get_download_stats_route():
+    """Return download counters, including bytes saved by deduplicating concurrent downloads"""
+    result = {
+        "success": True,
+        "output": "",
+        "error": ""
+    }
+
+    try:
+        result["output"] = get_download_stats()
+        return jsonify(result)
+
+    except Exception as e:
+        result["success"] = False
+        result["error"] = f"Error occurred while getting download stats: {str(e)}"
+        return jsonify(result)
+
 @app.route('/generate_draft_url', methods=['POST'])
 def generate_draft_url():
     data = request.get_json()
@@ -892,6 +1040,34 @@ def add_sticker():
         result["error"] = error_message
         return jsonify(result)
 
+def catalog_response(encoded: EncodedResponse) -> Response:
+    """Serve a pre-encoded catalog response, or 304 when the client already holds it"""
+    if request.if_none_match.contains_weak(encoded.etag):
+        response = Response(status=304)
+    else:
+        response = Response(encoded.body, mimetype='application/json')
+        if encoded.content_encoding != 'identity':
+            response.headers['Content-Encoding'] = encoded.content_encoding
+    response.set_etag(encoded.etag)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+def catalog_types_response(name: str, description: str) -> Response:
+    """Serve the /get_<name>_types response of the current environment
+
+    The responses are built and encoded on first use and reused for the lifetime of the process
+    """
+    try:
+        return catalog_response(get_catalog_responses(IS_CAPCUT_ENV).types[name])
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "output": "",
+            "error": f"Error occurred while getting {description}: {str(e)}"
+        })
+
+
 @app.route('/get_intro_animation_types', methods=['GET'])
 def get_intro_animation_types():
     """Return supported entrance animation type list
@@ -899,36 +1075,9 @@ def get_intro_animation_types():
     If IS_CAPCUT_ENV is True, return entrance animation types in CapCut environment
     Otherwise return entrance animation types in JianYing environment
     """
-    result = {
-        "success": True,
-        "output": "",
-        "error": ""
-    }
-    
-    try:
-        animation_types = []
-        
-        if IS_CAPCUT_ENV:
-            # Return entrance animation types in CapCut environment
-            for name, member in CapCut_Intro_type.__members__.items():
-                animation_types.append({
-                    "name": name
-                })
-        else:
-            # Return entrance animation types in JianYing environment
-            for name, member in Intro_type.__members__.items():
-                animation_types.append({
-                    "name": name
-                })
-        
-        result["output"] = animation_types
-        return jsonify(result)
-    
-    except Exception as e:
-        result["success"] = False
-        result["error"] = f"Error occurred while getting entrance animation types: {str(e)}"
-        return jsonify(result)
-        
+    return catalog_types_response('intro_animation', 'entrance animation types')
+
+
 @app.route('/get_outro_animation_types', methods=['GET'])
 def get_outro_animation_types():
     """Return supported exit animation type list
@@ -936,35 +1085,7 @@ def get_outro_animation_types():
     If IS_CAPCUT_ENV is True, return exit animation types in CapCut environment
     Otherwise return exit animation types in JianYing environment
     """
-    result = {
-        "success": True,
-        "output": "",
-        "error": ""
-    }
-    
-    try:
-        animation_types = []
-        
-        if IS_CAPCUT_ENV:
-            # Return exit animation types in CapCut environment
-            for name, member in CapCut_Outro_type.__members__.items():
-                animation_types.append({
-                    "name": name
-                })
-        else:
-            # Return exit animation types in JianYing environment
-            for name, member in Outro_type.__members__.items():
-                animation_types.append({
-                    "name": name
-                })
-        
-        result["output"] = animation_types
-        return jsonify(result)
-    
-    except Exception as e:
-        result["success"] = False
-        result["error"] = f"Error occurred while getting exit animation types: {str(e)}"
-        return jsonify(result)
+    return catalog_types_response('outro_animation', 'exit animation types')
 
 
 @app.route('/get_combo_animation_types', methods=['GET'])
@@ -974,35 +1095,7 @@ def get_combo_animation_types():
     If IS_CAPCUT_ENV is True, return combo animation types in CapCut environment
     Otherwise return combo animation types in JianYing environment
     """
-    result = {
-        "success": True,
-        "output": "",
-        "error": ""
-    }
-    
-    try:
-        animation_types = []
-        
-        if IS_CAPCUT_ENV:
-            # Return combo animation types in CapCut environment
-            for name, member in CapCut_Group_animation_type.__members__.items():
-                animation_types.append({
-                    "name": name
-                })
-        else:
-            # Return combo animation types in JianYing environment
-            for name, member in Group_animation_type.__members__.items():
-                animation_types.append({
-                    "name": name
-                })
-        
-        result["output"] = animation_types
-        return jsonify(result)
-    
-    except Exception as e:
-        result["success"] = False
-        result["error"] = f"Error occurred while getting combo animation types: {str(e)}"
-        return jsonify(result)
+    return catalog_types_response('combo_animation', 'combo animation types')
 
 
 @app.route('/get_transition_types', methods=['GET'])
@@ -1012,35 +1105,7 @@ def get_transition_types():
     If IS_CAPCUT_ENV is True, return transition animation types in CapCut environment
     Otherwise return transition animation types in JianYing environment
     """
-    result = {
-        "success": True,
-        "output": "",
-        "error": ""
-    }
-    
-    try:
-        transition_types = []
-        
-        if IS_CAPCUT_ENV:
-            # Return transition animation types in CapCut environment
-            for name, member in CapCut_Transition_type.__members__.items():
-                transition_types.append({
-                    "name": name
-                })
-        else:
-            # Return transition animation types in JianYing environment
-            for name, member in Transition_type.__members__.items():
-                transition_types.append({
-                    "name": name
-                })
-        
-        result["output"] = transition_types
-        return jsonify(result)
-    
-    except Exception as e:
-        result["success"] = False
-        result["error"] = f"Error occurred while getting transition animation types: {str(e)}"
-        return jsonify(result)
+    return catalog_types_response('transition', 'transition animation types')
 
 
 @app.route('/get_mask_types', methods=['GET'])
@@ -1050,35 +1115,7 @@ def get_mask_types():
     If IS_CAPCUT_ENV is True, return mask types in CapCut environment
     Otherwise return mask types in JianYing environment
     """
-    result = {
-        "success": True,
-        "output": "",
-        "error": ""
-    }
-    
-    try:
-        mask_types = []
-        
-        if IS_CAPCUT_ENV:
-            # Return mask types in CapCut environment
-            for name, member in CapCut_Mask_type.__members__.items():
-                mask_types.append({
-                    "name": name
-                })
-        else:
-            # Return mask types in JianYing environment
-            for name, member in Mask_type.__members__.items():
-                mask_types.append({
-                    "name": name
-                })
-        
-        result["output"] = mask_types
-        return jsonify(result)
-    
-    except Exception as e:
-        result["success"] = False
-        result["error"] = f"Error occurred while getting mask types: {str(e)}"
-        return jsonify(result)
+    return catalog_types_response('mask', 'mask types')
 
 
 @app.route('/get_audio_effect_types', methods=['GET'])
@@ -1090,127 +1127,7 @@ def get_audio_effect_types():
     
     The returned structure includes name, type and Effect_param information
     """
-    result = {
-        "success": True,
-        "output": "",
-        "error": ""
-    }
-    
-    try:
-        audio_effect_types = []
-        
-        if IS_CAPCUT_ENV:
-            # Return audio effect types in CapCut environment
-            # 1. Voice filters effect types
-            for name, member in CapCut_Voice_filters_effect_type.__members__.items():
-                params_info = []
-                for param in member.value.params:
-                    params_info.append({
-                        "name": param.name,
-                        "default_value": param.default_value * 100,
-                        "min_value": param.min_value * 100,
-                        "max_value": param.max_value * 100
-                    })
-                
-                audio_effect_types.append({
-                    "name": name,
-                    "type": "Voice_filters",
-                    "params": params_info
-                })
-            
-            # 2. Voice characters effect types
-            for name, member in CapCut_Voice_characters_effect_type.__members__.items():
-                params_info = []
-                for param in member.value.params:
-                    params_info.append({
-                        "name": param.name,
-                        "default_value": param.default_value * 100,
-                        "min_value": param.min_value * 100,
-                        "max_value": param.max_value * 100
-                    })
-                
-                audio_effect_types.append({
-                    "name": name,
-                    "type": "Voice_characters",
-                    "params": params_info
-                })
-            
-            # 3. Speech to song effect types
-            for name, member in CapCut_Speech_to_song_effect_type.__members__.items():
-                params_info = []
-                for param in member.value.params:
-                    params_info.append({
-                        "name": param.name,
-                        "default_value": param.default_value * 100,
-                        "min_value": param.min_value * 100,
-                        "max_value": param.max_value * 100
-                    })
-                
-                audio_effect_types.append({
-                    "name": name,
-                    "type": "Speech_to_song",
-                    "params": params_info
-                })
-        else:
-            # Return audio effect types in JianYing environment
-            # 1. Tone effect types
-            for name, member in Tone_effect_type.__members__.items():
-                params_info = []
-                for param in member.value.params:
-                    params_info.append({
-                        "name": param.name,
-                        "default_value": param.default_value * 100,
-                        "min_value": param.min_value * 100,
-                        "max_value": param.max_value * 100
-                    })
-                
-                audio_effect_types.append({
-                    "name": name,
-                    "type": "Tone",
-                    "params": params_info
-                })
-            
-            # 2. Audio scene effect types
-            for name, member in Audio_scene_effect_type.__members__.items():
-                params_info = []
-                for param in member.value.params:
-                    params_info.append({
-                        "name": param.name,
-                        "default_value": param.default_value * 100,
-                        "min_value": param.min_value * 100,
-                        "max_value": param.max_value * 100
-                    })
-                
-                audio_effect_types.append({
-                    "name": name,
-                    "type": "Audio_scene",
-                    "params": params_info
-                })
-            
-            # 3. Speech to song effect types
-            for name, member in Speech_to_song_type.__members__.items():
-                params_info = []
-                for param in member.value.params:
-                    params_info.append({
-                        "name": param.name,
-                        "default_value": param.default_value * 100,
-                        "min_value": param.min_value * 100,
-                        "max_value": param.max_value * 100
-                    })
-                
-                audio_effect_types.append({
-                    "name": name,
-                    "type": "Speech_to_song",
-                    "params": params_info
-                })
-        
-        result["output"] = audio_effect_types
-        return jsonify(result)
-    
-    except Exception as e:
-        result["success"] = False
-        result["error"] = f"Error occurred while getting audio effect types: {str(e)}"
-        return jsonify(result)
+    return catalog_types_response('audio_effect', 'audio effect types')
 
 
 @app.route('/get_font_types', methods=['GET'])
@@ -1219,28 +1136,7 @@ def get_font_types():
     
     Return font types in JianYing environment
     """
-    result = {
-        "success": True,
-        "output": "",
-        "error": ""
-    }
-    
-    try:
-        font_types = []
-        
-        # Return font types in JianYing environment
-        for name, member in Font_type.__members__.items():
-            font_types.append({
-                "name": name
-            })
-        
-        result["output"] = font_types
-        return jsonify(result)
-    
-    except Exception as e:
-        result["success"] = False
-        result["error"] = f"Error occurred while getting font types: {str(e)}"
-        return jsonify(result)
+    return catalog_types_response('font', 'font types')
 
 
 @app.route('/get_text_intro_types', methods=['GET'])
@@ -1250,35 +1146,8 @@ def get_text_intro_types():
     If IS_CAPCUT_ENV is True, return text entrance animation types in CapCut environment
     Otherwise return text entrance animation types in JianYing environment
     """
-    result = {
-        "success": True,
-        "output": "",
-        "error": ""
-    }
-    
-    try:
-        text_intro_types = []
-        
-        if IS_CAPCUT_ENV:
-            # Return text entrance animation types in CapCut environment
-            for name, member in CapCut_Text_intro.__members__.items():
-                text_intro_types.append({
-                    "name": name
-                })
-        else:
-            # Return text entrance animation types in JianYing environment
-            for name, member in Text_intro.__members__.items():
-                text_intro_types.append({
-                    "name": name
-                })
-        
-        result["output"] = text_intro_types
-        return jsonify(result)
-    
-    except Exception as e:
-        result["success"] = False
-        result["error"] = f"Error occurred while getting text entrance animation types: {str(e)}"
-        return jsonify(result)
+    return catalog_types_response('text_intro', 'text entrance animation types')
+
 
 @app.route('/get_text_outro_types', methods=['GET'])
 def get_text_outro_types():
@@ -1287,35 +1156,8 @@ def get_text_outro_types():
     If IS_CAPCUT_ENV is True, return text exit animation types in CapCut environment
     Otherwise return text exit animation types in JianYing environment
     """
-    result = {
-        "success": True,
-        "output": "",
-        "error": ""
-    }
-    
-    try:
-        text_outro_types = []
-        
-        if IS_CAPCUT_ENV:
-            # Return text exit animation types in CapCut environment
-            for name, member in CapCut_Text_outro.__members__.items():
-                text_outro_types.append({
-                    "name": name
-                })
-        else:
-            # Return text exit animation types in JianYing environment
-            for name, member in Text_outro.__members__.items():
-                text_outro_types.append({
-                    "name": name
-                })
-        
-        result["output"] = text_outro_types
-        return jsonify(result)
-    
-    except Exception as e:
-        result["success"] = False
-        result["error"] = f"Error occurred while getting text exit animation types: {str(e)}"
-        return jsonify(result)
+    return catalog_types_response('text_outro', 'text exit animation types')
+
 
 @app.route('/get_text_loop_anim_types', methods=['GET'])
 def get_text_loop_anim_types():
@@ -1324,35 +1166,7 @@ def get_text_loop_anim_types():
     If IS_CAPCUT_ENV is True, return text loop animation types in CapCut environment
     Otherwise return text loop animation types in JianYing environment
     """
-    result = {
-        "success": True,
-        "output": "",
-        "error": ""
-    }
-    
-    try:
-        text_loop_anim_types = []
-        
-        if IS_CAPCUT_ENV:
-            # Return text loop animation types in CapCut environment
-            for name, member in CapCut_Text_loop_anim.__members__.items():
-                text_loop_anim_types.append({
-                    "name": name
-                })
-        else:
-            # Return text loop animation types in JianYing environment
-            for name, member in Text_loop_anim.__members__.items():
-                text_loop_anim_types.append({
-                    "name": name
-                })
-        
-        result["output"] = text_loop_anim_types
-        return jsonify(result)
-    
-    except Exception as e:
-        result["success"] = False
-        result["error"] = f"Error occurred while getting text loop animation types: {str(e)}"
-        return jsonify(result)
+    return catalog_types_response('text_loop_anim', 'text loop animation types')
 
 
 @app.route('/get_video_scene_effect_types', methods=['GET'])
@@ -1362,35 +1176,7 @@ def get_video_scene_effect_types():
     If IS_CAPCUT_ENV is True, return scene effect types in CapCut environment
     Otherwise return scene effect types in JianYing environment
     """
-    result = {
-        "success": True,
-        "output": "",
-        "error": ""
-    }
-    
-    try:
-        effect_types = []
-        
-        if IS_CAPCUT_ENV:
-            # Return scene effect types in CapCut environment
-            for name, member in CapCut_Video_scene_effect_type.__members__.items():
-                effect_types.append({
-                    "name": name
-                })
-        else:
-            # Return scene effect types in JianYing environment
-            for name, member in Video_scene_effect_type.__members__.items():
-                effect_types.append({
-                    "name": name
-                })
-        
-        result["output"] = effect_types
-        return jsonify(result)
-    
-    except Exception as e:
-        result["success"] = False
-        result["error"] = f"Error occurred while getting scene effect types: {str(e)}"
-        return jsonify(result)
+    return catalog_types_response('video_scene_effect', 'scene effect types')
 
 
 @app.route('/get_video_character_effect_types', methods=['GET'])
@@ -1400,36 +1186,92 @@ def get_video_character_effect_types():
     If IS_CAPCUT_ENV is True, return character effect types in CapCut environment
     Otherwise return character effect types in JianYing environment
     """
+    return catalog_types_response('video_character_effect', 'character effect types')
+
+
+@app.route('/catalog', methods=['GET'])
+def get_catalog():
+    """Return every catalog of the current environment in one response
+
+    The output maps each /get_<name>_types endpoint name to its list. The payload is served
+    gzip-compressed to clients that accept it
+    """
+    try:
+        responses = get_catalog_responses(IS_CAPCUT_ENV)
+        accepts_gzip = request.accept_encodings['gzip'] > 0
+        response = catalog_response(responses.catalog_gzip if accepts_gzip else responses.catalog)
+        response.vary.add('Accept-Encoding')
+        return response
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "output": "",
+            "error": f"Error occurred while getting catalogs: {str(e)}"
+        })
+
+
+@app.route('/search_effects', methods=['GET'])
+def search_effects():
+    """Search the effect, filter, audio effect and font catalogs of the current environment by name
+
+    Query parameters: q (name, ignoring case, spaces and underscores), mode ("prefix", "substring"
+    or "fuzzy", default "substring"), category (one of SEARCH_CATEGORIES), is_vip (true/false),
+    param (repeatable, effects must have every listed parameter), limit (1~200, default 50) and
+    cursor (next_cursor of the previous page)
+    """
     result = {
-        "success": True,
+        "success": False,
         "output": "",
         "error": ""
     }
-    
+
+    is_vip = request.args.get('is_vip')
+    if is_vip is not None:
+        if is_vip.lower() not in ('true', 'false', '1', '0'):
+            result["error"] = f"Invalid is_vip value '{is_vip}', expected true or false. "
+            return jsonify(result)
+        is_vip = is_vip.lower() in ('true', '1')
     try:
-        effect_types = []
-        
-        if IS_CAPCUT_ENV:
-            # Return character effect types in CapCut environment
-            for name, member in CapCut_Video_character_effect_type.__members__.items():
-                effect_types.append({
-                    "name": name
-                })
-        else:
-            # Return character effect types in JianYing environment
-            for name, member in Video_character_effect_type.__members__.items():
-                effect_types.append({
-                    "name": name
-                })
-        
-        result["output"] = effect_types
+        limit = min(int(request.args.get('limit', 50)), SEARCH_LIMIT_MAX)
+    except ValueError:
+        result["error"] = "Hi, the parameter 'limit' must be an integer. "
+        return jsonify(result)
+
+    try:
+        page = get_catalog_search(IS_CAPCUT_ENV).search(
+            request.args.get('q', ''),
+            request.args.get('mode', 'substring'),
+            category=request.args.get('category'),
+            is_vip=is_vip,
+            params=request.args.getlist('param'),
+            cursor=request.args.get('cursor') or None,
+            limit=limit
+        )
+    except ValueError as e:
+        result["error"] = f"{str(e)}. "
         return jsonify(result)
-    
     except Exception as e:
-        result["success"] = False
-        result["error"] = f"Error occurred while getting character effect types: {str(e)}"
+        result["error"] = f"Error occurred while searching effects: {str(e)}"
         return jsonify(result)
 
+    result["success"] = True
+    result["output"] = {
+        "items": [{
+            "name": hit.member.name,
+            "category": hit.category,
+            "type": type(hit.member).__name__,
+            "is_vip": hit.member.value.is_vip,
+            "score": hit.score,
+            "params": effect_params(hit.member.value)
+        } for hit in page.hits],
+        "total": page.total,
+        "next_cursor": page.next_cursor
+    }
+    return jsonify(result)
+
 
 if __name__ == '__main__':
+    # encode the catalogs and build the search index before the first request
+    get_catalog_responses(IS_CAPCUT_ENV)
+    get_catalog_search(IS_CAPCUT_ENV)
     app.run(host='0.0.0.0', port=PORT)
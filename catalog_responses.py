@@ -0,0 +1,111 @@
+import functools
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from pyJianYingDraft import metadata
+from pyJianYingDraft.metadata import Effect_meta, get_catalog_resolver
+
+# Catalogs are immutable for the lifetime of the process, clients may reuse a response for an hour
+# and revalidate it with If-None-Match afterwards
+CACHE_CONTROL = "public, max-age=3600"
+
+# Endpoint name (the /get_<name>_types route) -> category of the catalog resolver
+NAME_CATALOGS: Dict[str, str] = {
+    "intro_animation": "intro",
+    "outro_animation": "outro",
+    "combo_animation": "group_animation",
+    "transition": "transition",
+    "mask": "mask",
+    "font": "font",
+    "text_intro": "text_intro",
+    "text_outro": "text_outro",
+    "text_loop_anim": "text_loop_anim",
+    "video_scene_effect": "scene_effect",
+    "video_character_effect": "character_effect",
+}
+
+# Audio effect enums and the type label reported for them, per environment
+AUDIO_EFFECT_CATALOGS: Dict[bool, Tuple[Tuple[str, str], ...]] = {
+    True: (("CapCut_Voice_filters_effect_type", "Voice_filters"),
+           ("CapCut_Voice_characters_effect_type", "Voice_characters"),
+           ("CapCut_Speech_to_song_effect_type", "Speech_to_song")),
+    False: (("Tone_effect_type", "Tone"),
+            ("Audio_scene_effect_type", "Audio_scene"),
+            ("Speech_to_song_type", "Speech_to_song")),
+}
+
+
+@dataclass(frozen=True)
+class EncodedResponse:
+    """A response body encoded once, with its strong ETag"""
+    body: bytes
+    etag: str
+    content_encoding: str = "identity"
+
+    @classmethod
+    def encode(cls, payload: object) -> "EncodedResponse":
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return cls(body, hashlib.sha256(body).hexdigest())
+
+    def gzipped(self) -> "EncodedResponse":
+        # mtime=0 keeps the compressed bytes, and therefore the ETag, stable across restarts
+        body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        return EncodedResponse(body, hashlib.sha256(body).hexdigest(), "gzip")
+
+
+@dataclass(frozen=True)
+class CatalogResponses:
+    """Pre-encoded /get_*_types responses and the combined /catalog payload of one environment"""
+    types: Dict[str, EncodedResponse]
+    catalog: EncodedResponse
+    catalog_gzip: EncodedResponse
+
+
+def effect_params(meta: Effect_meta) -> List[dict]:
+    """Parameter ranges of an effect, on the 0~100 scale the endpoints accept"""
+    return [{
+        "name": param.name,
+        "default_value": param.default_value * 100,
+        "min_value": param.min_value * 100,
+        "max_value": param.max_value * 100
+    } for param in meta.params]
+
+
+def _audio_effect_types(is_capcut_env: bool) -> List[dict]:
+    audio_effect_types = []
+    for enum_name, effect_type in AUDIO_EFFECT_CATALOGS[is_capcut_env]:
+        for name, member in getattr(metadata, enum_name).__members__.items():
+            audio_effect_types.append({
+                "name": name,
+                "type": effect_type,
+                "params": effect_params(member.value)
+            })
+    return audio_effect_types
+
+
+def build_catalog_outputs(is_capcut_env: bool) -> Dict[str, List[dict]]:
+    """Build the output list of every /get_*_types endpoint, keyed by endpoint name"""
+    resolver = get_catalog_resolver(is_capcut_env)
+    outputs = {name: [{"name": member_name} for member_name in resolver.names(category)]
+               for name, category in NAME_CATALOGS.items()}
+    outputs["audio_effect"] = _audio_effect_types(is_capcut_env)
+    return outputs
+
+
+def _success(output: object) -> dict:
+    return {"success": True, "output": output, "error": ""}
+
+
+@functools.lru_cache(maxsize=None)
+def get_catalog_responses(is_capcut_env: bool) -> CatalogResponses:
+    """Encode the catalog responses of the given environment, once per process"""
+    outputs = build_catalog_outputs(is_capcut_env)
+    catalog = EncodedResponse.encode(_success(outputs))
+    return CatalogResponses(
+        types={name: EncodedResponse.encode(_success(output)) for name, output in outputs.items()},
+        catalog=catalog,
+        catalog_gzip=catalog.gzipped(),
+    )
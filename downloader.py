@@ -2,9 +2,14 @@ import os
 import subprocess
 import time
 import requests
+import requests.adapters
 import shutil
+import threading
+from typing import Dict, List
 from requests.exceptions import RequestException, Timeout
 from urllib.parse import urlparse, unquote
+from settings.local import DOWNLOAD_CONFIG
+from util import link_or_copy
 
 def download_video(video_url, draft_name, material_name):
     """
@@ -131,9 +136,128 @@ def download_file(url:str, local_filename, max_retries=3, timeout=180):
         print(f"File saved as: {os.path.abspath(local_filename)}")
         return True
     
-    # 原有的下载逻辑
+    return _download_single_flight(url, local_filename, max_retries, timeout)
+
+
+class _Flight:
+    """A download in progress that later callers for the same URL wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.followers: List[str] = []
+        self.results: Dict[str, bool] = {}
+
+
+# URL -> download in progress
+_FLIGHTS: Dict[str, _Flight] = {}
+_FLIGHTS_LOCK = threading.Lock()
+DOWNLOAD_STATS = {
+    "downloads": 0,  # Downloads that actually hit the network
+    "deduplicated": 0,  # Calls served by another caller's concurrent download
+    "deduplicated_bytes": 0,  # Bytes those calls did not download
+}
+
+
+def get_download_stats() -> Dict[str, int]:
+    with _FLIGHTS_LOCK:
+        return dict(DOWNLOAD_STATS, in_flight=len(_FLIGHTS))
+
+
+def _download_single_flight(url, local_filename, max_retries, timeout):
+    """Download `url` once no matter how many callers ask for it at the same time
+
+    The first caller downloads, concurrent callers for the same URL wait for it and receive a
+    hardlink (or copy) of the downloaded file at their own `local_filename`.
+    """
+    with _FLIGHTS_LOCK:
+        flight = _FLIGHTS.get(url)
+        leader = flight is None
+        if leader:
+            flight = _FLIGHTS[url] = _Flight()
+            DOWNLOAD_STATS["downloads"] += 1
+        else:
+            flight.followers.append(local_filename)
+
+    if not leader:
+        print(f"Waiting for concurrent download of {url}")
+        flight.done.wait()
+        return flight.results.get(local_filename, False)
+
+    success = False
+    try:
+        success = _download_remote_file(url, local_filename, max_retries, timeout)
+    finally:
+        # Stop accepting followers before handing out the file, later callers start a new download
+        with _FLIGHTS_LOCK:
+            del _FLIGHTS[url]
+        size = os.path.getsize(local_filename) if success else 0
+        for follower in flight.followers:
+            flight.results[follower] = False
+            if not success:
+                continue
+            try:
+                if os.path.abspath(follower) != os.path.abspath(local_filename):
+                    link_or_copy(local_filename, follower)
+                flight.results[follower] = True
+            except OSError as e:
+                print(f"Failed to share download of {url} with {follower}: {e}")
+                continue
+            with _FLIGHTS_LOCK:
+                DOWNLOAD_STATS["deduplicated"] += 1
+                DOWNLOAD_STATS["deduplicated_bytes"] += size
+        flight.done.set()
+    return success
+
+
+# Browser-like headers, some CDNs reject requests without them
+DOWNLOAD_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36',
+    'Referer': 'https://www.163.com/',  # 网易的Referer
+    'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8'
+}
+
+_SESSION = None
+_SESSION_PID = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Keep-alive session shared by every download, probe and save thread of the process
+
+    Its adapter keeps up to `pool_size` connections per host, and urllib3's connection pools are
+    thread-safe, so connections are reused across threads and across saves instead of being opened
+    anew for every save. A forked process builds its own session rather than sharing the parent's sockets.
+    """
+    global _SESSION, _SESSION_PID
+    if _SESSION is None or _SESSION_PID != os.getpid():
+        with _SESSION_LOCK:
+            if _SESSION is None or _SESSION_PID != os.getpid():
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=DOWNLOAD_CONFIG["pool_size"],
+                    pool_maxsize=DOWNLOAD_CONFIG["pool_size"],
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update(DOWNLOAD_HEADERS)
+                _SESSION, _SESSION_PID = session, os.getpid()
+    return _SESSION
+
+
+def _download_remote_file(url, local_filename, max_retries, timeout):
     # Extract directory part
     directory = os.path.dirname(local_filename)
+    # Data is written next to the target and renamed into place once complete
+    part_filename = f"{local_filename}.part"
+    chunk_size = DOWNLOAD_CONFIG["chunk_size_kb"] * 1024
+    progress_interval = DOWNLOAD_CONFIG["progress_interval_seconds"]
+    # ETag or Last-Modified of the first response, resuming is only safe while it still matches
+    validator = None
+
+    # A leftover part file from an earlier process may belong to different content
+    if os.path.exists(part_filename):
+        os.remove(part_filename)
 
     retries = 0
     while retries < max_retries:
@@ -143,7 +267,6 @@ def download_file(url:str, local_filename, max_retries=3, timeout=180):
                 print(f"Retrying in {wait_time} seconds... (Attempt {retries+1}/{max_retries})")
                 time.sleep(wait_time)
             
-            print(f"Downloading file: {local_filename}")
             start_time = time.time()
             
             # Create directory (if it doesn't exist)
@@ -151,40 +274,53 @@ def download_file(url:str, local_filename, max_retries=3, timeout=180):
                 os.makedirs(directory, exist_ok=True)
                 print(f"Created directory: {directory}")
 
-            # Add headers
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36',
-                'Referer': 'https://www.163.com/',  # 网易的Referer
-                'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-                'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8'
-            }
+            offset = os.path.getsize(part_filename) if os.path.exists(part_filename) else 0
+            # The part file holds decoded bytes while a Range addresses the encoded body, so ask for the
+            # body as is to keep both in step
+            headers = {'Accept-Encoding': 'identity'}
+            if offset and validator:
+                # Resume the interrupted transfer, the server sends the whole file again if it changed
+                headers['Range'] = f"bytes={offset}-"
+                headers['If-Range'] = validator
+            else:
+                offset = 0
+            print(f"Downloading file: {local_filename}" + (f" (resuming at {offset} bytes)" if offset else ""))
 
-            with requests.get(url, stream=True, timeout=timeout, headers=headers) as response:
+            with get_session().get(url, stream=True, timeout=timeout, headers=headers) as response:
                 response.raise_for_status()
+                # Servers that compress regardless cannot be resumed, nor checked against Content-Length
+                encoded = response.headers.get('Content-Encoding', 'identity').lower() != 'identity'
+                if validator is None and not encoded:
+                    validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+                if offset and response.status_code != 206:
+                    # Range ignored or content changed, start over
+                    offset = 0
+
+                total_size = 0 if encoded else int(response.headers.get('content-length', 0))
+                if total_size:
+                    total_size += offset
                 
-                total_size = int(response.headers.get('content-length', 0))
-                block_size = 1024
-                
-                with open(local_filename, 'wb') as file:
-                    bytes_written = 0
-                    for chunk in response.iter_content(block_size):
+                with open(part_filename, 'ab' if offset else 'wb') as file:
+                    bytes_written = offset
+                    last_report = time.time()
+                    for chunk in response.iter_content(chunk_size):
                         if chunk:
                             file.write(chunk)
                             bytes_written += len(chunk)
-                            
-                            if total_size > 0:
+
+                            now = time.time()
+                            if total_size > 0 and now - last_report >= progress_interval:
+                                last_report = now
                                 progress = bytes_written / total_size * 100
-                                # For frequently updated progress, consider using logger.debug or more granular control to avoid large log files
-                                # Or only output progress to console, not write to file
-                                print(f"\r[PROGRESS] {progress:.2f}% ({bytes_written/1024:.2f}KB/{total_size/1024:.2f}KB)", end='')
-                                pass # Avoid printing too much progress information in log files
-                
-                if total_size > 0:
-                    # print() # Original newline
-                    pass
-                print(f"Download completed in {time.time()-start_time:.2f} seconds")
-                print(f"File saved as: {os.path.abspath(local_filename)}")
-                return True
+                                print(f"[PROGRESS] {local_filename}: {progress:.2f}% ({bytes_written/1024:.2f}KB/{total_size/1024:.2f}KB)")
+
+                if total_size and bytes_written < total_size:
+                    raise RequestException(f"Connection closed after {bytes_written} of {total_size} bytes")
+
+            os.replace(part_filename, local_filename)
+            print(f"Download completed in {time.time()-start_time:.2f} seconds")
+            print(f"File saved as: {os.path.abspath(local_filename)}")
+            return True
                 
         except Timeout:
             print(f"Download timed out after {timeout} seconds")
@@ -195,6 +331,7 @@ def download_file(url:str, local_filename, max_retries=3, timeout=180):
         
         retries += 1
     
+    if os.path.exists(part_filename):
+        os.remove(part_filename)
     print(f"Download failed after {max_retries} attempts for URL: {url}")
     return False
-
@@ -1,19 +1,91 @@
-from collections import OrderedDict
-import pyJianYingDraft as draft
-from typing import Dict
+import functools
+import inspect
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
 
-# Modify global variable, use OrderedDict to implement LRU cache, limit the maximum number to 10000
-DRAFT_CACHE: Dict[str, 'draft.Script_file'] = OrderedDict()  # Use Dict for type hinting
-MAX_CACHE_SIZE = 10000
+import pyJianYingDraft as draft
+from draft_store import DraftVersionConflict, MemoryDraftStore, build_draft_store
+from settings.local import DRAFT_STORE_CONFIG
 
 def update_cache(key: str, value: draft.Script_file) -> None:
-    """Update LRU cache"""
-    if key in DRAFT_CACHE:
-        # If the key exists, delete the old item
-        DRAFT_CACHE.pop(key)
-    elif len(DRAFT_CACHE) >= MAX_CACHE_SIZE:
-        print(f"{key}, Cache is full, deleting the least recently used item")
-        # If the cache is full, delete the least recently used item (the first item)
-        DRAFT_CACHE.popitem(last=False)
-    # Add new item to the end (most recently used)
-    DRAFT_CACHE[key] = value
\ No newline at end of file
+    """Store the draft and mark it as most recently used"""
+    DRAFT_CACHE.put(key, value)
+
+def get_cache_stats() -> dict:
+    """Get draft cache size and eviction counters"""
+    return DRAFT_CACHE.stats()
+
+
+# Per-draft locks, created on demand and dropped once no thread holds or waits for them.
+# Each entry is [lock, number of threads using it]
+_DRAFT_LOCKS: Dict[str, List] = {}
+_DRAFT_LOCKS_GUARD = threading.Lock()
+
+@contextmanager
+def draft_lock(draft_id: Optional[str], blocking: bool = True):
+    """Serialize mutations of one draft, different drafts do not block each other
+
+    The lock is reentrant, so locked helpers may call each other. A `None` draft_id
+    (a draft about to be created) needs no lock. With `blocking=False` the lock is only
+    taken if it is free, the context value tells whether it was.
+    """
+    if draft_id is None:
+        yield True
+        return
+    with _DRAFT_LOCKS_GUARD:
+        entry = _DRAFT_LOCKS.get(draft_id)
+        if entry is None:
+            entry = _DRAFT_LOCKS[draft_id] = [threading.RLock(), 0]
+        entry[1] += 1
+    acquired = entry[0].acquire(blocking)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            entry[0].release()
+        with _DRAFT_LOCKS_GUARD:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _DRAFT_LOCKS[draft_id]
+
+# Draft store shared by all endpoints. Drafts are kept in an LRU bounded by an estimated memory budget,
+# the memory backend spills evicted drafts to disk, the sqlite backend persists every update so drafts survive restarts
+DRAFT_CACHE: MemoryDraftStore = build_draft_store(**DRAFT_STORE_CONFIG, draft_lock=draft_lock)
+
+# How many times an edit is replayed after losing a write race against another worker,
+# with a randomized exponential backoff starting at CONFLICT_BACKOFF_SECONDS
+MAX_CONFLICT_RETRIES = 8
+CONFLICT_BACKOFF_SECONDS = 0.005
+
+def replay_on_conflict(draft_id: Optional[str], func, /, *args, **kwargs):
+    """Run `func(*args, **kwargs)` while holding the lock of the draft
+
+    When the draft store is shared by several workers, `func` is replayed if another worker saved
+    the same draft in the meantime, so it must load the draft from `DRAFT_CACHE` on every call.
+    """
+    with draft_lock(draft_id):
+        for attempt in range(MAX_CONFLICT_RETRIES):
+            try:
+                return func(*args, **kwargs)
+            except DraftVersionConflict:
+                if attempt == MAX_CONFLICT_RETRIES - 1:
+                    raise
+                print(f"{draft_id}, Draft changed concurrently, replaying edit (Attempt {attempt + 2}/{MAX_CONFLICT_RETRIES})")
+                time.sleep(random.uniform(0, CONFLICT_BACKOFF_SECONDS * 2 ** attempt))
+
+def with_draft_lock(func):
+    """Decorator: run the function while holding the lock of the draft given by its `draft_id` argument
+
+    When the draft store is shared by several workers, the edit is replayed on the latest version
+    of the draft if another worker saved the same draft in the meantime.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        draft_id = signature.bind_partial(*args, **kwargs).arguments.get("draft_id")
+        return replay_on_conflict(draft_id, func, *args, **kwargs)
+    return wrapper
@@ -4,7 +4,7 @@ import shutil
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Union
 
 
 @dataclass(frozen=True)
@@ -100,23 +100,54 @@ def get_template_dir(name: Optional[str] = None) -> str:
     return get_draft_profile(name).template_dir
 
 
-def write_profile_content(profile: DraftProfile, draft_dir: os.PathLike, content: str) -> List[Path]:
+def _copy_content(source: Path, target: Path) -> None:
+    """Copy an already written content file, in the kernel via copy_file_range where available"""
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(source, "rb") as src, open(target, "wb") as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            pass
+    shutil.copyfile(source, target)
+
+
+def write_profile_content(profile: DraftProfile, draft_dir: os.PathLike, content: Union[str, bytes],
+                          timeline_id: Optional[str] = None) -> List[Path]:
+    """Write the encoded draft document to the profile's content file, mirrors and timeline copies
+
+    The document is encoded and written once; every other copy is made from that file.
+
+    :param content: the encoded draft document
+    :param timeline_id: the document's top-level "id", parsed from content only when not given
+    """
     draft_path = Path(draft_dir)
     written: List[Path] = []
-    content_data = json.loads(content)
+    data = content.encode("utf-8") if isinstance(content, str) else content
 
     targets = [profile.content_file, *profile.content_mirrors]
+    source = draft_path / profile.content_file
     for relative_path in targets:
         path = draft_path / relative_path
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(content, encoding="utf-8")
+        if path == source:
+            path.write_bytes(data)
+        else:
+            _copy_content(source, path)
         written.append(path)
 
     if profile.timeline_content_file:
         timelines_dir = draft_path / "Timelines"
         if timelines_dir.exists():
             timeline_dirs = [path for path in timelines_dir.iterdir() if path.is_dir()]
-            timeline_id = content_data.get("id")
+            if timeline_id is None:
+                timeline_id = json.loads(data).get("id")
             if timeline_id and timeline_dirs:
                 timeline_dir = timeline_dirs[0]
                 desired_timeline_dir = timelines_dir / timeline_id
@@ -131,7 +162,7 @@ def write_profile_content(profile: DraftProfile, draft_dir: os.PathLike, content
                 timeline_targets.add(profile.timeline_content_file)
                 for relative_path in timeline_targets:
                     path = timeline_dir / relative_path
-                    path.write_text(content, encoding="utf-8")
+                    _copy_content(source, path)
                     written.append(path)
 
             if timeline_id:
@@ -0,0 +1,480 @@
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import ExitStack, nullcontext
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+import pyJianYingDraft as draft
+
+
+def serialize_draft(script: 'draft.Script_file') -> bytes:
+    """Serialize a draft into a compact blob (pickle + zlib)"""
+    return zlib.compress(pickle.dumps(script, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+def deserialize_draft(blob: bytes) -> 'draft.Script_file':
+    """Restore a draft serialized by `serialize_draft`"""
+    return pickle.loads(zlib.decompress(blob))
+
+
+# Rough in-memory footprint of draft parts, measured with tracemalloc on drafts built through the API
+DRAFT_BASE_BYTES = 20_000
+SEGMENT_BYTES = 1_500
+MATERIAL_BYTES = 800
+
+def estimate_draft_size(script: 'draft.Script_file') -> int:
+    """Estimate the memory held by a draft in bytes
+
+    Only counts segments and material entries, so it stays cheap enough to run on every update.
+    """
+    size = DRAFT_BASE_BYTES
+    for track in [*script.tracks.values(), *getattr(script, "imported_tracks", [])]:
+        size += len(track.segments) * SEGMENT_BYTES
+    for material_list in vars(script.materials).values():
+        size += len(material_list) * MATERIAL_BYTES
+    for material_list in getattr(script, "imported_materials", {}).values():
+        size += len(material_list) * MATERIAL_BYTES
+    return size
+
+
+class DraftStore(ABC):
+    """Draft storage backend
+
+    Besides the explicit `get`/`put`/`delete` methods, stores support the subset of the
+    dict protocol (`in`, `[]`, `len`) that the rest of the server uses on `DRAFT_CACHE`.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional['draft.Script_file']: ...
+
+    @abstractmethod
+    def put(self, key: str, script: 'draft.Script_file') -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def contains(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def keys(self) -> List[str]: ...
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains(key)
+
+    def __getitem__(self, key: str) -> 'draft.Script_file':
+        script = self.get(key)
+        if script is None:
+            raise KeyError(key)
+        return script
+
+    def __setitem__(self, key: str, script: 'draft.Script_file') -> None:
+        self.put(key, script)
+
+    def __delitem__(self, key: str) -> None:
+        if not self.contains(key):
+            raise KeyError(key)
+        self.delete(key)
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def pop(self, key: str, *default):
+        script = self.get(key)
+        if script is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        self.delete(key)
+        return script
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process with this ID is running"""
+    if os.name == "nt":
+        # os.kill terminates the process on Windows. A running worker keeps its database open there,
+        # which makes removing it fail, so report every process as gone
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Running as another user
+    return True
+
+
+class DraftVersionConflict(Exception):
+    """The draft was changed by another worker since it was loaded"""
+
+
+class SqliteDraftStore(DraftStore):
+    """Drafts persisted in a local SQLite database
+
+    Every `put` is committed in its own transaction and the database runs in WAL mode, so a
+    crash loses at most the write that was in flight. Drafts are only deserialized when read.
+
+    Each draft carries a version number that is bumped on every write. Passing `expected_version`
+    to `put` turns the write into a compare-and-swap, which lets several worker processes share
+    one database without silently overwriting each other's edits.
+    """
+
+    def __init__(self, path: str, reset: bool = False, per_process: bool = False):
+        """
+        :param path: Database file path, created on first use
+        :param reset: Whether to discard drafts left in the database by a previous process
+        :param per_process: Keep one database per process, `path` with the process ID inserted before the
+                            extension, so worker processes never read or reset each other's drafts
+        """
+        self.path = path
+        self.per_process = per_process
+        self._reset = reset
+        self._reset_pid: Optional[int] = None
+        self._reset_lock = threading.Lock()
+        self._local = threading.local()
+
+    def database_path(self) -> str:
+        """Database file used by the current process"""
+        if not self.per_process:
+            return self.path
+        root, ext = os.path.splitext(self.path)
+        return f"{root}.{os.getpid()}{ext}"
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads, keep one per thread.
+        # A process forked after connecting opens its own connection as well
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            path = self.database_path()
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS drafts ("
+                    "draft_id TEXT PRIMARY KEY, "
+                    "data BLOB NOT NULL, "
+                    "updated_at REAL NOT NULL, "
+                    "version INTEGER NOT NULL DEFAULT 1)"
+                )
+                columns = [row[1] for row in conn.execute("PRAGMA table_info(drafts)")]
+                if "version" not in columns:
+                    # Databases created before drafts were versioned
+                    conn.execute("ALTER TABLE drafts ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+                with self._reset_lock:
+                    if self._reset and self._reset_pid != os.getpid():
+                        conn.execute("DELETE FROM drafts")
+                        if self.per_process:
+                            self._remove_stale_databases()
+                        self._reset_pid = os.getpid()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _remove_stale_databases(self) -> None:
+        """Delete the per-process databases left behind by processes that are no longer running"""
+        directory = os.path.dirname(self.path) or "."
+        root, ext = os.path.splitext(os.path.basename(self.path))
+        pattern = re.compile(re.escape(root) + r"\.(\d+)" + re.escape(ext) + r"(-wal|-shm|-journal)?")
+        for name in os.listdir(directory):
+            match = pattern.fullmatch(name)
+            if match is None or int(match.group(1)) == os.getpid() or _process_alive(int(match.group(1))):
+                continue
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass  # Still open by a running process (Windows), or removed by another worker
+
+    def get(self, key: str) -> Optional['draft.Script_file']:
+        return self.get_versioned(key)[0]
+
+    def get_versioned(self, key: str) -> Tuple[Optional['draft.Script_file'], int]:
+        """Get a draft together with its version, (None, 0) if it does not exist"""
+        row = self._connect().execute("SELECT data, version FROM drafts WHERE draft_id = ?", (key,)).fetchone()
+        if row is None:
+            return None, 0
+        return deserialize_draft(row[0]), row[1]
+
+    def version_of(self, key: str) -> int:
+        """Get the current version of a draft without loading it, 0 if it does not exist"""
+        row = self._connect().execute("SELECT version FROM drafts WHERE draft_id = ?", (key,)).fetchone()
+        return 0 if row is None else row[0]
+
+    def put(self, key: str, script: 'draft.Script_file', expected_version: Optional[int] = None) -> int:
+        """Store a draft
+
+        :param key: Draft ID
+        :param script: Draft to store
+        :param expected_version: Only write if the stored version still equals this value (0 means the
+                                 draft must not exist yet). None writes unconditionally.
+        :return: New version of the draft
+        :raises DraftVersionConflict: The stored version differs from `expected_version`
+        """
+        blob = serialize_draft(script)
+        now = time.time()
+        with self._connect() as conn:
+            if expected_version is None:
+                conn.execute(
+                    "INSERT INTO drafts (draft_id, data, updated_at, version) VALUES (?, ?, ?, 1) "
+                    "ON CONFLICT(draft_id) DO UPDATE SET data = excluded.data, "
+                    "updated_at = excluded.updated_at, version = version + 1",
+                    (key, blob, now)
+                )
+            elif expected_version == 0:
+                try:
+                    conn.execute(
+                        "INSERT INTO drafts (draft_id, data, updated_at, version) VALUES (?, ?, ?, 1)",
+                        (key, blob, now)
+                    )
+                except sqlite3.IntegrityError:
+                    raise DraftVersionConflict(f"Draft {key} was created by another worker")
+                return 1
+            else:
+                cursor = conn.execute(
+                    "UPDATE drafts SET data = ?, updated_at = ?, version = version + 1 "
+                    "WHERE draft_id = ? AND version = ?",
+                    (blob, now, key, expected_version)
+                )
+                if cursor.rowcount == 0:
+                    raise DraftVersionConflict(
+                        f"Draft {key} was modified by another worker (expected version {expected_version})")
+                return expected_version + 1
+        return self.version_of(key)
+
+    def delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM drafts WHERE draft_id = ?", (key,))
+
+    def contains(self, key: str) -> bool:
+        return self.version_of(key) != 0
+
+    def keys(self) -> List[str]:
+        return [row[0] for row in self._connect().execute("SELECT draft_id FROM drafts")]
+
+
+class MemoryDraftStore(DraftStore):
+    """In-process LRU of live `Script_file` objects, bounded by an estimated memory budget
+
+    Least recently used drafts are evicted once the estimated footprint exceeds `max_bytes`.
+    Evicted drafts are spilled to `backing_store` instead of being dropped, and loaded back
+    lazily on next access. With `write_through`, every `put` is also persisted to the backing
+    store immediately, which makes it survive restarts and lets eviction skip the spill write.
+
+    In write-through mode the backing store is the source of truth shared by all workers: a cached
+    draft is reloaded when its stored version moved on, and `put` is a compare-and-swap against the
+    version that was loaded, raising `DraftVersionConflict` if another worker wrote in between.
+
+    Otherwise a draft lives either in memory or in the backing store: a spilled draft is deleted from
+    the backing store once it is loaded back. A draft is only evicted if its `draft_lock` is free, and
+    is spilled while holding that lock, so a concurrent edit never changes it halfway through the spill.
+    """
+
+    def __init__(self, max_bytes: int, backing_store: Optional[SqliteDraftStore] = None, write_through: bool = False,
+                 draft_lock: Optional[Callable[..., ContextManager[bool]]] = None):
+        """
+        :param max_bytes: Estimated memory budget for the drafts kept in memory
+        :param backing_store: Store receiving evicted drafts, or every update in write-through mode
+        :param write_through: Persist every `put` to the backing store immediately
+        :param draft_lock: `draft_lock(key, blocking=False)` context manager telling whether it took the lock of a
+                           draft, drafts are evicted without locking if not set
+        """
+        self.max_bytes = max_bytes
+        self.backing_store = backing_store
+        self.write_through = write_through
+        self.draft_lock = draft_lock or (lambda key, blocking=True: nullcontext(True))
+        self._entries: Dict[str, 'draft.Script_file'] = OrderedDict()
+        # Drafts evicted from memory whose spill to the backing store is still running
+        self._spilling: Dict[str, 'draft.Script_file'] = {}
+        self._sizes: Dict[str, int] = {}
+        self._versions: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._evictions = 0
+        self._spills = 0
+        self._reloads = 0
+        self._conflicts = 0
+        # Guards the LRU bookkeeping. Reloads run under it so a draft is never materialized twice;
+        # spills and write-through persistence run outside it so that a slow write does not stall
+        # every other draft (writes to one draft are serialized by `draft_lock`)
+        self._lock = threading.RLock()
+
+    def get(self, key: str) -> Optional['draft.Script_file']:
+        victims = []
+        try:
+            with self._lock:
+                script = self._entries.get(key)
+                if script is not None:
+                    if not self.write_through or self.backing_store.version_of(key) == self._versions.get(key):
+                        self._entries.move_to_end(key)
+                        return script
+                    print(f"{key}, Draft was modified by another worker, reloading")
+                    self._forget(key)
+                script = self._spilling.pop(key, None)
+                if script is not None:
+                    # Still being spilled, the spill drops the stored copy once it sees the draft is back
+                    victims = self._remember(key, script)
+                    return script
+                if self.backing_store is None:
+                    return None
+                script, version = self.backing_store.get_versioned(key)
+                if script is not None:
+                    print(f"{key}, Draft loaded from backing store")
+                    self._reloads += 1
+                    victims = self._remember(key, script)
+                    if self.write_through:
+                        self._versions[key] = version
+                    else:
+                        self.backing_store.delete(key)
+                return script
+        finally:
+            self._spill(victims)
+
+    def put(self, key: str, script: 'draft.Script_file') -> None:
+        with self._lock:
+            self._spilling.pop(key, None)
+            victims = self._remember(key, script)
+            expected_version = self._versions.get(key, 0)
+        self._spill(victims)
+        if self.write_through and self.backing_store is not None:
+            try:
+                version = self.backing_store.put(key, script, expected_version=expected_version)
+            except DraftVersionConflict:
+                # Our copy is stale, drop it so the next access loads the winning version
+                with self._lock:
+                    self._conflicts += 1
+                    if self._entries.get(key) is script:
+                        self._forget(key)
+                raise
+            with self._lock:
+                self._versions[key] = version
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._forget(key)
+            self._spilling.pop(key, None)
+            if self.backing_store is not None:
+                self.backing_store.delete(key)
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            if key in self._entries or key in self._spilling:
+                return True
+            return self.backing_store is not None and self.backing_store.contains(key)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            if self.backing_store is None:
+                return list(self._entries)
+            return list(dict.fromkeys([*self._entries, *self._spilling, *self.backing_store.keys()]))
+
+    def stats(self) -> Dict[str, int]:
+        """Current size and eviction counters, for monitoring"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "estimated_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+                "spills": self._spills,
+                "reloads": self._reloads,
+                "conflicts": self._conflicts,
+            }
+
+    def _remember(self, key: str, script: 'draft.Script_file') -> List[Tuple[str, 'draft.Script_file', ExitStack]]:
+        # Caller holds self._lock and passes the returned victims to `_spill` once it released it
+        if key in self._entries:
+            self._entries.pop(key)
+            self._total_bytes -= self._sizes.pop(key)
+        size = estimate_draft_size(script)
+        self._entries[key] = script
+        self._sizes[key] = size
+        self._total_bytes += size
+        # Always keep the draft being stored, even if it alone exceeds the budget. Drafts whose lock is
+        # held are in use and skipped; the lock is only tried, so eviction never waits for another draft
+        victims = []
+        for candidate in list(self._entries)[:-1]:
+            if self._total_bytes <= self.max_bytes:
+                break
+            held = ExitStack()
+            if not held.enter_context(self.draft_lock(candidate, blocking=False)):
+                held.close()
+                continue
+            victim = self._evict(candidate)
+            if victim is None:
+                held.close()
+            else:
+                victims.append((candidate, victim, held))
+        return victims
+
+    def _forget(self, key: str) -> None:
+        # Caller holds self._lock
+        if key in self._entries:
+            self._entries.pop(key)
+            self._total_bytes -= self._sizes.pop(key)
+        self._versions.pop(key, None)
+
+    def _evict(self, key: str) -> Optional['draft.Script_file']:
+        # Caller holds self._lock, returns the draft if it has to be spilled.
+        # The loaded version is kept, so a caller still holding the evicted draft writes it back with a proper CAS
+        script = self._entries.pop(key)
+        self._total_bytes -= self._sizes.pop(key)
+        self._evictions += 1
+        if self.backing_store is None:
+            print(f"{key}, Cache is full, deleting the least recently used item")
+            return None
+        if self.write_through:
+            return None
+        print(f"{key}, Cache is full, spilling the least recently used item to disk")
+        self._spilling[key] = script
+        return script
+
+    def _spill(self, victims: List[Tuple[str, 'draft.Script_file', ExitStack]]) -> None:
+        # Runs without self._lock, each victim's draft lock is held until its spill is done
+        for key, script, held in victims:
+            with held:
+                try:
+                    self.backing_store.put(key, script)
+                finally:
+                    with self._lock:
+                        spilled = self._spilling.get(key) is script
+                        if spilled:
+                            del self._spilling[key]
+                            self._spills += 1
+                if not spilled:
+                    # Loaded back, stored again or deleted while it was written, the copy on disk is stale
+                    self.backing_store.delete(key)
+
+
+def build_draft_store(backend: str = "memory", path: Optional[str] = None, max_memory_mb: int = 1024,
+                      spill_path: Optional[str] = None,
+                      draft_lock: Optional[Callable[..., ContextManager[bool]]] = None) -> MemoryDraftStore:
+    """Build the draft store described by the `draft_store` configuration
+
+    :param backend: "memory" (process-local, evicted drafts spill to `spill_path`) or
+                    "sqlite" (memory LRU written through to the database at `path`)
+    :param path: SQLite database path, required for the "sqlite" backend
+    :param max_memory_mb: Estimated memory budget for drafts kept in memory, in MB
+    :param spill_path: SQLite file receiving drafts evicted by the memory backend, eviction drops drafts if not set.
+                       Each process spills to its own file, named after this path with its process ID
+    :param draft_lock: Per-draft lock held while an evicted draft is spilled, see `MemoryDraftStore`
+    :return: Draft store instance
+    """
+    max_bytes = int(max_memory_mb * 1024 * 1024)
+    if backend == "memory":
+        spill_store = SqliteDraftStore(spill_path, reset=True, per_process=True) if spill_path else None
+        return MemoryDraftStore(max_bytes, backing_store=spill_store, draft_lock=draft_lock)
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("The sqlite draft store requires a database path")
+        return MemoryDraftStore(max_bytes, backing_store=SqliteDraftStore(path), write_through=True, draft_lock=draft_lock)
+    raise ValueError(f"Unknown draft store backend '{backend}'. Supported backends: memory, sqlite")
@@ -0,0 +1,105 @@
+import os
+import struct
+from typing import Optional, Tuple
+
+from downloader import get_session
+
+# Header windows tried in turn, JPEG dimensions can sit behind large EXIF/ICC segments
+HEAD_SIZES = (16 * 1024, 256 * 1024)
+
+
+def sniff_image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Read (width, height) from the first bytes of a PNG, JPEG, WebP or GIF file
+
+    :param data: Beginning of the file
+    :return: (width, height), None if the format is unknown or `data` is too short
+    """
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        if len(data) >= 24 and data[12:16] == b'IHDR':
+            return struct.unpack('>II', data[16:24])
+        return None
+
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        if len(data) >= 10:
+            return struct.unpack('<HH', data[6:10])
+        return None
+
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return _webp_size(data)
+
+    if data[:2] == b'\xff\xd8':
+        return _jpeg_size(data)
+
+    return None
+
+
+def _webp_size(data: bytes) -> Optional[Tuple[int, int]]:
+    chunk = data[12:16]
+    if chunk == b'VP8 ' and len(data) >= 30:
+        # Lossy: 14-bit dimensions after the frame start code
+        width, height = struct.unpack('<HH', data[26:30])
+        return width & 0x3fff, height & 0x3fff
+    if chunk == b'VP8L' and len(data) >= 25:
+        # Lossless: 14-bit dimensions minus one, packed after the signature byte
+        bits = int.from_bytes(data[21:25], 'little')
+        return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+    if chunk == b'VP8X' and len(data) >= 30:
+        # Extended: 24-bit canvas dimensions minus one
+        return int.from_bytes(data[24:27], 'little') + 1, int.from_bytes(data[27:30], 'little') + 1
+    return None
+
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xff:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xff:
+            # Fill byte before a marker
+            offset += 1
+            continue
+        if marker == 0x01 or 0xd0 <= marker <= 0xd8:
+            # Standalone markers without a length
+            offset += 2
+            continue
+        length = struct.unpack('>H', data[offset + 2:offset + 4])[0]
+        # Start-of-frame markers, excluding DHT (C4), JPG (C8) and DAC (CC)
+        if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+            if offset + 9 > len(data):
+                return None
+            height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+            return width, height
+        offset += 2 + length
+    return None
+
+
+def read_head(url: str, size: int, timeout: float = 10) -> bytes:
+    """Read up to `size` bytes from the beginning of a local file or URL
+
+    Remote files are requested with a Range header; servers that ignore it are cut off after `size` bytes.
+    """
+    if os.path.isfile(url):
+        with open(url, 'rb') as file:
+            return file.read(size)
+    with get_session().get(url, headers={'Range': f"bytes=0-{size - 1}"}, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        data = bytearray()
+        for chunk in response.iter_content(min(size, 64 * 1024)):
+            data += chunk
+            if len(data) >= size:
+                break
+        return bytes(data[:size])
+
+
+def get_image_size(url: str) -> Optional[Tuple[int, int]]:
+    """(width, height) of an image from its header, None if it could not be determined that way"""
+    for size in HEAD_SIZES:
+        data = read_head(url, size)
+        dimensions = sniff_image_size(data)
+        if dimensions is not None:
+            return dimensions
+        if len(data) < size:
+            # Whole file read already
+            break
+    return None
@@ -251,7 +251,8 @@ TOOLS = [
         "inputSchema": {
             "type": "object",
             "properties": {
-                "draft_id": {"type": "string", "description": "草稿ID"}
+                "draft_id": {"type": "string", "description": "草稿ID"},
+                "is_async": {"type": "boolean", "description": "是否后台排队保存，返回task_id供查询进度"}
             }
         }
     }
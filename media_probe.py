@@ -0,0 +1,270 @@
+import json
+import logging
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+import imageio.v2 as imageio
+
+from downloader import get_session
+from image_size import get_image_size
+from settings.local import MEDIA_PROBE_CONFIG
+
+logger = logging.getLogger('flask_video_generator')
+
+# Material kinds understood by `probe_media`
+AUDIO = "audio"
+PHOTO = "photo"
+VIDEO = "video"
+
+
+class MediaInspectionError(Exception):
+    """ffprobe could not read the media"""
+
+
+def _parse_ffprobe_output(info: dict) -> dict:
+    streams = []
+    for stream in info.get('streams', []):
+        duration = stream.get('duration')
+        streams.append({
+            "type": stream.get('codec_type'),
+            "codec": stream.get('codec_name'),
+            "width": stream.get('width'),
+            "height": stream.get('height'),
+            "duration": float(duration) if duration not in (None, 'N/A') else None,
+        })
+    format_info = info.get('format', {})
+    format_duration = format_info.get('duration')
+    format_duration = float(format_duration) if format_duration not in (None, 'N/A') else None
+    video = next((stream for stream in streams if stream["type"] == 'video'), None)
+    audio = next((stream for stream in streams if stream["type"] == 'audio'), None)
+    # Stream durations are more accurate than the container's, prefer the first one available
+    stream_duration = next((stream["duration"] for stream in streams if stream["duration"] is not None), None)
+    return {
+        "duration": stream_duration if stream_duration is not None else format_duration,
+        "format_duration": format_duration,
+        "format_name": format_info.get('format_name'),
+        "stream_types": [stream["type"] for stream in streams],
+        "has_video": video is not None,
+        "has_audio": audio is not None,
+        "width": video["width"] if video else None,
+        "height": video["height"] if video else None,
+        "video_duration": video["duration"] if video else None,
+        "video_codec": video["codec"] if video else None,
+        "audio_codec": audio["codec"] if audio else None,
+        "streams": streams,
+    }
+
+
+def inspect_media(url: str, timeout: float = 10, max_retries: int = 3) -> dict:
+    """Inspect a media file with a single ffprobe call
+
+    :param url: Remote URL or local path
+    :param timeout: Timeout of each ffprobe attempt in seconds
+    :param max_retries: Number of attempts for transient failures
+    :return: Duration (seconds), dimensions and codec of the first video stream, codec of the first
+             audio stream, stream types and per-stream details
+    :raises MediaInspectionError: ffprobe failed on every attempt
+    """
+    command = [
+        'ffprobe',
+        '-v', 'error',
+        '-show_entries', 'stream=codec_type,codec_name,width,height,duration',
+        '-show_entries', 'format=duration,format_name',
+        '-of', 'json',
+        url
+    ]
+    error = None
+    for attempt in range(max_retries):
+        if attempt > 0:
+            # Short exponential backoff, most failures are momentary network hiccups
+            time.sleep(0.25 * 2 ** (attempt - 1))
+        try:
+            process = subprocess.run(command, capture_output=True, text=True, timeout=timeout, check=True)
+            return _parse_ffprobe_output(json.loads(process.stdout))
+        except FileNotFoundError:
+            # No need to retry if ffprobe itself is not found
+            raise MediaInspectionError("ffprobe command not found. Please ensure FFmpeg is installed and in system PATH.")
+        except subprocess.TimeoutExpired:
+            error = f"ffprobe timed out (exceeded {timeout} seconds)"
+        except subprocess.CalledProcessError as e:
+            error = f"Error executing ffprobe command (exit code {e.returncode}): {e.stderr.strip()}"
+        except json.JSONDecodeError as e:
+            error = f"Error parsing ffprobe output: {e}"
+        logger.warning(f"Inspecting {url} failed (attempt {attempt + 1}/{max_retries}): {error}")
+    raise MediaInspectionError(error)
+
+
+def _probe_audio(url: str) -> Optional[dict]:
+    """Duration of an audio file, and whether it actually contains a video stream"""
+    info = inspect_media(url)
+    if info["has_video"]:
+        return {"has_video": True, "duration": None}
+    if info["duration"] is None:
+        logger.warning(f"Warning: Unable to get audio {url} duration.")
+        return None
+    return {"has_video": False, "duration": info["duration"]}
+
+
+def _probe_photo(url: str) -> Optional[dict]:
+    """Width and height of an image, read from the file header when the format is known"""
+    try:
+        dimensions = get_image_size(url)
+    except Exception as e:
+        logger.warning(f"Failed to read image header of {url}: {str(e)}, decoding the whole image instead.")
+        dimensions = None
+    if dimensions is not None:
+        width, height = dimensions
+        return {"width": int(width), "height": int(height)}
+
+    # Unknown format, fall back to a full decode
+    img = imageio.imread(url)
+    height, width = img.shape[:2]
+    return {"width": int(width), "height": int(height)}
+
+
+def _probe_video(url: str) -> Optional[dict]:
+    """Width, height and duration of a video, width and height are None if no video stream was found"""
+    info = inspect_media(url)
+    # Prefer video stream duration, if not available use format duration
+    duration = info["video_duration"] if info["video_duration"] is not None else info["format_duration"]
+    if duration is None:
+        duration = info["duration"]
+    if duration is None:
+        logger.warning(f"Warning: Unable to get video {url} duration.")
+        return None
+    if not info["has_video"]:
+        logger.warning(f"Warning: Unable to get video {url} stream information.")
+        return {"width": None, "height": None, "duration": duration}
+    return {"width": int(info["width"] or 0), "height": int(info["height"] or 0), "duration": duration}
+
+
+PROBERS = {
+    AUDIO: _probe_audio,
+    PHOTO: _probe_photo,
+    VIDEO: _probe_video,
+}
+
+
+def content_validator(url: str) -> Optional[str]:
+    """Cheap fingerprint of the current content behind `url`
+
+    ETag or Last-Modified from a HEAD request for remote files, size and mtime for local files.
+    None when the server provides neither.
+    """
+    if os.path.isfile(url):
+        stat = os.stat(url)
+        return f"{stat.st_size}-{stat.st_mtime_ns}"
+    try:
+        response = get_session().head(url, allow_redirects=True, timeout=MEDIA_PROBE_CONFIG["head_timeout_seconds"])
+        if response.ok:
+            return response.headers.get('ETag') or response.headers.get('Last-Modified')
+    except Exception as e:
+        logger.debug(f"HEAD request for {url} failed: {str(e)}")
+    return None
+
+
+class MediaMetadataCache:
+    """Probe results persisted in SQLite, keyed by URL, material kind and content validator
+
+    An entry is reused while the validator of the URL still matches the one recorded when it
+    was probed; URLs without a validator are trusted as immutable.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads, keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS media ("
+                    "url TEXT NOT NULL, "
+                    "kind TEXT NOT NULL, "
+                    "validator TEXT NOT NULL, "
+                    "data TEXT NOT NULL, "
+                    "updated_at REAL NOT NULL, "
+                    "PRIMARY KEY (url, kind))"
+                )
+            self._local.conn = conn
+        return conn
+
+    def get(self, url: str, kind: str, validator: Optional[str]) -> Optional[dict]:
+        row = self._connect().execute(
+            "SELECT validator, data FROM media WHERE url = ? AND kind = ?", (url, kind)
+        ).fetchone()
+        if row is None or row[0] != (validator or ""):
+            return None
+        return json.loads(row[1])
+
+    def put(self, url: str, kind: str, validator: Optional[str], data: dict) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO media (url, kind, validator, data, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(url, kind) DO UPDATE SET validator = excluded.validator, "
+                "data = excluded.data, updated_at = excluded.updated_at",
+                (url, kind, validator or "", json.dumps(data), time.time())
+            )
+
+
+MEDIA_METADATA_CACHE = MediaMetadataCache(MEDIA_PROBE_CONFIG["cache_path"])
+_PROBE_STATS_LOCK = threading.Lock()
+PROBE_STATS = {"probes": 0, "cache_hits": 0}
+
+
+def probe_one(url: str, kind: str, use_cache: bool = True) -> Optional[dict]:
+    """Probe one media URL, consulting the metadata cache first
+
+    :param url: Remote URL or local path
+    :param kind: One of AUDIO, PHOTO, VIDEO
+    :param use_cache: Whether to read and write the metadata cache
+    :return: Probe result, None if the media could not be probed
+    """
+    validator = content_validator(url) if use_cache else None
+    if use_cache:
+        cached = MEDIA_METADATA_CACHE.get(url, kind, validator)
+        if cached is not None:
+            with _PROBE_STATS_LOCK:
+                PROBE_STATS["cache_hits"] += 1
+            return cached
+
+    with _PROBE_STATS_LOCK:
+        PROBE_STATS["probes"] += 1
+    try:
+        data = PROBERS[kind](url)
+    except Exception as e:
+        logger.error(f"Failed to probe {kind} {url}: {str(e)}", exc_info=True)
+        return None
+    # Videos whose dimensions could not be read are probed again next time
+    if data is not None and use_cache and data.get("width", 0) is not None:
+        MEDIA_METADATA_CACHE.put(url, kind, validator, data)
+    return data
+
+
+def probe_media(items: Iterable[Tuple[str, str]], use_cache: bool = True) -> Dict[Tuple[str, str], Optional[dict]]:
+    """Probe many media URLs concurrently on a bounded pool
+
+    :param items: (url, kind) pairs, duplicates are probed once
+    :param use_cache: Whether to read and write the metadata cache
+    :return: Probe result for each (url, kind) pair, None for media that could not be probed
+    """
+    unique_items = list(dict.fromkeys(items))
+    if not unique_items:
+        return {}
+    workers = min(MEDIA_PROBE_CONFIG["workers"], len(unique_items))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="media_probe") as executor:
+        results = executor.map(lambda item: probe_one(item[0], item[1], use_cache), unique_items)
+        return dict(zip(unique_items, results))
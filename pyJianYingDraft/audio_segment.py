@@ -3,21 +3,25 @@
 包含淡入淡出效果、音频特效等相关类
 """
 
+from __future__ import annotations
+
 import uuid
 from copy import deepcopy
 
-from typing import Optional, Literal, Union
+from typing import Optional, Literal, Union, TYPE_CHECKING
 from typing import Dict, List, Any
 
-from pyJianYingDraft.metadata.capcut_audio_effect_meta import CapCut_Speech_to_song_effect_type, CapCut_Voice_characters_effect_type, CapCut_Voice_filters_effect_type
-
 from .time_util import tim, Timerange
 from .segment import Media_segment
 from .local_materials import Audio_material
 from .keyframe import Keyframe_property, Keyframe_list
 
+from . import metadata
 from .metadata import Effect_param_instance
-from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
+
+if TYPE_CHECKING:
+    from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
+    from .metadata import CapCut_Voice_filters_effect_type, CapCut_Voice_characters_effect_type, CapCut_Speech_to_song_effect_type
 
 class Audio_fade:
     """音频淡入淡出效果"""
@@ -70,22 +74,22 @@ class Audio_effect:
         self.resource_id = effect_meta.value.resource_id
         self.audio_adjust_params = []
 
-        if isinstance(effect_meta, Audio_scene_effect_type):
+        if isinstance(effect_meta, metadata.Audio_scene_effect_type):
             self.category_id = "sound_effect"
             self.category_name = "场景音"
-        elif isinstance(effect_meta, Tone_effect_type):
+        elif isinstance(effect_meta, metadata.Tone_effect_type):
             self.category_id = "tone"
             self.category_name = "音色"
-        elif isinstance(effect_meta, Speech_to_song_type):
+        elif isinstance(effect_meta, metadata.Speech_to_song_type):
             self.category_id = "speech_to_song"
             self.category_name = "声音成曲"
-        elif isinstance(effect_meta, CapCut_Voice_filters_effect_type):
+        elif isinstance(effect_meta, metadata.CapCut_Voice_filters_effect_type):
             self.category_id = "sound_effect"
             self.category_name = "Voice filters"
-        elif isinstance(effect_meta, CapCut_Voice_characters_effect_type):
+        elif isinstance(effect_meta, metadata.CapCut_Voice_characters_effect_type):
             self.category_id = "tone"
             self.category_name = "Voice characters"
-        elif isinstance(effect_meta, CapCut_Speech_to_song_effect_type):
+        elif isinstance(effect_meta, metadata.CapCut_Speech_to_song_effect_type):
             self.category_id = "speech_to_song"
             self.category_name = "Speech to song"
         else:
@@ -183,6 +187,7 @@ class Audio_segment(Media_segment):
             raise ValueError("当前音频片段已经有此类型 (%s) 的音效了" % effect_inst.category_name)
         self.effects.append(effect_inst)
         self.extra_material_refs.append(effect_inst.effect_id)
+        self.mark_dirty()
 
         return self
 
@@ -204,6 +209,7 @@ class Audio_segment(Media_segment):
 
         self.fade = Audio_fade(in_duration, out_duration)
         self.extra_material_refs.append(self.fade.fade_id)
+        self.mark_dirty()
 
         return self
 
@@ -215,6 +221,7 @@ class Audio_segment(Media_segment):
             volume (`float`): 音量在`time_offset`处的值
         """
         _property = Keyframe_property.volume
+        self.mark_dirty()
         for kf_list in self.common_keyframes:
             if kf_list.keyframe_property == _property:
                 kf_list.add_keyframe(time_offset, volume)
@@ -1,12 +1,15 @@
 """定义特效/滤镜片段类"""
 
-from typing import Union, Optional, List
+from __future__ import annotations
+
+from typing import Union, Optional, List, TYPE_CHECKING
 
 from .time_util import Timerange
 from .segment import Base_segment
 from .video_segment import Video_effect, Filter
 
-from .metadata import Video_scene_effect_type, Video_character_effect_type, Filter_type
+if TYPE_CHECKING:
+    from .metadata import Video_scene_effect_type, Video_character_effect_type, Filter_type
 
 class Effect_segment(Base_segment):
     """放置在独立特效轨道上的特效片段"""
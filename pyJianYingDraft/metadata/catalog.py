@@ -0,0 +1,86 @@
+"""按草稿环境(CapCut/剪映)汇总各类元数据枚举, 提供按名称查找元数据的统一入口"""
+
+import functools
+import importlib
+from typing import Dict, List, Optional, Tuple
+
+from .effect_meta import Effect_enum
+
+CATEGORIES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "audio_effect": (("CapCut_Voice_filters_effect_type", "CapCut_Voice_characters_effect_type", "CapCut_Speech_to_song_effect_type"),
+                     ("Audio_scene_effect_type", "Tone_effect_type", "Speech_to_song_type")),
+    "scene_effect": (("CapCut_Video_scene_effect_type",), ("Video_scene_effect_type",)),
+    "character_effect": (("CapCut_Video_character_effect_type",), ("Video_character_effect_type",)),
+    "intro": (("CapCut_Intro_type",), ("Intro_type",)),
+    "outro": (("CapCut_Outro_type",), ("Outro_type",)),
+    "group_animation": (("CapCut_Group_animation_type",), ("Group_animation_type",)),
+    "text_intro": (("CapCut_Text_intro",), ("Text_intro",)),
+    "text_outro": (("CapCut_Text_outro",), ("Text_outro",)),
+    "text_loop_anim": (("CapCut_Text_loop_anim",), ("Text_loop_anim",)),
+    "transition": (("CapCut_Transition_type",), ("Transition_type",)),
+    "mask": (("CapCut_Mask_type",), ("Mask_type",)),
+    "filter": (("Filter_type",), ("Filter_type",)),
+    "font": (("Font_type",), ("Font_type",)),
+}
+"""类别 -> (CapCut环境下, 剪映环境下)依次查找的枚举名称"""
+
+class Catalog_resolver:
+    """某一草稿环境下各类元数据的名称索引
+
+    每个类别的索引在首次查找时建立, 之后按名称查找为O(1); 枚举所在的模块也在此时才导入
+    """
+
+    is_capcut_env: bool
+    """是否为CapCut环境"""
+
+    def __init__(self, is_capcut_env: bool):
+        self.is_capcut_env = is_capcut_env
+        self._indexes: Dict[str, Dict[str, Effect_enum]] = {}
+
+    def catalogs(self, category: str) -> List["type[Effect_enum]"]:
+        """返回该类别在当前环境下依次查找的枚举类
+
+        Raises:
+            `KeyError`: 未知的类别
+        """
+        capcut_names, jianying_names = CATEGORIES[category]
+        metadata = importlib.import_module(__package__)
+        return [getattr(metadata, name) for name in (capcut_names if self.is_capcut_env else jianying_names)]
+
+    def _index(self, category: str) -> Dict[str, Effect_enum]:
+        index = self._indexes.get(category)
+        if index is None:
+            index = {}
+            for catalog in self.catalogs(category):
+                for name, member in catalog.__members__.items():
+                    index.setdefault(name, member)  # 同名时保留排在前面的枚举中的成员
+            self._indexes[category] = index
+        return index
+
+    def resolve(self, category: str, name: str) -> Optional[Effect_enum]:
+        """按成员名称精确查找元数据, 返回枚举成员(其类型即所属的枚举), 找不到时返回None
+
+        Args:
+            category (`str`): 类别, 见`CATEGORIES`
+            name (`str`): 枚举成员名称
+
+        Raises:
+            `KeyError`: 未知的类别
+        """
+        return self._index(category).get(name)
+
+    def names(self, category: str) -> List[str]:
+        """返回该类别在当前环境下所有可用的名称"""
+        return list(self._index(category))
+
+    def suggest(self, category: str, name: str, limit: int = 5) -> List[str]:
+        """返回该类别中与给定名称相近的名称, 先列出排在前面的枚举中的, 见`Effect_enum.suggest`"""
+        suggestions: List[str] = []
+        for catalog in self.catalogs(category):
+            suggestions.extend(member.name for member in catalog.suggest(name, limit))
+        return suggestions[:limit]
+
+@functools.lru_cache(maxsize=None)
+def get_catalog_resolver(is_capcut_env: bool) -> Catalog_resolver:
+    """返回给定草稿环境下共享的`Catalog_resolver`"""
+    return Catalog_resolver(is_capcut_env)
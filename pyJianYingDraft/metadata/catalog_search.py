@@ -0,0 +1,209 @@
+"""在各类特效元数据(`Effect_meta`)中按名称搜索, 支持前缀、子串和模糊匹配, 按VIP与参数名筛选, 以及游标分页"""
+
+import base64
+import binascii
+import functools
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .catalog import Catalog_resolver, get_catalog_resolver
+from .effect_meta import Effect_enum, _normalize_name, _trigrams
+
+SEARCH_CATEGORIES: Tuple[str, ...] = ("scene_effect", "character_effect", "filter", "audio_effect", "font")
+"""值为`Effect_meta`的类别, 见`CATEGORIES`"""
+
+MATCH_MODES: Tuple[str, ...] = ("prefix", "substring", "fuzzy")
+"""名称匹配方式"""
+
+class Search_hit(NamedTuple):
+    """一条搜索结果"""
+
+    category: str
+    """所属类别"""
+    member: Effect_enum
+    """枚举成员, 其值为`Effect_meta`"""
+    score: float
+    """相似度, 0~1, 仅模糊匹配时小于1"""
+
+class Search_page(NamedTuple):
+    """一页搜索结果"""
+
+    hits: List[Search_hit]
+    """本页的结果"""
+    total: int
+    """满足条件的结果总数"""
+    next_cursor: Optional[str]
+    """下一页的游标, 没有下一页时为None"""
+
+def _encode_cursor(key: Tuple[float, int]) -> str:
+    return base64.urlsafe_b64encode(f"{key[0]!r}:{key[1]}".encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        score, position = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split(":")
+        return float(score), int(position)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
+class Catalog_search:
+    """某一草稿环境下所有特效元数据的内存倒排索引
+
+    索引在构造时一次建立: 名称的三元组及单字 -> 成员位置的倒排表用于子串和模糊匹配, 排序后的名称用于前缀匹配,
+    类别、VIP与参数名 -> 成员位置的集合用于筛选. 结果按(-相似度, 位置)排序, 游标即上一页最后一条结果的排序键
+    """
+
+    entries: List[Tuple[str, Effect_enum]]
+    """(类别, 枚举成员), 按类别和枚举定义顺序排列, 其下标即成员的位置"""
+
+    def __init__(self, resolver: Catalog_resolver, categories: Iterable[str] = SEARCH_CATEGORIES):
+        self.entries = []
+        self._names: List[str] = []
+        self._trigram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._char_postings: Dict[str, List[int]] = {}
+        self._category_positions: Dict[str, Set[int]] = {}
+        self._vip_positions: Set[int] = set()
+        self._non_vip_positions: Set[int] = set()
+        self._param_positions: Dict[str, Set[int]] = {}
+
+        for category in categories:
+            category_positions = self._category_positions.setdefault(category, set())
+            for catalog in resolver.catalogs(category):
+                for member in catalog:
+                    position = len(self.entries)
+                    self.entries.append((category, member))
+                    category_positions.add(position)
+                    if member.value.is_vip:
+                        self._vip_positions.add(position)
+                    else:
+                        self._non_vip_positions.add(position)
+                    for param in member.value.params:
+                        self._param_positions.setdefault(param.name, set()).add(position)
+
+                    normalized = _normalize_name(member.name)
+                    self._names.append(normalized)
+                    trigrams = _trigrams(normalized)
+                    self._trigram_counts.append(len(trigrams))
+                    for trigram in trigrams:
+                        self._postings.setdefault(trigram, []).append(position)
+                    for char in set(normalized):
+                        self._char_postings.setdefault(char, []).append(position)
+
+        self._all_positions = range(len(self.entries))
+        self._sorted_names = sorted((name, position) for position, name in enumerate(self._names))
+
+    def param_names(self) -> List[str]:
+        """返回所有特效参数的名称"""
+        return sorted(self._param_positions)
+
+    def _filter(self, category: Optional[str], is_vip: Optional[bool], params: Iterable[str]) -> Optional[Set[int]]:
+        """返回满足筛选条件的成员位置, 没有条件时返回None"""
+        allowed: Optional[Set[int]] = None
+
+        def narrow(positions: Set[int]) -> None:
+            nonlocal allowed
+            allowed = positions if allowed is None else allowed & positions
+
+        if category is not None:
+            if category not in self._category_positions:
+                raise ValueError(f"Unknown category '{category}', expected one of: {', '.join(self._category_positions)}")
+            narrow(self._category_positions[category])
+        if is_vip is not None:
+            narrow(self._vip_positions if is_vip else self._non_vip_positions)
+        for param in params:
+            narrow(self._param_positions.get(param, set()))
+        return allowed
+
+    def _intersect(self, postings: Dict[str, List[int]], keys: Set[str]) -> Set[int]:
+        lists = sorted((postings.get(key, []) for key in keys), key=len)
+        candidates = set(lists[0])
+        for positions in lists[1:]:
+            candidates.intersection_update(positions)
+            if not candidates:
+                break
+        return candidates
+
+    def _prefix_matches(self, normalized: str) -> List[int]:
+        matches = []
+        for index in range(bisect_left(self._sorted_names, (normalized,)), len(self._sorted_names)):
+            name, position = self._sorted_names[index]
+            if not name.startswith(normalized):
+                break
+            matches.append(position)
+        matches.sort()
+        return matches
+
+    def _substring_matches(self, normalized: str) -> List[int]:
+        if len(normalized) >= 3:
+            # 名称的(含边界的)三元组集合包含其所有子串的三元组
+            keys = {normalized[i:i + 3] for i in range(len(normalized) - 2)}
+            candidates = self._intersect(self._postings, keys)
+        else:
+            candidates = self._intersect(self._char_postings, set(normalized))
+        return sorted(position for position in candidates if normalized in self._names[position])
+
+    def _fuzzy_matches(self, normalized: str, cutoff: float) -> List[Tuple[float, int]]:
+        """与`Effect_enum.suggest`相同的三元组Dice系数, 返回按(-相似度, 位置)排序的结果"""
+        trigrams = _trigrams(normalized)
+        shared = Counter(position for trigram in trigrams for position in self._postings.get(trigram, ()))
+        scored = []
+        for position, count in shared.items():
+            score = 2 * count / (len(trigrams) + self._trigram_counts[position])
+            if score >= cutoff:
+                scored.append((-score, position))
+        scored.sort()
+        return scored
+
+    def search(self, query: str = "", mode: str = "substring", *, category: Optional[str] = None,
+               is_vip: Optional[bool] = None, params: Iterable[str] = (), cursor: Optional[str] = None,
+               limit: int = 50, cutoff: float = 0.3) -> Search_page:
+        """按名称搜索特效元数据, 名称忽略大小写、空格和下划线
+
+        Args:
+            query (`str`, optional): 搜索的名称, 为空时返回满足筛选条件的所有成员. 默认为空.
+            mode (`str`, optional): 匹配方式, "prefix"、"substring"或"fuzzy". 默认为"substring".
+            category (`str`, optional): 只返回此类别的结果, 见`SEARCH_CATEGORIES`. 默认不限.
+            is_vip (`bool`, optional): 只返回是/不是VIP特权的结果. 默认不限.
+            params (`Iterable[str]`, optional): 只返回具有所有这些参数的结果. 默认不限.
+            cursor (`str`, optional): 上一页返回的`next_cursor`, 为None时返回第一页.
+            limit (`int`, optional): 每页最多的结果数. 默认为50.
+            cutoff (`float`, optional): 模糊匹配的相似度下限, 0~1. 默认为0.3.
+
+        Raises:
+            `ValueError`: 匹配方式、类别、游标或每页结果数无效
+        """
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode '{mode}', expected one of: {', '.join(MATCH_MODES)}")
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        allowed = self._filter(category, is_vip, params)
+        normalized = _normalize_name(query)
+
+        if mode == "fuzzy" and normalized:
+            keys = self._fuzzy_matches(normalized, cutoff)
+            if allowed is not None:
+                keys = [key for key in keys if key[1] in allowed]
+            start = bisect_right(keys, _decode_cursor(cursor)) if cursor else 0
+            page = keys[start:start + limit]
+            total = len(keys)
+        else:
+            # 非模糊匹配的相似度都为1, 结果按位置排列
+            if not normalized:
+                positions = sorted(allowed) if allowed is not None else self._all_positions
+            else:
+                positions = self._prefix_matches(normalized) if mode == "prefix" else self._substring_matches(normalized)
+                if allowed is not None:
+                    positions = [position for position in positions if position in allowed]
+            start = bisect_right(positions, _decode_cursor(cursor)[1]) if cursor else 0
+            page = [(-1.0, position) for position in positions[start:start + limit]]
+            total = len(positions)
+
+        hits = [Search_hit(*self.entries[position], -negative_score) for negative_score, position in page]
+        next_cursor = _encode_cursor(page[-1]) if start + limit < total else None
+        return Search_page(hits, total, next_cursor)
+
+@functools.lru_cache(maxsize=None)
+def get_catalog_search(is_capcut_env: bool) -> Catalog_search:
+    """返回给定草稿环境下共享的`Catalog_search`, 在首次调用时建立索引"""
+    return Catalog_search(get_catalog_resolver(is_capcut_env))
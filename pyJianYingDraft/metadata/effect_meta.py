@@ -1,6 +1,7 @@
 from enum import Enum
 
-from typing import List, Dict, Any
+from collections import Counter
+from typing import List, Dict, Any, Set
 from typing import TypeVar, Optional
 
 class Effect_param:
@@ -89,8 +90,51 @@ class Effect_meta:
 
 Effect_enum_subclass = TypeVar("Effect_enum_subclass", bound="Effect_enum")
 
+def _normalize_name(name: str) -> str:
+    """忽略大小写、空格和下划线"""
+    return name.lower().replace(" ", "").replace("_", "")
+
+def _trigrams(normalized_name: str) -> Set[str]:
+    padded = "  " + normalized_name + " "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class _Name_index:
+    """某个特效枚举的名称索引"""
+
+    members: List["Effect_enum"]
+    """枚举成员, 不含别名"""
+    by_name: Dict[str, "Effect_enum"]
+    """规范化名称 -> 成员, 名称重复时保留最先定义的成员"""
+    trigram_counts: List[int]
+    """各成员名称的三元组数"""
+    postings: Dict[str, List[int]]
+    """三元组 -> 名称含有它的成员在`members`中的位置"""
+
+    def __init__(self, enum_cls: "type[Effect_enum]"):
+        self.members = list(enum_cls)
+        self.by_name = {}
+        self.trigram_counts = []
+        self.postings = {}
+        for position, member in enumerate(self.members):
+            normalized = _normalize_name(member.name)
+            self.by_name.setdefault(normalized, member)
+            trigrams = _trigrams(normalized)
+            self.trigram_counts.append(len(trigrams))
+            for trigram in trigrams:
+                self.postings.setdefault(trigram, []).append(position)
+
+_name_indexes: Dict[type, _Name_index] = {}
+"""各特效枚举的名称索引, 在首次查找时建立"""
+
 class Effect_enum(Enum):
-    """特效枚举基类, 提供一个`from_name`方法用于根据名称获取特效元数据"""
+    """特效枚举基类, 提供`from_name`和`suggest`方法用于根据名称获取特效元数据"""
+
+    @classmethod
+    def _name_index(cls) -> _Name_index:
+        index = _name_indexes.get(cls)
+        if index is None:
+            index = _name_indexes[cls] = _Name_index(cls)
+        return index
 
     @classmethod
     def from_name(cls: "type[Effect_enum_subclass]", name: str) -> Effect_enum_subclass:
@@ -100,10 +144,36 @@ class Effect_enum(Enum):
             name (str): 特效名称
 
         Raises:
-            `ValueError`: 特效名称不存在
+            `ValueError`: 特效名称不存在, 错误信息中附带名称相近的特效
+        """
+        effect = cls._name_index().by_name.get(_normalize_name(name))
+        if effect is not None:
+            return effect
+        message = f"Effect named '{_normalize_name(name)}' not found"
+        suggestions = cls.suggest(name)
+        if suggestions:
+            message += ", did you mean: " + ", ".join(effect.name for effect in suggestions)
+        raise ValueError(message)
+
+    @classmethod
+    def suggest(cls: "type[Effect_enum_subclass]", name: str, limit: int = 5,
+                cutoff: float = 0.3) -> List[Effect_enum_subclass]:
+        """返回名称与给定名称相近的特效, 按相似度从高到低排列
+
+        相似度为两个名称(忽略大小写、空格和下划线)的三元组集合的Dice系数, 只比较与给定名称有公共三元组的特效
+
+        Args:
+            name (str): 特效名称
+            limit (int, optional): 最多返回的数量. 默认为5.
+            cutoff (float, optional): 相似度下限, 0~1. 默认为0.3.
         """
-        name = name.lower().replace(" ", "").replace("_", "")
-        for effect in cls:
-            if effect.name.lower().replace(" ", "").replace("_", "") == name:
-                return effect
-        raise ValueError(f"Effect named '{name}' not found")
+        index = cls._name_index()
+        trigrams = _trigrams(_normalize_name(name))
+        shared = Counter(position for trigram in trigrams for position in index.postings.get(trigram, ()))
+        scored = []
+        for position, count in shared.items():
+            score = 2 * count / (len(trigrams) + index.trigram_counts[position])
+            if score >= cutoff:
+                scored.append((-score, position))
+        scored.sort()
+        return [index.members[position] for _, position in scored[:limit]]
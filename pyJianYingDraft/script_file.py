@@ -1,11 +1,17 @@
 import os
 import json
 import math
+import pickle
+import functools
 from copy import deepcopy
 
-from typing import Optional, Literal, Union, overload
-from typing import Type, Dict, List, Any
+from typing import Optional, Literal, Union, overload, TYPE_CHECKING
+from typing import Type, Dict, List, Any, Tuple
 
+try:
+    import orjson  # 可选依赖, 安装后用于加速紧凑格式的导出
+except ImportError:
+    orjson = None
 
 from . import util
 from . import exceptions
@@ -21,7 +27,28 @@ from .track import Track_type, Base_track, Track
 
 from settings.local import IS_CAPCUT_ENV
 from draft_profiles import get_draft_profile
-from .metadata import Video_scene_effect_type, Video_character_effect_type, Filter_type, Font_type
+from . import metadata
+
+if TYPE_CHECKING:
+    from .metadata import Video_scene_effect_type, Video_character_effect_type, Filter_type
+
+def dumps_compact(obj: Any) -> str:
+    """将对象编码为不含空白的紧凑JSON字符串, 优先使用`orjson`, 其无法处理的对象(如超出64位的整数)回退到标准库"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+@functools.lru_cache(maxsize=None)
+def _template_snapshot(template_path: str) -> bytes:
+    """读取并解析草稿模板, 每个进程每个模板只做一次
+
+    返回解析结果的pickle序列化数据, 每次反序列化都得到一份独立的副本, 比重新读取解析JSON或`deepcopy`更快
+    """
+    with open(template_path, "r", encoding="utf-8") as f:
+        return pickle.dumps(json.load(f), protocol=pickle.HIGHEST_PROTOCOL)
 
 class Script_material:
     """草稿文件中的素材信息部分"""
@@ -72,6 +99,9 @@ class Script_material:
         self.filters = []
         self.canvases = []
 
+        # 素材列表名 -> (id→素材索引, 建立索引时列表的id, 已索引的素材数)
+        self._id_indexes: Dict[str, Tuple[Dict[str, Any], int, int]] = {}
+
     @overload
     def __contains__(self, item: Union[Video_material, Audio_material]) -> bool: ...
     @overload
@@ -81,24 +111,45 @@ class Script_material:
 
     def __contains__(self, item) -> bool:
         if isinstance(item, Video_material):
-            return item.material_id in [video.material_id for video in self.videos]
+            return item.material_id in self._id_index("videos", "material_id")
         elif isinstance(item, Audio_material):
-            return item.material_id in [audio.material_id for audio in self.audios]
+            return item.material_id in self._id_index("audios", "material_id")
         elif isinstance(item, Audio_fade):
-            return item.fade_id in [fade.fade_id for fade in self.audio_fades]
+            return item.fade_id in self._id_index("audio_fades", "fade_id")
         elif isinstance(item, Audio_effect):
-            return item.effect_id in [effect.effect_id for effect in self.audio_effects]
+            return item.effect_id in self._id_index("audio_effects", "effect_id")
         elif isinstance(item, Segment_animations):
-            return item.animation_id in [ani.animation_id for ani in self.animations]
+            return item.animation_id in self._id_index("animations", "animation_id")
         elif isinstance(item, Video_effect):
-            return item.global_id in [effect.global_id for effect in self.video_effects]
+            return item.global_id in self._id_index("video_effects", "global_id")
         elif isinstance(item, Transition):
-            return item.global_id in [transition.global_id for transition in self.transitions]
+            return item.global_id in self._id_index("transitions", "global_id")
         elif isinstance(item, Filter):
-            return item.global_id in [filter_.global_id for filter_ in self.filters]
+            return item.global_id in self._id_index("filters", "global_id")
         else:
             raise TypeError("Invalid argument type '%s'" % type(item))
 
+    def invalidate_index(self) -> None:
+        """在对素材列表做追加以外的修改(删除、替换、重新赋值等)后调用, 使id索引在下次使用时重建"""
+        self._id_indexes = {}
+
+    def _id_index(self, name: str, id_attr: str) -> Dict[str, Any]:
+        """返回名为`name`的素材列表的id→素材索引
+
+        列表只被追加时增量更新索引, 列表对象被替换或变短时重建
+        """
+        indexes = getattr(self, "_id_indexes", None)
+        if indexes is None:
+            indexes = self._id_indexes = {}
+        items = getattr(self, name)
+        index, list_id, indexed_count = indexes.get(name, (None, None, 0))
+        if index is None or list_id != id(items) or indexed_count > len(items):
+            index, indexed_count = {}, 0
+        for item in items[indexed_count:]:
+            index.setdefault(getattr(item, id_attr), item)
+        indexes[name] = (index, id(items), len(items))
+        return index
+
     def export_json(self, is_capcut_env: Optional[bool] = None) -> Dict[str, List[Any]]:
         result = {
             "ai_translates": [],
@@ -207,8 +258,7 @@ class Script_file:
         self.imported_materials = {}
         self.imported_tracks = []
 
-        with open(os.path.join(os.path.dirname(__file__), self.TEMPLATE_FILE), "r", encoding="utf-8") as f:
-            self.content = json.load(f)
+        self.content = pickle.loads(_template_snapshot(os.path.join(os.path.dirname(__file__), self.TEMPLATE_FILE)))
 
     @staticmethod
     def load_template(json_path: str) -> "Script_file":
@@ -411,7 +461,7 @@ class Script_file:
 
         return self
 
-    def add_effect(self, effect: Union[Video_scene_effect_type, Video_character_effect_type],
+    def add_effect(self, effect: "Union[Video_scene_effect_type, Video_character_effect_type]",
                    t_range: Timerange, track_name: Optional[str] = None, *,
                    params: Optional[List[Optional[float]]] = None) -> "Script_file":
         """向指定的特效轨道中添加一个特效片段
@@ -440,7 +490,7 @@ class Script_file:
             self.materials.video_effects.append(segment.effect_inst)
         return self
 
-    def add_filter(self, filter_meta: Filter_type, t_range: Timerange,
+    def add_filter(self, filter_meta: "Filter_type", t_range: Timerange,
                    track_name: Optional[str] = None, intensity: float = 100.0) -> "Script_file":
         """向指定的滤镜轨道中添加一个滤镜片段
 
@@ -502,9 +552,9 @@ class Script_file:
 
         if font:
             try:
-                font_type = getattr(Font_type, font)
+                font_type = getattr(metadata.Font_type, font)
             except:
-                available_fonts = [attr for attr in dir(Font_type) if not attr.startswith('_')]
+                available_fonts = [attr for attr in dir(metadata.Font_type) if not attr.startswith('_')]
                 raise ValueError(f"Unsupported font: {font}, please use one of the fonts in Font_type: {available_fonts}")
 
         time_offset = tim(time_offset)
@@ -879,8 +929,21 @@ class Script_file:
             if effect["type"] == "text_effect":
                 print("\tResource id: %s '%s'" % (effect["resource_id"], effect.get("name", "")))
 
-    def dumps(self, profile=None) -> str:
-        """将草稿文件内容导出为JSON字符串"""
+    def dumps(self, profile=None, indent: Optional[int] = 4) -> str:
+        """将草稿文件内容导出为JSON字符串
+
+        Args:
+            profile (`DraftProfile`, optional): 草稿配置, 默认使用当前配置
+            indent (`int`, optional): 缩进空格数, 默认为4便于阅读和调试; 为None时输出不含空白的紧凑格式,
+                体积更小且更快, 安装了`orjson`时还会用它来编码, 适合程序间传输和写入草稿文件
+        """
+        content = self.export_content(profile)
+        if indent is None:
+            return dumps_compact(content)
+        return json.dumps(content, ensure_ascii=False, indent=indent)
+
+    def export_content(self, profile=None) -> Dict[str, Any]:
+        """生成草稿文件内容, 即`dumps`所编码的字典"""
         if profile is None:
             profile = get_draft_profile()
         self.content["fps"] = self.fps
@@ -906,7 +969,7 @@ class Script_file:
         track_list.sort(key=lambda track: track.render_index)
         self.content["tracks"] = [track.export_json() for track in track_list]
 
-        return json.dumps(self.content, ensure_ascii=False, indent=4)
+        return self.content
 
     def dump(self, file_path: str) -> None:
         """将草稿文件内容写入文件"""
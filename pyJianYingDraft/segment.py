@@ -1,7 +1,7 @@
 """定义片段基类及部分比较通用的属性类"""
 
 import uuid
-from typing import Optional, Dict, List, Any, Union
+from typing import Optional, Dict, List, Any, Tuple, Union
 
 from .animation import Segment_animations
 from .time_util import Timerange, tim
@@ -20,6 +20,11 @@ class Base_segment:
     common_keyframes: List[Keyframe_list]
     """各属性的关键帧列表"""
 
+    _export_cache: Optional[Dict[str, Any]] = None
+    """上次导出的JSON, 片段被标记为已修改时清空"""
+    _export_state: Optional[Tuple[Any, ...]] = None
+    """上次导出时`_mutable_state`的返回值"""
+
     def __init__(self, material_id: str, target_timerange: Timerange):
         self.segment_id = uuid.uuid4().hex
         self.material_id = material_id
@@ -34,6 +39,7 @@ class Base_segment:
     @start.setter
     def start(self, value: int):
         self.target_timerange.start = value
+        self.mark_dirty()
 
     @property
     def duration(self) -> int:
@@ -42,6 +48,7 @@ class Base_segment:
     @duration.setter
     def duration(self, value: int):
         self.target_timerange.duration = value
+        self.mark_dirty()
 
     @property
     def end(self) -> int:
@@ -76,6 +83,52 @@ class Base_segment:
             "keyframe_refs": [],  # 意义不明
         }
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        replaced_timerange = name == "target_timerange" and name in self.__dict__
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            # 给片段的任何公开属性赋值(如`volume`、`target_timerange`)都使导出缓存失效
+            super().__setattr__("_export_cache", None)
+        if replaced_timerange:
+            # 所在轨道的片段索引随之失效
+            Timerange.record_mutation()
+
+    def _mutable_state(self) -> Tuple[Any, ...]:
+        """导出的JSON所依赖、且常被原地修改的子对象的状态, 与上次导出时不同则重新导出
+
+        只包含几个数值, 比重新导出便宜得多; 子类导出更多此类对象时应扩展此方法
+        """
+        timerange = self.target_timerange
+        return (timerange.start, timerange.duration,
+                tuple(len(kf_list.keyframes) for kf_list in self.common_keyframes))
+
+    def mark_dirty(self) -> None:
+        """标记片段已被修改, 下次导出时重新生成其JSON
+
+        以下修改会被自动发现: 片段及`Script_file`的方法所做的修改, 给片段的属性赋值, 以及原地修改
+        片段的时间范围、速度、图像调节设置(如`target_timerange.start`、`clip_settings.transform_x`)或增删关键帧.
+        其他原地修改(如修改已有关键帧的值, 或导入片段的`raw_data`)之后需调用此方法
+        """
+        self._export_cache = None
+
+    def export_cached_json(self) -> Dict[str, Any]:
+        """与`export_json`相同, 但片段自上次导出后未被修改时直接返回上次的结果
+
+        返回的字典会被之后的导出复用, 调用方不应修改它
+        """
+        state = self._mutable_state()
+        if self._export_cache is None or state != self._export_state:
+            self._export_cache = self.export_json()
+            self._export_state = state
+        return self._export_cache
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 导出缓存不参与序列化和深拷贝
+        state = self.__dict__.copy()
+        state.pop("_export_cache", None)
+        state.pop("_export_state", None)
+        return state
+
 class Speed:
     """播放速度对象, 目前只支持固定速度"""
 
@@ -173,6 +226,12 @@ class Media_segment(Base_segment):
 
         self.extra_material_refs = [self.speed.global_id]
 
+    def _mutable_state(self) -> Tuple[Any, ...]:
+        source = self.source_timerange
+        return super()._mutable_state() + (
+            (source.start, source.duration) if source is not None else None,
+            self.speed.speed, len(self.extra_material_refs))
+
     def export_json(self) -> Dict[str, Any]:
         """返回通用于音频和视频片段的默认属性"""
         ret = super().export_json()
@@ -237,6 +296,7 @@ class Visual_segment(Media_segment):
 
         if isinstance(time_offset, str): time_offset = tim(time_offset)
 
+        self.mark_dirty()
         for kf_list in self.common_keyframes:
             if kf_list.keyframe_property == _property:
                 kf_list.add_keyframe(time_offset, value)
@@ -246,6 +306,9 @@ class Visual_segment(Media_segment):
         self.common_keyframes.append(kf_list)
         return self
 
+    def _mutable_state(self) -> Tuple[Any, ...]:
+        return super()._mutable_state() + tuple(vars(self.clip_settings).values())
+
     def export_json(self) -> Dict[str, Any]:
         """导出通用于所有视觉片段的JSON数据"""
         json_dict = super().export_json()
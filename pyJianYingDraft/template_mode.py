@@ -12,9 +12,10 @@ from .local_materials import Video_material, Audio_material
 from .video_segment import Video_segment, Clip_settings
 from .audio_segment import Audio_segment
 from .keyframe import Keyframe_list, Keyframe_property, Keyframe
-from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type, Effect_param_instance
+from . import metadata
+from .metadata import Effect_param_instance
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 class Shrink_mode(Enum):
     """处理替换素材时素材变短情况的方法"""
@@ -56,6 +57,11 @@ class ImportedSegment(Base_segment):
 
         util.assign_attr_with_json(self, self.__DATA_ATTRS, json_data)
 
+    def _mutable_state(self) -> Tuple[Any, ...]:
+        # 导入的片段不含关键帧列表, 其余数据在raw_data中
+        timerange = self.target_timerange
+        return (timerange.start, timerange.duration)
+
     def export_json(self) -> Dict[str, Any]:
         json_data = deepcopy(self.raw_data)
         json_data.update(util.export_attr_to_json(self, self.__DATA_ATTRS))
@@ -73,6 +79,10 @@ class ImportedMediaSegment(ImportedSegment):
 
         util.assign_attr_with_json(self, self.__DATA_ATTRS, json_data)
 
+    def _mutable_state(self) -> Tuple[Any, ...]:
+        source = self.source_timerange
+        return super()._mutable_state() + (source.start, source.duration)
+
     def export_json(self) -> Dict[str, Any]:
         json_data = super().export_json()
         json_data.update(util.export_attr_to_json(self, self.__DATA_ATTRS))
@@ -307,7 +317,7 @@ def import_track(json_data: Dict[str, Any], imported_materials: Dict[str, Any] =
                 if "audio_effects" in imported_materials and imported_materials["audio_effects"]:
                     effect_data = imported_materials["audio_effects"][0]
                     # 根据资源ID查找对应的效果类型
-                    for effect_type in Audio_scene_effect_type:
+                    for effect_type in metadata.Audio_scene_effect_type:
                         if effect_type.value.resource_id == effect_data["resource_id"]:
                             # 将参数值从0-1映射到0-100
                             params = []
@@ -1,20 +1,25 @@
 """定义文本片段及其相关类"""
 
+from __future__ import annotations
+
 import json
 import uuid
 from copy import deepcopy
 
 from typing import Dict, Tuple, Any, List
-from typing import Union, Optional, Literal
-
-from pyJianYingDraft.metadata.capcut_text_animation_meta import CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim
+from typing import Union, Optional, Literal, TYPE_CHECKING
 
 from .time_util import Timerange, tim
 from .segment import Clip_settings, Visual_segment
 from .animation import Segment_animations, Text_animation
 
-from .metadata import Font_type, Effect_meta
-from .metadata import Text_intro, Text_outro, Text_loop_anim
+from . import metadata
+from .metadata import Effect_meta
+
+if TYPE_CHECKING:
+    from .metadata import Font_type
+    from .metadata import Text_intro, Text_outro, Text_loop_anim
+    from .metadata import CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim
 
 class Text_style:
     """字体样式类"""
@@ -275,9 +280,9 @@ class TextStyleRange:
         self.border = border
         if font_str:
             try:
-                font_type = getattr(Font_type, font_str).value
+                font_type = getattr(metadata.Font_type, font_str).value
             except:
-                available_fonts = [attr for attr in dir(Font_type) if not attr.startswith('_')]
+                available_fonts = [attr for attr in dir(metadata.Font_type) if not attr.startswith('_')]
                 raise ValueError(f"不支持的字体：{font_str}，请使用Font_type中的字体之一：{available_fonts}")
             self.font = font_type
     
@@ -361,6 +366,7 @@ class Text_segment(Visual_segment):
     def add_text_style(self, textStyleRange: TextStyleRange) -> "Text_segment":
         # 添加新的样式范围
         self.text_styles.append(textStyleRange)
+        self.mark_dirty()
         return self
         
 
@@ -397,11 +403,11 @@ class Text_segment(Visual_segment):
         """
         duration = min(tim(duration), self.target_timerange.duration)
 
-        if (isinstance(animation_type, Text_intro) or isinstance(animation_type, CapCut_Text_intro)):
+        if (isinstance(animation_type, metadata.Text_intro) or isinstance(animation_type, metadata.CapCut_Text_intro)):
             start = 0
-        elif (isinstance(animation_type, Text_outro) or isinstance(animation_type, CapCut_Text_outro)):
+        elif (isinstance(animation_type, metadata.Text_outro) or isinstance(animation_type, metadata.CapCut_Text_outro)):
             start = self.target_timerange.duration - duration
-        elif (isinstance(animation_type, Text_loop_anim) or isinstance(animation_type, CapCut_Text_loop_anim)):
+        elif (isinstance(animation_type, metadata.Text_loop_anim) or isinstance(animation_type, metadata.CapCut_Text_loop_anim)):
             intro_trange = self.animations_instance and self.animations_instance.get_animation_trange("in")
             outro_trange = self.animations_instance and self.animations_instance.get_animation_trange("out")
             start = intro_trange.start if intro_trange else 0
@@ -409,6 +415,7 @@ class Text_segment(Visual_segment):
         else:
             raise TypeError("Invalid animation type %s" % type(animation_type))
 
+        self.mark_dirty()
         if self.animations_instance is None:
             self.animations_instance = Segment_animations()
             self.extra_material_refs.append(self.animations_instance.animation_id)
@@ -426,6 +433,7 @@ class Text_segment(Visual_segment):
         """
         self.bubble = TextBubble(effect_id, resource_id)
         self.extra_material_refs.append(self.bubble.global_id)
+        self.mark_dirty()
         return self
 
     def add_effect(self, effect_id: str) -> "Text_segment":
@@ -436,6 +444,7 @@ class Text_segment(Visual_segment):
         """
         self.effect = TextEffect(effect_id, effect_id)
         self.extra_material_refs.append(self.effect.global_id)
+        self.mark_dirty()
         return self
 
     def export_material(self) -> Dict[str, Any]:
@@ -1,7 +1,8 @@
 """定义时间范围类以及与时间相关的辅助函数"""
 
+import itertools
 from typing import Union
-from typing import Dict
+from typing import Any, ClassVar, Dict
 
 SEC = 1000000
 """一秒=1e6微秒"""
@@ -31,6 +32,8 @@ def tim(inp: Union[str, float]) -> int:
 
     return int(round(total_time) * sign)
 
+_MUTATION_IDS = itertools.count(1)
+
 class Timerange:
     """记录了起始时间及持续长度的时间范围"""
     start: int
@@ -38,6 +41,10 @@ class Timerange:
     duration: int
     """持续长度, 单位为微秒"""
 
+    mutation_id: ClassVar[int] = 0
+    """任一已有时间范围被修改(或片段的`target_timerange`被替换)时更新为新的全局编号, 构造新的时间范围不改变它.
+    轨道将其纳入片段索引的有效性判断, 从而察觉片段时间范围的原地修改"""
+
     def __init__(self, start: int, duration: int):
         """构造一个时间范围
 
@@ -49,6 +56,18 @@ class Timerange:
         self.start = start
         self.duration = duration
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        changed = name in self.__dict__
+        super().__setattr__(name, value)
+        if changed:
+            Timerange.record_mutation()
+
+    @staticmethod
+    def record_mutation() -> None:
+        """更新`mutation_id`, 先完成修改再调用, 使据此建立的索引包含这次修改"""
+        # itertools.count的next是原子操作, 并发修改也各自得到不同的编号
+        Timerange.mutation_id = next(_MUTATION_IDS)
+
     @classmethod
     def import_json(cls, json_obj: Dict[str, str]) -> "Timerange":
         """从json对象中恢复Timerange"""
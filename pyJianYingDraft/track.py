@@ -1,16 +1,18 @@
 """轨道类及其元数据"""
 
 import uuid
+import bisect
 
 from enum import Enum
 from typing import TypeVar, Generic, Type
-from typing import Dict, List, Any, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 import pyJianYingDraft as draft
 
 from .exceptions import SegmentOverlap
 from .segment import Base_segment
+from .time_util import Timerange
 from .video_segment import Video_segment, Sticker_segment
 from .audio_segment import Audio_segment
 from .text_segment import Text_segment
@@ -91,6 +93,64 @@ class Track(Base_track, Generic[Seg_type]):
         self.mute = mute
         self.segments = []
         self.pending_keyframes = []
+
+        # 按(开始时间, 结束时间, 在segments中的位置)排序的片段索引
+        self._index_keys: List[Tuple[int, int, int]] = []
+        # 建立索引时segments列表的(id, 长度)及`Timerange.mutation_id`, 与当前不一致时重建索引
+        self._index_state: Optional[Tuple[int, int, int]] = None
+        # 已有片段是否两两不重叠, 只有此时才能用二分查找
+        self._index_disjoint = True
+
+    def invalidate_index(self) -> None:
+        """使片段索引在下次使用时重建
+
+        片段时间范围的修改及片段的增删会被自动察觉, 仅在原地替换`segments`中的片段而不改变其长度后需要调用
+        """
+        self._index_state = None
+
+    def _current_index_state(self) -> Tuple[int, int, int]:
+        return (id(self.segments), len(self.segments), Timerange.mutation_id)
+
+    def _ensure_index(self) -> None:
+        if getattr(self, "_index_state", None) == self._current_index_state():
+            return
+        self._index_keys = sorted(
+            (seg.target_timerange.start, seg.target_timerange.end, position)
+            for position, seg in enumerate(self.segments)
+        )
+        self._index_disjoint = not any(
+            self._conflicts(start, end, hi)
+            for hi, (start, end, _) in enumerate(self._index_keys)
+        )
+        self._index_state = self._current_index_state()
+
+    def _conflicts(self, start: int, end: int, hi: Optional[int] = None) -> bool:
+        """判断[start, end)是否与索引前hi项中的片段重叠, 要求这些片段两两不重叠
+
+        两两不重叠的片段按开始时间排序后结束时间也单调不减, 因此只需检查开始于end之前的最后一个片段
+        """
+        position = bisect.bisect_left(self._index_keys, (end,), 0, len(self._index_keys) if hi is None else hi)
+        return position > 0 and self._index_keys[position - 1][1] > start
+
+    def segment_at(self, time: int) -> Optional[Seg_type]:
+        """返回覆盖给定时间点(微秒, 含首尾)的片段, 有多个时返回最先添加的, 没有则返回None"""
+        self._ensure_index()
+        if not self._index_disjoint:
+            return next(
+                (segment for segment in self.segments
+                 if segment.target_timerange.start <= time <= segment.target_timerange.end),
+                None
+            )
+
+        # 开始时间不晚于time的片段中, 从后往前找结束时间不早于time的片段
+        k = bisect.bisect_right(self._index_keys, (time, float("inf"), float("inf"))) - 1
+        found = None
+        while k >= 0 and self._index_keys[k][1] >= time:
+            position = self._index_keys[k][2]
+            if found is None or position < found:
+                found = position
+            k -= 1
+        return None if found is None else self.segments[found]
         
     def add_pending_keyframe(self, property_type: str, time: float, value: str) -> None:
         """添加待处理的关键帧
@@ -119,11 +179,7 @@ class Track(Base_track, Generic[Seg_type]):
             try:
                 # 找到时间点对应的片段（时间单位：微秒）
                 target_time = int(time * 1000000)  # 将秒转换为微秒
-                target_segment = next(
-                    (segment for segment in self.segments 
-                     if segment.target_timerange.start <= target_time <= segment.target_timerange.end),
-                    None
-                )
+                target_segment = self.segment_at(target_time)
                         
                 if target_segment is None:
                     print(f"警告：在轨道 {self.name} 的时间点 {time}s 找不到对应的片段，跳过此关键帧")
@@ -186,20 +242,25 @@ class Track(Base_track, Generic[Seg_type]):
         if not isinstance(segment, self.accept_segment_type):
             raise TypeError("New segment (%s) is not of the same type as the track (%s)" % (type(segment), self.accept_segment_type))
 
-        # 检查片段是否重叠
-        for seg in self.segments:
-            if seg.overlaps(segment):
-                raise SegmentOverlap("New segment overlaps with existing segment [start: {}, end: {}]"
-                                     .format(segment.target_timerange.start, segment.target_timerange.end))
+        # 检查片段是否重叠, 已有片段两两不重叠时用索引二分查找
+        self._ensure_index()
+        start, end = segment.target_timerange.start, segment.target_timerange.end
+        if self._index_disjoint:
+            overlapped = self._conflicts(start, end)
+        else:
+            overlapped = any(seg.overlaps(segment) for seg in self.segments)
+        if overlapped:
+            raise SegmentOverlap("New segment overlaps with existing segment [start: {}, end: {}]"
+                                 .format(segment.target_timerange.start, segment.target_timerange.end))
 
         self.segments.append(segment)
+        bisect.insort(self._index_keys, (start, end, len(self.segments) - 1))
+        self._index_state = self._current_index_state()
         return self
 
     def export_json(self) -> Dict[str, Any]:
-        # 为每个片段写入render_index
-        segment_exports = [seg.export_json() for seg in self.segments]
-        for seg in segment_exports:
-            seg["render_index"] = self.render_index
+        # 未修改的片段复用上次导出的结果, 复制一层后再写入render_index
+        segment_exports = [dict(seg.export_cached_json(), render_index=self.render_index) for seg in self.segments]
 
         return {
             "attribute": int(self.mute),
@@ -3,14 +3,14 @@
 包含图像调节设置、动画效果、特效、转场等相关类
 """
 
+from __future__ import annotations
+
 import uuid
 from copy import deepcopy
 
-from typing import Optional, Literal, Union, overload
+from typing import Optional, Literal, Union, overload, TYPE_CHECKING
 from typing import Dict, List, Tuple, Any
 
-from pyJianYingDraft.metadata.capcut_effect_meta import CapCut_Video_character_effect_type, CapCut_Video_scene_effect_type
-from pyJianYingDraft.metadata.capcut_mask_meta import CapCut_Mask_type
 from settings import IS_CAPCUT_ENV
 
 from .time_util import tim, Timerange
@@ -18,11 +18,15 @@ from .segment import Visual_segment, Clip_settings
 from .local_materials import Video_material
 from .animation import Segment_animations, Video_animation
 
+from . import metadata
 from .metadata import Effect_meta, Effect_param_instance
-from .metadata import Mask_meta, Mask_type, Filter_type, Transition_type, CapCut_Transition_type
-from .metadata import Intro_type, Outro_type, Group_animation_type
-from .metadata import CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type
-from .metadata import Video_scene_effect_type, Video_character_effect_type
+from .metadata import Mask_meta, Mask_type, CapCut_Mask_type
+
+if TYPE_CHECKING:
+    from .metadata import Filter_type, Transition_type, CapCut_Transition_type
+    from .metadata import Intro_type, Outro_type, Group_animation_type
+    from .metadata import CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type
+    from .metadata import Video_scene_effect_type, Video_character_effect_type
 
 
 class Mask:
@@ -119,16 +123,16 @@ class Video_effect:
         self.adjust_params = []
 
         if IS_CAPCUT_ENV:
-            if isinstance(effect_meta, CapCut_Video_scene_effect_type):
+            if isinstance(effect_meta, metadata.CapCut_Video_scene_effect_type):
                 self.effect_type = "video_effect"
-            elif isinstance(effect_meta, CapCut_Video_character_effect_type):
+            elif isinstance(effect_meta, metadata.CapCut_Video_character_effect_type):
                 self.effect_type = "face_effect"
             else:
                 raise TypeError("Invalid effect meta type %s" % type(effect_meta))
         else:
-            if isinstance(effect_meta, Video_scene_effect_type):
+            if isinstance(effect_meta, metadata.Video_scene_effect_type):
                 self.effect_type = "video_effect"
-            elif isinstance(effect_meta, Video_character_effect_type):
+            elif isinstance(effect_meta, metadata.Video_character_effect_type):
                 self.effect_type = "face_effect"
             else:
                 raise TypeError("Invalid effect meta type %s" % type(effect_meta))
@@ -378,18 +382,19 @@ class Video_segment(Visual_segment):
         """
         if duration is not None:
             duration = tim(duration)
-        if (isinstance(animation_type, Intro_type) or isinstance(animation_type, CapCut_Intro_type)):
+        if (isinstance(animation_type, metadata.Intro_type) or isinstance(animation_type, metadata.CapCut_Intro_type)):
             start = 0
             duration = duration or animation_type.value.duration
-        elif isinstance(animation_type, Outro_type) or isinstance(animation_type, CapCut_Outro_type):
+        elif isinstance(animation_type, metadata.Outro_type) or isinstance(animation_type, metadata.CapCut_Outro_type):
             duration = duration or animation_type.value.duration
             start = self.target_timerange.duration - duration
-        elif isinstance(animation_type, Group_animation_type) or isinstance(animation_type, CapCut_Group_animation_type):
+        elif isinstance(animation_type, metadata.Group_animation_type) or isinstance(animation_type, metadata.CapCut_Group_animation_type):
             start = 0
             duration = duration or self.target_timerange.duration
         else:
             raise TypeError("Invalid animation type %s" % type(animation_type))
 
+        self.mark_dirty()
         if self.animations_instance is None:
             self.animations_instance = Segment_animations()
             self.extra_material_refs.append(self.animations_instance.animation_id)
@@ -414,6 +419,7 @@ class Video_segment(Visual_segment):
             raise ValueError("为音频效果 %s 传入了过多的参数" % effect_type.value.name)
 
         effect_inst = Video_effect(effect_type, params)
+        self.mark_dirty()
         self.effects.append(effect_inst)
         self.extra_material_refs.append(effect_inst.global_id)
 
@@ -427,6 +433,7 @@ class Video_segment(Visual_segment):
             intensity (`float`, optional): 滤镜强度(0-100), 仅当所选滤镜能够调节强度时有效. 默认为100.
         """
         filter_inst = Filter(filter_type.value, intensity / 100.0)  # 转化为0~1范围
+        self.mark_dirty()
         self.filters.append(filter_inst)
         self.extra_material_refs.append(filter_inst.global_id)
 
@@ -470,6 +477,7 @@ class Video_segment(Visual_segment):
                          w=width, h=size, ratio=mask_type.value.default_aspect_ratio,
                          rot=rotation, inv=invert, feather=feather/100, round_corner=round_corner/100)
         self.extra_material_refs.append(self.mask.global_id)
+        self.mark_dirty()
         return self
 
     def add_transition(self, transition_type: Union[Transition_type, CapCut_Transition_type], *, duration: Optional[Union[int, str]] = None) -> "Video_segment":
@@ -488,6 +496,7 @@ class Video_segment(Visual_segment):
 
         self.transition = Transition(transition_type, duration)
         self.extra_material_refs.append(self.transition.global_id)
+        self.mark_dirty()
         return self
 
     def add_background_filling(self, fill_type: Literal["blur", "color"], blur: float = 0.0625, color: str = "#00000000") -> "Video_segment":
@@ -514,6 +523,7 @@ class Video_segment(Visual_segment):
             raise ValueError(f"无效的背景填充类型 {fill_type}")
 
         self.extra_material_refs.append(self.background_filling.global_id)
+        self.mark_dirty()
         return self
 
     def export_json(self) -> Dict[str, Any]:
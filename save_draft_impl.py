@@ -1,19 +1,18 @@
+import bisect
 import os
 import pyJianYingDraft as draft
 import shutil
 from util import zip_draft, build_draft_asset_path
 from oss import upload_to_oss
-from typing import Dict, Literal
-from draft_cache import DRAFT_CACHE
-from save_task_cache import DRAFT_TASKS, get_task_status, update_tasks_cache, update_task_field, increment_task_field, update_task_fields, create_task
-from downloader import download_audio, download_file, download_image, download_video
+from typing import Dict, List, Literal, Optional, Tuple
+from draft_cache import DRAFT_CACHE, update_cache, draft_lock, replay_on_conflict
+from save_task_cache import get_task_status, wait_for_task_status, update_tasks_cache, update_task_field, update_task_fields, create_task
+from downloader import download_audio, download_image, download_video
+from asset_cache import download_asset
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import imageio.v2 as imageio
-import subprocess
 import json
-from get_duration_impl import get_video_duration
+from media_probe import AUDIO, PHOTO, VIDEO, probe_media
 import uuid
-import threading
 from collections import OrderedDict
 import time
 import requests # Import requests for making HTTP calls
@@ -21,13 +20,14 @@ import logging
 # Import configuration
 from settings import IS_UPLOAD_DRAFT
 from draft_profiles import get_draft_profile, write_profile_content
+from save_task_queue import SAVE_TASK_QUEUE, TaskCancelled
 
 # --- Get your Logger instance ---
 # The name here must match the logger name you configured in app.py
 logger = logging.getLogger('flask_video_generator') 
 
 # Define task status enumeration type
-TaskStatus = Literal["initialized", "processing", "completed", "failed", "not_found"]
+TaskStatus = Literal["initialized", "processing", "completed", "failed", "cancelled", "not_found"]
 
 def build_asset_path(draft_folder: str, draft_id: str, asset_type: str, material_name: str) -> str:
     """
@@ -40,11 +40,92 @@ def build_asset_path(draft_folder: str, draft_id: str, asset_type: str, material
     """
     return build_draft_asset_path(draft_folder, draft_id, asset_type, material_name)
 
+def _prepare_draft_for_save(draft_id, draft_folder, output_base_dir, task_id, probes):
+    """
+    Apply probed media metadata and local asset paths to the latest version of the draft and persist it
+
+    Runs under the draft lock through `replay_on_conflict`, so an edit saved concurrently by another
+    worker makes it reload the draft and start over instead of failing the save.
+
+    :return: The updated draft and its download tasks
+    """
+    script = DRAFT_CACHE.get(draft_id)
+    if script is None:
+        raise ValueError(f"Draft {draft_id} does not exist in cache")
+    update_media_metadata(script, task_id, probes=probes)
+
+    download_tasks = []
+
+    audios = script.materials.audios
+    if audios:
+        for audio in audios:
+            remote_url = audio.remote_url
+            material_name = audio.material_name
+            # Use helper function to build path
+            if draft_folder:
+                audio.replace_path = build_asset_path(draft_folder, draft_id, "audio", material_name)
+            if not remote_url:
+                logger.warning(f"Audio file {material_name} has no remote_url, skipping download.")
+                continue
+
+            # Add audio download task
+            download_tasks.append({
+                'type': 'audio',
+                'func': download_asset,
+                'args': (remote_url, os.path.join(output_base_dir, f"{draft_id}/assets/audio/{material_name}")),
+                'material': audio
+            })
+
+    # Collect video and image download tasks
+    videos = script.materials.videos
+    if videos:
+        for video in videos:
+            remote_url = video.remote_url
+            material_name = video.material_name
+
+            if video.material_type == 'photo':
+                # Use helper function to build path
+                if draft_folder:
+                    video.replace_path = build_asset_path(draft_folder, draft_id, "image", material_name)
+                if not remote_url:
+                    logger.warning(f"Image file {material_name} has no remote_url, skipping download.")
+                    continue
+
+                # Add image download task
+                download_tasks.append({
+                    'type': 'image',
+                    'func': download_asset,
+                    'args': (remote_url, os.path.join(output_base_dir, f"{draft_id}/assets/image/{material_name}")),
+                    'material': video
+                })
+
+            elif video.material_type == 'video':
+                # Use helper function to build path
+                if draft_folder:
+                    video.replace_path = build_asset_path(draft_folder, draft_id, "video", material_name)
+                if not remote_url:
+                    logger.warning(f"Video file {material_name} has no remote_url, skipping download.")
+                    continue
+
+                # Add video download task
+                download_tasks.append({
+                    'type': 'video',
+                    'func': download_asset,
+                    'args': (remote_url, os.path.join(output_base_dir, f"{draft_id}/assets/video/{material_name}")),
+                    'material': video
+                })
+
+    # Persist refreshed media metadata and asset paths
+    update_cache(draft_id, script)
+    return script, download_tasks
+
+
 def save_draft_background(draft_id, draft_folder, task_id):
     """Background save draft to OSS"""
     try:
         # Get draft information from global cache
-        if draft_id not in DRAFT_CACHE:
+        script = DRAFT_CACHE.get(draft_id)
+        if script is None:
             task_status = {
                 "status": "failed",
                 "message": f"Draft {draft_id} does not exist in cache",
@@ -57,7 +138,6 @@ def save_draft_background(draft_id, draft_folder, task_id):
             logger.error(f"Draft {draft_id} does not exist in cache, task {task_id} failed.")
             return
             
-        script = DRAFT_CACHE[draft_id]
         logger.info(f"Successfully retrieved draft {draft_id} from cache.")
         
         # Update task status to processing
@@ -91,76 +171,23 @@ def save_draft_background(draft_id, draft_folder, task_id):
             raise FileNotFoundError(f"Template draft {template_dir} does not exist")
         shutil.copytree(template_source_dir, draft_dir)
         
+        SAVE_TASK_QUEUE.raise_if_cancelled(task_id)
+
         # Update task status
-        update_task_field(task_id, "message", "Updating media file metadata")
-        update_task_field(task_id, "progress", 5)
+        update_task_fields(task_id, message="Updating media file metadata", progress=5)
         logger.info(f"Task {task_id} progress 5%: Updating media file metadata.")
-        
-        update_media_metadata(script, task_id)
-        
-        download_tasks = []
-        
-        audios = script.materials.audios
-        if audios:
-            for audio in audios:
-                remote_url = audio.remote_url
-                material_name = audio.material_name
-                # Use helper function to build path
-                if draft_folder:
-                    audio.replace_path = build_asset_path(draft_folder, draft_id, "audio", material_name)
-                if not remote_url:
-                    logger.warning(f"Audio file {material_name} has no remote_url, skipping download.")
-                    continue
-                
-                # Add audio download task
-                download_tasks.append({
-                    'type': 'audio',
-                    'func': download_file,
-                    'args': (remote_url, os.path.join(output_base_dir, f"{draft_id}/assets/audio/{material_name}")),
-                    'material': audio
-                })
-        
-        # Collect video and image download tasks
-        videos = script.materials.videos
-        if videos:
-            for video in videos:
-                remote_url = video.remote_url
-                material_name = video.material_name
-                
-                if video.material_type == 'photo':
-                    # Use helper function to build path
-                    if draft_folder:
-                        video.replace_path = build_asset_path(draft_folder, draft_id, "image", material_name)
-                    if not remote_url:
-                        logger.warning(f"Image file {material_name} has no remote_url, skipping download.")
-                        continue
-                    
-                    # Add image download task
-                    download_tasks.append({
-                        'type': 'image',
-                        'func': download_file,
-                        'args': (remote_url, os.path.join(output_base_dir, f"{draft_id}/assets/image/{material_name}")),
-                        'material': video
-                    })
-                
-                elif video.material_type == 'video':
-                    # Use helper function to build path
-                    if draft_folder:
-                        video.replace_path = build_asset_path(draft_folder, draft_id, "video", material_name)
-                    if not remote_url:
-                        logger.warning(f"Video file {material_name} has no remote_url, skipping download.")
-                        continue
-                    
-                    # Add video download task
-                    download_tasks.append({
-                        'type': 'video',
-                        'func': download_file,
-                        'args': (remote_url, os.path.join(output_base_dir, f"{draft_id}/assets/video/{material_name}")),
-                        'material': video
-                    })
 
-        update_task_field(task_id, "message", f"Collected {len(download_tasks)} download tasks in total")
-        update_task_field(task_id, "progress", 10)
+        # Probe the media without the draft lock, a slow remote asset must not block edits of the draft
+        probes = probe_script_media(draft_id, script, task_id)
+
+        # Hold the draft lock while metadata and asset paths are rewritten, downloads run without it
+        script, download_tasks = replay_on_conflict(draft_id, _prepare_draft_for_save,
+                                                    draft_id, draft_folder, output_base_dir, task_id, probes)
+
+        update_task_fields(task_id,
+                          message=f"Collected {len(download_tasks)} download tasks in total",
+                          progress=10,
+                          total_files=len(download_tasks))
         logger.info(f"Task {task_id} progress 10%: Collected {len(download_tasks)} download tasks in total.")
 
         # Execute all download tasks concurrently
@@ -180,21 +207,24 @@ def save_draft_background(draft_id, draft_folder, task_id):
                 # Wait for all tasks to complete
                 for future in as_completed(future_to_task):
                     task = future_to_task[future]
+                    if SAVE_TASK_QUEUE.is_cancelled(task_id):
+                        # Drop downloads that have not started yet, running ones finish on their own
+                        for pending in future_to_task:
+                            pending.cancel()
+                        raise TaskCancelled(f"Task {task_id} was cancelled")
                     try:
                         local_path = future.result()
                         downloaded_paths.append(local_path)
                         
-                        # Update task status - only update completed files count
+                        # Update task status in one atomic step
                         completed_files += 1
-                        update_task_field(task_id, "completed_files", completed_files)
-                        task_status = get_task_status(task_id)
-                        completed = task_status["completed_files"]
                         total = len(download_tasks)
-                        update_task_field(task_id, "total_files", total)
                         # Download part accounts for 60% of the total progress
-                        download_progress = 10 + int((completed / total) * 60)
-                        update_task_field(task_id, "progress", download_progress)
-                        update_task_field(task_id, "message", f"Downloaded {completed}/{total} files")
+                        download_progress = 10 + int((completed_files / total) * 60)
+                        update_task_fields(task_id,
+                                          completed_files=completed_files,
+                                          progress=download_progress,
+                                          message=f"Downloaded {completed_files}/{total} files")
                         
                         logger.info(f"Task {task_id}: Successfully downloaded {task['type']} file, progress {download_progress}.")
                     except Exception as e:
@@ -203,20 +233,25 @@ def save_draft_background(draft_id, draft_folder, task_id):
             
             logger.info(f"Task {task_id}: Concurrent download completed, downloaded {len(downloaded_paths)} files in total.")
         
+        SAVE_TASK_QUEUE.raise_if_cancelled(task_id)
+
         # Update task status - Start saving draft information
-        update_task_field(task_id, "progress", 70)
-        update_task_field(task_id, "message", "Saving draft information")
+        update_task_fields(task_id, progress=70, message="Saving draft information")
         logger.info(f"Task {task_id} progress 70%: Saving draft information.")
         
-        written_files = write_profile_content(draft_profile, draft_dir, script.dumps(draft_profile))
+        with draft_lock(draft_id):
+            draft_content = script.dumps(draft_profile, indent=None)
+            timeline_id = script.content.get("id")
+        written_files = write_profile_content(draft_profile, draft_dir, draft_content, timeline_id)
         logger.info(f"Draft information has been saved to {[str(path) for path in written_files]}.")
 
         draft_url = ""
         # Only upload draft information when IS_UPLOAD_DRAFT is True
         if IS_UPLOAD_DRAFT:
+            SAVE_TASK_QUEUE.raise_if_cancelled(task_id)
+
             # Update task status - Start compressing draft
-            update_task_field(task_id, "progress", 80)
-            update_task_field(task_id, "message", "Compressing draft files")
+            update_task_fields(task_id, progress=80, message="Compressing draft files")
             logger.info(f"Task {task_id} progress 80%: Compressing draft files.")
             
             # Compress the entire draft directory
@@ -224,8 +259,7 @@ def save_draft_background(draft_id, draft_folder, task_id):
             logger.info(f"Draft directory {os.path.join(current_dir, draft_id)} has been compressed to {zip_path}.")
             
             # Update task status - Start uploading to OSS
-            update_task_field(task_id, "progress", 90)
-            update_task_field(task_id, "message", "Uploading to cloud storage")
+            update_task_fields(task_id, progress=90, message="Uploading to cloud storage")
             logger.info(f"Task {task_id} progress 90%: Uploading to cloud storage.")
             
             # Upload to OSS
@@ -240,12 +274,17 @@ def save_draft_background(draft_id, draft_folder, task_id):
 
     
         # Update task status - Completed
-        update_task_field(task_id, "status", "completed")
-        update_task_field(task_id, "progress", 100)
-        update_task_field(task_id, "message", "Draft creation completed")
+        update_task_fields(task_id, status="completed", progress=100, message="Draft creation completed")
         logger.info(f"Task {task_id} completed, draft URL: {draft_url}")
         return draft_url
 
+    except TaskCancelled:
+        update_task_fields(task_id,
+                          status="cancelled",
+                          message="Draft saving was cancelled")
+        logger.info(f"Saving draft {draft_id} task {task_id} was cancelled.")
+        return ""
+
     except Exception as e:
         # Update task status - Failed
         update_task_fields(task_id, 
@@ -254,31 +293,47 @@ def save_draft_background(draft_id, draft_folder, task_id):
         logger.error(f"Saving draft {draft_id} task {task_id} failed: {str(e)}", exc_info=True)
         return ""
 
-def query_task_status(task_id: str):
-    return get_task_status(task_id)
+def query_task_status(task_id: str, since_version: Optional[int] = None, timeout: float = 30):
+    """Get the task status, long-polling for a newer version when `since_version` is given"""
+    if since_version is None:
+        return get_task_status(task_id)
+    return wait_for_task_status(task_id, since_version, timeout)
+
+def save_draft_impl(draft_id: str, draft_folder: str = None, is_async: bool = False) -> Dict[str, str]:
+    """Save the draft, optionally as a queued background task
 
-def save_draft_impl(draft_id: str, draft_folder: str = None) -> Dict[str, str]:
-    """Start a background task to save the draft"""
-    logger.info(f"Received save draft request: draft_id={draft_id}, draft_folder={draft_folder}")
+    :param draft_id: Draft ID
+    :param draft_folder: Draft folder path
+    :param is_async: Queue the save and return immediately, poll `query_task_status` with the returned task_id
+    :return: draft_url when saved synchronously, task_id when queued
+    """
+    logger.info(f"Received save draft request: draft_id={draft_id}, draft_folder={draft_folder}, is_async={is_async}")
     try:
         # Generate a unique task ID
         task_id = draft_id
-        create_task(task_id)
-        logger.info(f"Task {task_id} has been created.")
-        
-        # Changed to synchronous execution
+
+        if not is_async:
+            # Rejected while an asynchronous save of the same draft is queued or running,
+            # both would rewrite the same draft folder
+            draft_url = SAVE_TASK_QUEUE.run(task_id, save_draft_background, draft_id, draft_folder, task_id,
+                                            on_accept=lambda: create_task(task_id))
+            return {
+                "success": True,
+                "draft_url": draft_url
+                }
+
+        # The status is registered only once the queue accepts the task, and before a worker can pick it up,
+        # so pollers never see not_found and the progress of an already queued save is left untouched.
+        # A rejected save (queue full or already queued) is only reported to the caller
+        SAVE_TASK_QUEUE.submit(task_id, save_draft_background, draft_id, draft_folder, task_id,
+                               on_accept=lambda: create_task(task_id))
+        logger.info(f"Task {task_id} has been queued.")
         return {
             "success": True,
-            "draft_url": save_draft_background(draft_id, draft_folder, task_id)
+            "task_id": task_id,
+            "draft_url": ""
             }
 
-        # # Start a background thread to execute the task
-        # thread = threading.Thread(
-        #     target=save_draft_background,
-        #     args=(draft_id, draft_folder, task_id)
-        # )
-        # thread.start()
-        
     except Exception as e:
         logger.error(f"Failed to start save draft task {draft_id}: {str(e)}", exc_info=True)
         return {
@@ -286,16 +341,127 @@ def save_draft_impl(draft_id: str, draft_folder: str = None) -> Dict[str, str]:
             "error": str(e)
         }
 
-def update_media_metadata(script, task_id=None):
+def cancel_save_task(task_id: str) -> Dict[str, str]:
+    """Cancel a queued or running asynchronous save task
+
+    :param task_id: Task ID returned by an asynchronous save_draft_impl call
+    :return: Task status after the cancellation request
+    """
+    result = SAVE_TASK_QUEUE.cancel(task_id)
+    if result == "not_found":
+        return {
+            "success": False,
+            "error": f"Task {task_id} is not queued or running"
+        }
+    if result == "cancelled":
+        # The task never started, so nothing else will record the cancellation
+        update_task_fields(task_id, status="cancelled", message="Draft saving was cancelled")
+    else:
+        update_task_field(task_id, "message", "Cancelling draft saving")
+    logger.info(f"Task {task_id} cancellation requested: {result}.")
+    return {
+        "success": True,
+        "status": get_task_status(task_id)["status"]
+    }
+
+def resolve_segment_overlaps(track, track_name: str = "") -> List:
+    """Delete segments that overlap an earlier-added segment of the track
+
+    A segment is kept if and only if it does not overlap any kept segment added before it, which is
+    what comparing every pair and always deleting the later one amounts to. Kept segments never
+    overlap, so sorted by (start, end) their ends are non-decreasing as well, and a new segment
+    [s, e) conflicts exactly when the last kept segment starting before e ends after s. One bisect
+    per segment replaces the pairwise comparison.
+
+    :param track: Track whose segments are checked in insertion order
+    :param track_name: Track name for logging
+    :return: Deleted segments
+    """
+    kept_keys = []  # (start, end, index) of kept segments, sorted
+    removed = []
+    kept = []
+    for index, segment in enumerate(track.segments):
+        start, end = segment.target_timerange.start, segment.target_timerange.end
+        position = bisect.bisect_left(kept_keys, (end,))
+        if position > 0 and kept_keys[position - 1][1] > start:
+            earlier = track.segments[kept_keys[position - 1][2]]
+            logger.warning(f"Time range conflict between segments {earlier.segment_id} and {segment.segment_id} in track {track_name}, deleting the later segment")
+            removed.append(segment)
+            continue
+        bisect.insort(kept_keys, (start, end, index))
+        kept.append(segment)
+
+    if removed:
+        track.segments[:] = kept
+    return removed
+
+def _fit_segment_to_duration(segment, duration: int, kind: str) -> None:
+    """Shrink a segment whose source range runs past the real media duration"""
+    # Get current settings
+    current_target = segment.target_timerange
+    current_source = segment.source_timerange
+    speed = segment.speed.speed
+
+    # If the end time of source_timerange exceeds the new media duration, adjust it
+    if current_source.end > duration or current_source.end <= 0:
+        # Adjust source_timerange to fit the new media duration
+        new_source_duration = duration - current_source.start
+        if new_source_duration <= 0:
+            logger.warning(f"Warning: {kind} segment {segment.segment_id} start time {current_source.start} exceeds {kind.lower()} duration {duration}, will skip this segment.")
+            return
+
+        # Update source_timerange
+        segment.source_timerange = draft.Timerange(current_source.start, new_source_duration)
+
+        # Update target_timerange based on new source_timerange and speed
+        new_target_duration = int(new_source_duration / speed)
+        segment.target_timerange = draft.Timerange(current_target.start, new_target_duration)
+        segment.mark_dirty()
+
+        logger.info(f"Adjusted {kind.lower()} segment {segment.segment_id} timerange to fit the new {kind.lower()} duration.")
+
+def media_probe_items(script) -> List[Tuple[str, str]]:
+    """(url, kind) pairs of the remote media of the script that `update_media_metadata` needs probed"""
+    probe_items = [(audio.remote_url, AUDIO) for audio in script.materials.audios if audio.remote_url]
+    probe_items += [(video.remote_url, video.material_type) for video in script.materials.videos
+                    if video.remote_url and video.material_type in (PHOTO, VIDEO)]
+    return probe_items
+
+def probe_script_media(draft_id: str, script, task_id=None) -> Dict[Tuple[str, str], Optional[dict]]:
+    """
+    Probe the remote media of a draft concurrently, holding its lock only while the URLs are collected
+    
+    :param draft_id: Draft ID
+    :param script: Draft script object
+    :param task_id: Optional task ID for updating task status
+    :return: Probe results to pass to `update_media_metadata`
+    """
+    with draft_lock(draft_id):
+        probe_items = media_probe_items(script)
+    if task_id and probe_items:
+        update_task_field(task_id, "message", f"Probing metadata of {len(probe_items)} media files")
+    return probe_media(probe_items)
+
+def update_media_metadata(script, task_id=None, probes=None):
     """
     Update metadata for all media files in the script (duration, width/height, etc.)
     
     :param script: Draft script object
     :param task_id: Optional task ID for updating task status
+    :param probes: Results of `probe_script_media`, media added since then is probed here
     :return: None
     """
-    # Process audio file metadata
     audios = script.materials.audios
+    videos = script.materials.videos
+
+    # Probe all media concurrently before touching the script, repeated media is answered from the metadata cache
+    probes = dict(probes or {})
+    missing_items = [item for item in media_probe_items(script) if item not in probes]
+    if task_id and missing_items:
+        update_task_field(task_id, "message", f"Probing metadata of {len(missing_items)} media files")
+    probes.update(probe_media(missing_items))
+
+    # Process audio file metadata
     if not audios:
         logger.info("No audio files found in the draft.")
     else:
@@ -305,72 +471,30 @@ def update_media_metadata(script, task_id=None):
             if not remote_url:
                 logger.warning(f"Warning: Audio file {material_name} has no remote_url, skipped.")
                 continue
-            
-            try:
-                video_command = [
-                    'ffprobe',
-                    '-v', 'error',
-                    '-select_streams', 'v:0',
-                    '-show_entries', 'stream=codec_type',
-                    '-of', 'json',
-                    remote_url
-                ]
-                video_result = subprocess.check_output(video_command, stderr=subprocess.STDOUT)
-                video_result_str = video_result.decode('utf-8')
-                # Find JSON start position (first '{')
-                video_json_start = video_result_str.find('{')
-                if video_json_start != -1:
-                    video_json_str = video_result_str[video_json_start:]
-                    video_info = json.loads(video_json_str)
-                    if 'streams' in video_info and len(video_info['streams']) > 0:
-                        logger.warning(f"Warning: Audio file {material_name} contains video tracks, skipped its metadata update.")
-                        continue
-            except Exception as e:
-                logger.error(f"Error occurred while checking if audio {material_name} contains video streams: {str(e)}", exc_info=True)
 
-            # Get audio duration and set it
+            probe = probes.get((remote_url, AUDIO))
+            if probe is None:
+                logger.warning(f"Warning: Unable to get audio {material_name} duration.")
+                continue
+            if probe["has_video"]:
+                logger.warning(f"Warning: Audio file {material_name} contains video tracks, skipped its metadata update.")
+                continue
+
+            # Convert seconds to microseconds
+            audio.duration = int(probe["duration"] * 1000000)
+            logger.info(f"Successfully obtained audio {material_name} duration: {probe['duration']:.2f} seconds ({audio.duration} microseconds).")
+
+            # Update timerange for all segments using this audio material
             try:
-                duration_result = get_video_duration(remote_url)
-                if duration_result["success"]:
-                    if task_id:
-                        update_task_field(task_id, "message", f"Processing audio metadata: {material_name}")
-                    # Convert seconds to microseconds
-                    audio.duration = int(duration_result["output"] * 1000000)
-                    logger.info(f"Successfully obtained audio {material_name} duration: {duration_result['output']:.2f} seconds ({audio.duration} microseconds).")
-                    
-                    # Update timerange for all segments using this audio material
-                    for track_name, track in script.tracks.items():
-                        if track.track_type == draft.Track_type.audio:
-                            for segment in track.segments:
-                                if isinstance(segment, draft.Audio_segment) and segment.material_id == audio.material_id:
-                                    # Get current settings
-                                    current_target = segment.target_timerange
-                                    current_source = segment.source_timerange
-                                    speed = segment.speed.speed
-                                    
-                                    # If the end time of source_timerange exceeds the new audio duration, adjust it
-                                    if current_source.end > audio.duration or current_source.end <= 0:
-                                        # Adjust source_timerange to fit the new audio duration
-                                        new_source_duration = audio.duration - current_source.start
-                                        if new_source_duration <= 0:
-                                            logger.warning(f"Warning: Audio segment {segment.segment_id} start time {current_source.start} exceeds audio duration {audio.duration}, will skip this segment.")
-                                            continue
-                                            
-                                        # Update source_timerange
-                                        segment.source_timerange = draft.Timerange(current_source.start, new_source_duration)
-                                        
-                                        # Update target_timerange based on new source_timerange and speed
-                                        new_target_duration = int(new_source_duration / speed)
-                                        segment.target_timerange = draft.Timerange(current_target.start, new_target_duration)
-                                        
-                                        logger.info(f"Adjusted audio segment {segment.segment_id} timerange to fit the new audio duration.")
-                else:
-                    logger.warning(f"Warning: Unable to get audio {material_name} duration: {duration_result['error']}.")
+                for track_name, track in script.tracks.items():
+                    if track.track_type == draft.Track_type.audio:
+                        for segment in track.segments:
+                            if isinstance(segment, draft.Audio_segment) and segment.material_id == audio.material_id:
+                                _fit_segment_to_duration(segment, audio.duration, "Audio")
             except Exception as e:
-                logger.error(f"Error occurred while getting audio {material_name} duration: {str(e)}", exc_info=True)
-    
+                logger.error(f"Error occurred while adjusting segments of audio {material_name}: {str(e)}", exc_info=True)
+
     # Process video and image file metadata
-    videos = script.materials.videos
     if not videos:
         logger.info("No video or image files found in the draft.")
     else:
@@ -380,137 +504,45 @@ def update_media_metadata(script, task_id=None):
             if not remote_url:
                 logger.warning(f"Warning: Media file {material_name} has no remote_url, skipped.")
                 continue
-                
+
             if video.material_type == 'photo':
-                # Use imageio to get image width/height and set it
-                try:
-                    if task_id:
-                        update_task_field(task_id, "message", f"Processing image metadata: {material_name}")
-                    img = imageio.imread(remote_url)
-                    video.height, video.width = img.shape[:2]
-                    logger.info(f"Successfully set image {material_name} dimensions: {video.width}x{video.height}.")
-                except Exception as e:
-                    logger.error(f"Failed to set image {material_name} dimensions: {str(e)}, using default values 1920x1080.", exc_info=True)
+                probe = probes.get((remote_url, PHOTO))
+                if probe is None:
+                    logger.error(f"Failed to set image {material_name} dimensions, using default values 1920x1080.")
                     video.width = 1920
                     video.height = 1080
-            
+                else:
+                    video.width, video.height = probe["width"], probe["height"]
+                    logger.info(f"Successfully set image {material_name} dimensions: {video.width}x{video.height}.")
+
             elif video.material_type == 'video':
-                # Get video duration and width/height information
-                try:
-                    if task_id:
-                        update_task_field(task_id, "message", f"Processing video metadata: {material_name}")
-                    # Use ffprobe to get video information
-                    command = [
-                        'ffprobe',
-                        '-v', 'error',
-                        '-select_streams', 'v:0',  # Select the first video stream
-                        '-show_entries', 'stream=width,height,duration',
-                        '-show_entries', 'format=duration',
-                        '-of', 'json',
-                        remote_url
-                    ]
-                    result = subprocess.check_output(command, stderr=subprocess.STDOUT)
-                    result_str = result.decode('utf-8')
-                    # Find JSON start position (first '{')
-                    json_start = result_str.find('{')
-                    if json_start != -1:
-                        json_str = result_str[json_start:]
-                        info = json.loads(json_str)
-                        
-                        if 'streams' in info and len(info['streams']) > 0:
-                            stream = info['streams'][0]
-                            # Set width and height
-                            video.width = int(stream.get('width', 0))
-                            video.height = int(stream.get('height', 0))
-                            logger.info(f"Successfully set video {material_name} dimensions: {video.width}x{video.height}.")
-                            
-                            # Set duration
-                            # Prefer stream duration, if not available use format duration
-                            duration = stream.get('duration') or info['format'].get('duration', '0')
-                            video.duration = int(float(duration) * 1000000)  # Convert to microseconds
-                            logger.info(f"Successfully obtained video {material_name} duration: {float(duration):.2f} seconds ({video.duration} microseconds).")
-                            
-                            # Update timerange for all segments using this video material
-                            for track_name, track in script.tracks.items():
-                                if track.track_type == draft.Track_type.video:
-                                    for segment in track.segments:
-                                        if isinstance(segment, draft.Video_segment) and segment.material_id == video.material_id:
-                                            # Get current settings
-                                            current_target = segment.target_timerange
-                                            current_source = segment.source_timerange
-                                            speed = segment.speed.speed
-
-                                            # If the end time of source_timerange exceeds the new video duration, adjust it
-                                            if current_source.end > video.duration or current_source.end <= 0:
-                                                # Adjust source_timerange to fit the new video duration
-                                                new_source_duration = video.duration - current_source.start
-                                                if new_source_duration <= 0:
-                                                    logger.warning(f"Warning: Video segment {segment.segment_id} start time {current_source.start} exceeds video duration {video.duration}, will skip this segment.")
-                                                    continue
-                                                    
-                                                # Update source_timerange
-                                                segment.source_timerange = draft.Timerange(current_source.start, new_source_duration)
-                                                
-                                                # Update target_timerange based on new source_timerange and speed
-                                                new_target_duration = int(new_source_duration / speed)
-                                                segment.target_timerange = draft.Timerange(current_target.start, new_target_duration)
-                                                
-                                                logger.info(f"Adjusted video segment {segment.segment_id} timerange to fit the new video duration.")
-                        else:
-                            logger.warning(f"Warning: Unable to get video {material_name} stream information.")
-                            # Set default values
-                            video.width = 1920
-                            video.height = 1080
-                    else:
-                        logger.warning(f"Warning: Could not find JSON data in ffprobe output.")
-                        # Set default values
-                        video.width = 1920
-                        video.height = 1080
-                except Exception as e:
-                    logger.error(f"Error occurred while getting video {material_name} information: {str(e)}, using default values 1920x1080.", exc_info=True)
-                    # Set default values
+                probe = probes.get((remote_url, VIDEO))
+                if probe is None or probe["width"] is None:
+                    logger.warning(f"Warning: Unable to get video {material_name} dimensions, using default values 1920x1080.")
                     video.width = 1920
                     video.height = 1080
-                    
-                    # Try to get duration separately
-                    try:
-                        duration_result = get_video_duration(remote_url)
-                        if duration_result["success"]:
-                            # Convert seconds to microseconds
-                            video.duration = int(duration_result["output"] * 1000000)
-                            logger.info(f"Successfully obtained video {material_name} duration: {duration_result['output']:.2f} seconds ({video.duration} microseconds).")
-                        else:
-                            logger.warning(f"Warning: Unable to get video {material_name} duration: {duration_result['error']}.")
-                    except Exception as e2:
-                        logger.error(f"Error occurred while getting video {material_name} duration: {str(e2)}.", exc_info=True)
+                    if probe is None:
+                        continue
+                else:
+                    video.width, video.height = probe["width"], probe["height"]
+                    logger.info(f"Successfully set video {material_name} dimensions: {video.width}x{video.height}.")
+                video.duration = int(probe["duration"] * 1000000)  # Convert to microseconds
+                logger.info(f"Successfully obtained video {material_name} duration: {probe['duration']:.2f} seconds ({video.duration} microseconds).")
+
+                # Update timerange for all segments using this video material
+                try:
+                    for track_name, track in script.tracks.items():
+                        if track.track_type == draft.Track_type.video:
+                            for segment in track.segments:
+                                if isinstance(segment, draft.Video_segment) and segment.material_id == video.material_id:
+                                    _fit_segment_to_duration(segment, video.duration, "Video")
+                except Exception as e:
+                    logger.error(f"Error occurred while adjusting segments of video {material_name}: {str(e)}", exc_info=True)
 
     # After updating all segments' timerange, check if there are time range conflicts in each track, and delete the later segment in case of conflict
     logger.info("Checking track segment time range conflicts...")
     for track_name, track in script.tracks.items():
-        # Use a set to record segment indices that need to be deleted
-        to_remove = set()
-        
-        # Check for conflicts between all segments
-        for i in range(len(track.segments)):
-            # Skip if current segment is already marked for deletion
-            if i in to_remove:
-                continue
-                
-            for j in range(len(track.segments)):
-                # Skip self-comparison and segments already marked for deletion
-                if i == j or j in to_remove:
-                    continue
-                    
-                # Check if there is a conflict
-                if track.segments[i].overlaps(track.segments[j]):
-                    # Always keep the segment with the smaller index (added first)
-                    later_index = max(i, j)
-                    logger.warning(f"Time range conflict between segments {track.segments[min(i, j)].segment_id} and {track.segments[later_index].segment_id} in track {track_name}, deleting the later segment")
-                    to_remove.add(later_index)
-        
-        # Delete marked segments from back to front to avoid index change issues
-        for index in sorted(to_remove, reverse=True):
-            track.segments.pop(index)
+        resolve_segment_overlaps(track, track_name)
 
     # After updating all segments' timerange, recalculate the total duration of the script
     max_duration = 0
@@ -537,17 +569,20 @@ def query_script_impl(draft_id: str, force_update: bool = True):
     :return: Script object
     """
     # Get draft information from global cache
-    if draft_id not in DRAFT_CACHE:
+    script = DRAFT_CACHE.get(draft_id)
+    if script is None:
         logger.warning(f"Draft {draft_id} does not exist in cache.")
         return None
         
-    script = DRAFT_CACHE[draft_id]
     logger.info(f"Retrieved draft {draft_id} from cache.")
     
     # If force_update is True, force refresh media metadata
     if force_update:
         logger.info(f"Force refreshing media metadata for draft {draft_id}.")
-        update_media_metadata(script)
+        probes = probe_script_media(draft_id, script)
+        with draft_lock(draft_id):
+            update_media_metadata(script, probes=probes)
+            update_cache(draft_id, script)
     
     # Return script object
     return script
@@ -617,7 +652,7 @@ def download_script(draft_id: str, draft_folder: str = None, script_data: Dict =
                 # Add audio download task
                 download_tasks.append({
                     'type': 'audio',
-                    'func': download_file,
+                    'func': download_asset,
                     'args': (remote_url, audio['path']),
                     'material': audio
                 })
@@ -640,7 +675,7 @@ def download_script(draft_id: str, draft_folder: str = None, script_data: Dict =
                     # Add image download task
                     download_tasks.append({
                         'type': 'image',
-                        'func': download_file,
+                        'func': download_asset,
                         'args': (remote_url, video['path']),
                         'material': video
                     })
@@ -656,7 +691,7 @@ def download_script(draft_id: str, draft_folder: str = None, script_data: Dict =
                     # Add video download task
                     download_tasks.append({
                         'type': 'video',
-                        'func': download_file,
+                        'func': download_asset,
                         'args': (remote_url, video['path']),
                         'material': video
                     })
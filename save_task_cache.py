@@ -1,142 +1,199 @@
 from collections import OrderedDict
 import threading
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional
 
-# Using OrderedDict to implement LRU cache, limiting the maximum number to 1000
-DRAFT_TASKS: Dict[str, dict] = OrderedDict()  # Using Dict for type hinting
-MAX_TASKS_CACHE_SIZE = 1000
+# Finished tasks are kept for polling until they expire, bounded in number as a safety net
+FINISHED_TASK_TTL_SECONDS = 3600
+MAX_FINISHED_TASKS = 1000
+# Statuses after which a task no longer changes on its own
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+def _default_status(status: str = "initialized", message: str = "Task initialized") -> dict:
+    return {
+        "status": status,
+        "message": message,
+        "progress": 0,
+        "completed_files": 0,
+        "total_files": 0,
+        "draft_url": ""
+    }
+
+
+class TaskStatusStore:
+    """Thread-safe store of save task statuses
+
+    Status dicts are updated in place under a single lock, so a multi-field update is seen by readers
+    either entirely or not at all. Running tasks are never evicted; finished tasks expire
+    `finished_ttl` seconds after they finish, and at most `max_finished` of them are kept.
+
+    Every change stamps the task with a new store-wide version and wakes threads blocked in `wait`,
+    which lets progress be pushed to clients instead of polled.
+    """
+
+    def __init__(self, finished_ttl: float = FINISHED_TASK_TTL_SECONDS, max_finished: int = MAX_FINISHED_TASKS):
+        self.finished_ttl = finished_ttl
+        self.max_finished = max_finished
+        self._tasks: Dict[str, dict] = {}
+        self._finished: "OrderedDict[str, float]" = OrderedDict()  # task_id -> finish time, oldest first
+        self._versions: Dict[str, int] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def replace(self, task_id: str, task_status: dict) -> None:
+        """Set the whole status of a task"""
+        with self._lock:
+            self._tasks[task_id] = dict(task_status)
+            self._track_finished(task_id)
+            self._bump(task_id)
+
+    def update(self, task_id: str, **fields) -> None:
+        """Atomically update several fields, creating the task if it does not exist"""
+        with self._lock:
+            task_status = self._tasks.get(task_id)
+            if task_status is None:
+                task_status = self._tasks[task_id] = _default_status()
+            task_status.update(fields)
+            if "status" in fields:
+                self._track_finished(task_id)
+            self._bump(task_id)
+
+    def increment(self, task_id: str, field: str, increment: int = 1) -> None:
+        """Atomically increment a numeric field of an existing task"""
+        with self._lock:
+            task_status = self._tasks.get(task_id)
+            if task_status is None:
+                return
+            value = task_status.get(field)
+            task_status[field] = value + increment if isinstance(value, (int, float)) else increment
+            self._bump(task_id)
+
+    def get(self, task_id: str) -> Optional[dict]:
+        """Snapshot of the task status, None if unknown or expired"""
+        with self._lock:
+            self._expire()
+            return self._snapshot(task_id)
+
+    def wait(self, task_id: str, since_version: int, timeout: float) -> Optional[dict]:
+        """Block until the task changes after `since_version`, finishes, or `timeout` seconds pass
+
+        :return: Snapshot of the task status including its `version`, None if unknown or expired
+        """
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                self._expire()
+                task_status = self._tasks.get(task_id)
+                if task_status is None:
+                    return None
+                remaining = deadline - time.monotonic()
+                if (self._versions[task_id] > since_version
+                        or task_status.get("status") in FINISHED_STATUSES
+                        or remaining <= 0):
+                    return self._snapshot(task_id)
+                self._changed.wait(remaining)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._tasks)
+
+    def _snapshot(self, task_id: str) -> Optional[dict]:
+        task_status = self._tasks.get(task_id)
+        if task_status is None:
+            return None
+        snapshot = dict(task_status)
+        snapshot["version"] = self._versions[task_id]
+        return snapshot
+
+    def _bump(self, task_id: str) -> None:
+        self._version += 1
+        self._versions[task_id] = self._version
+        self._changed.notify_all()
+
+    def _track_finished(self, task_id: str) -> None:
+        self._finished.pop(task_id, None)
+        if self._tasks[task_id].get("status") in FINISHED_STATUSES:
+            self._finished[task_id] = time.monotonic()
+        self._expire()
+
+    def _expire(self) -> None:
+        deadline = time.monotonic() - self.finished_ttl
+        while self._finished:
+            task_id, finished_at = next(iter(self._finished.items()))
+            if finished_at > deadline and len(self._finished) <= self.max_finished:
+                break
+            self._finished.popitem(last=False)
+            self._tasks.pop(task_id, None)
+            self._versions.pop(task_id, None)
+
+
+DRAFT_TASKS = TaskStatusStore()
 
 
 def update_tasks_cache(task_id: str, task_status: dict) -> None:
-    """Update task status LRU cache
-    
+    """Replace the status of a task
+
     :param task_id: Task ID
     :param task_status: Task status information dictionary
     """
-
-    if task_id in DRAFT_TASKS:
-        # If the key exists, delete the old item
-        DRAFT_TASKS.pop(task_id)
-    elif len(DRAFT_TASKS) >= MAX_TASKS_CACHE_SIZE:
-        # If the cache is full, delete the least recently used item (the first item)
-        DRAFT_TASKS.popitem(last=False)
-    # Add new item to the end (most recently used)
-    DRAFT_TASKS[task_id] = task_status
+    DRAFT_TASKS.replace(task_id, task_status)
 
 def update_task_field(task_id: str, field: str, value: Any) -> None:
     """Update a single field in the task status
-    
+
     :param task_id: Task ID
     :param field: Field name to update
     :param value: New value for the field
     """
-    if task_id in DRAFT_TASKS:
-        # Copy the current status, modify the specified field, then update the cache
-        task_status = DRAFT_TASKS[task_id].copy()
-        task_status[field] = value
-        # Delete the old item and add the updated item
-        DRAFT_TASKS.pop(task_id)
-        DRAFT_TASKS[task_id] = task_status
-    else:
-        # If the task doesn't exist, create a default status and set the specified field
-        task_status = {
-            "status": "initialized",
-            "message": "Task initialized",
-            "progress": 0,
-            "completed_files": 0,
-            "total_files": 0,
-            "draft_url": ""
-        }
-        task_status[field] = value
-        # If the cache is full, delete the least recently used item
-        if len(DRAFT_TASKS) >= MAX_TASKS_CACHE_SIZE:
-            DRAFT_TASKS.popitem(last=False)
-        # Add new item
-        DRAFT_TASKS[task_id] = task_status
+    DRAFT_TASKS.update(task_id, **{field: value})
 
 def update_task_fields(task_id: str, **fields) -> None:
-    """Update multiple fields in the task status
-    
+    """Atomically update multiple fields in the task status
+
     :param task_id: Task ID
     :param fields: Fields to update and their values, provided as keyword arguments
     """
-    if task_id in DRAFT_TASKS:
-        # Copy the current status, modify the specified fields, then update the cache
-        task_status = DRAFT_TASKS[task_id].copy()
-        for field, value in fields.items():
-            task_status[field] = value
-        # Delete the old item and add the updated item
-        DRAFT_TASKS.pop(task_id)
-        DRAFT_TASKS[task_id] = task_status
-    else:
-        # If the task doesn't exist, create a default status and set the specified fields
-        task_status = {
-            "status": "initialized",
-            "message": "Task initialized",
-            "progress": 0,
-            "completed_files": 0,
-            "total_files": 0,
-            "draft_url": ""
-        }
-        for field, value in fields.items():
-            task_status[field] = value
-        # If the cache is full, delete the least recently used item
-        if len(DRAFT_TASKS) >= MAX_TASKS_CACHE_SIZE:
-            DRAFT_TASKS.popitem(last=False)
-        # Add new item
-        DRAFT_TASKS[task_id] = task_status
+    DRAFT_TASKS.update(task_id, **fields)
 
 def increment_task_field(task_id: str, field: str, increment: int = 1) -> None:
     """Increment a numeric field in the task status
-    
+
     :param task_id: Task ID
     :param field: Field name to increment
     :param increment: Value to increment by, default is 1
     """
-    if task_id in DRAFT_TASKS:
-        # Copy the current status, increment the specified field, then update the cache
-        task_status = DRAFT_TASKS[task_id].copy()
-        if field in task_status and isinstance(task_status[field], (int, float)):
-            task_status[field] += increment
-        else:
-            task_status[field] = increment
-        # Delete the old item and add the updated item
-        DRAFT_TASKS.pop(task_id)
-        DRAFT_TASKS[task_id] = task_status
+    DRAFT_TASKS.increment(task_id, field, increment)
 
 def get_task_status(task_id: str) -> dict:
     """Get task status
-    
+
     :param task_id: Task ID
-    :return: Task status information dictionary
+    :return: Snapshot of the task status information dictionary
     """
-    task_status = DRAFT_TASKS.get(task_id, {
-        "status": "not_found",
-        "message": "Task does not exist",
-        "progress": 0,
-        "completed_files": 0,
-        "total_files": 0,
-        "draft_url": ""
-    })
-    
-    # If the task is found, update its position in the LRU cache
-    if task_id in DRAFT_TASKS:
-        # First delete, then add to the end, implementing LRU update
-        update_tasks_cache(task_id, task_status)
-        
+    task_status = DRAFT_TASKS.get(task_id)
+    if task_status is None:
+        return _default_status("not_found", "Task does not exist")
+    return task_status
+
+def wait_for_task_status(task_id: str, since_version: int = 0, timeout: float = 30) -> dict:
+    """Long-poll the task status
+
+    :param task_id: Task ID
+    :param since_version: Last version seen by the caller, returns as soon as the task has a newer one
+    :param timeout: Maximum number of seconds to wait for a change
+    :return: Snapshot of the task status information dictionary, including its version
+    """
+    task_status = DRAFT_TASKS.wait(task_id, since_version, timeout)
+    if task_status is None:
+        return _default_status("not_found", "Task does not exist")
     return task_status
 
 def create_task(task_id: str) -> None:
     """Create a new task and initialize its status
-    
+
     :param task_id: Task ID
     """
-    task_status = {
-        "status": "initialized",
-        "message": "Task initialized",
-        "progress": 0,
-        "completed_files": 0,
-        "total_files": 0,
-        "draft_url": ""
-    }
-    update_tasks_cache(task_id, task_status)
\ No newline at end of file
+    update_tasks_cache(task_id, _default_status())
@@ -0,0 +1,137 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Literal, Optional, Set
+
+from settings.local import SAVE_DRAFT_WORKERS, SAVE_DRAFT_QUEUE_SIZE
+
+
+class TaskQueueFull(Exception):
+    """Too many save tasks are already waiting"""
+
+class TaskAlreadyQueued(Exception):
+    """A task with the same ID is already waiting or running"""
+
+class TaskCancelled(Exception):
+    """The task was cancelled while running"""
+
+
+class SaveTaskQueue:
+    """Bounded pool running save tasks in the background
+
+    At most `max_workers` tasks run at once and at most `max_queue_size` more wait for a worker,
+    further submissions are rejected with `TaskQueueFull`. Waiting tasks are cancelled outright;
+    running tasks are cancelled cooperatively by polling `raise_if_cancelled` between steps.
+    Tasks run inline with `run` share the same IDs, so a task is never queued and run at once.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="save_draft")
+        self._futures: Dict[str, Future] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._inline: Set[str] = set()
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def submit(self, task_id: str, func: Callable, *args, on_accept: Optional[Callable[[], None]] = None) -> None:
+        """Queue `func(*args)` under `task_id`
+
+        :param on_accept: Called under the queue lock once the task is accepted and before a worker can
+                          pick it up, e.g. to register its status. Not called when the task is rejected
+        :raises TaskAlreadyQueued: A task with this ID has not finished yet
+        :raises TaskQueueFull: The queue depth limit is reached
+        """
+        with self._lock:
+            self._check_not_active(task_id)
+            waiting = len(self._futures) - self._running
+            if waiting >= self.max_queue_size:
+                raise TaskQueueFull(f"Save queue is full ({waiting} tasks waiting), please retry later")
+            if on_accept is not None:
+                on_accept()
+            self._cancel_events[task_id] = threading.Event()
+            future = self._executor.submit(self._run, task_id, func, *args)
+            self._futures[task_id] = future
+        # Tasks that run forget themselves in `_run`, this only covers tasks cancelled before they started
+        future.add_done_callback(lambda done: self._forget_cancelled(task_id, done))
+
+    def run(self, task_id: str, func: Callable, *args, on_accept: Optional[Callable[[], None]] = None):
+        """Run `func(*args)` in the calling thread under `task_id`, bypassing the depth limit
+
+        While it runs, a task with the same ID cannot be queued or run, and it cannot be started while one is.
+
+        :param on_accept: Called under the queue lock once the task is accepted, see `submit`
+        :raises TaskAlreadyQueued: A task with this ID has not finished yet
+        """
+        with self._lock:
+            self._check_not_active(task_id)
+            if on_accept is not None:
+                on_accept()
+            self._inline.add(task_id)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._inline.discard(task_id)
+
+    def cancel(self, task_id: str) -> Literal["cancelled", "cancelling", "not_found"]:
+        """Cancel a waiting or running task
+
+        :return: "cancelled" if the task had not started and will never run, "cancelling" if it is
+                 running and will stop at its next checkpoint, "not_found" if it is not queued
+        """
+        with self._lock:
+            future = self._futures.get(task_id)
+            if future is None:
+                return "not_found"
+            self._cancel_events[task_id].set()
+        return "cancelled" if future.cancel() else "cancelling"
+
+    def is_cancelled(self, task_id: str) -> bool:
+        with self._lock:
+            event = self._cancel_events.get(task_id)
+        return event is not None and event.is_set()
+
+    def raise_if_cancelled(self, task_id: str) -> None:
+        """Checkpoint for running tasks, raises `TaskCancelled` once the task is cancelled"""
+        if self.is_cancelled(task_id):
+            raise TaskCancelled(f"Task {task_id} was cancelled")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "running": self._running,
+                "waiting": len(self._futures) - self._running,
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+            }
+
+    def _check_not_active(self, task_id: str) -> None:
+        if task_id in self._futures or task_id in self._inline:
+            raise TaskAlreadyQueued(f"Task {task_id} is already queued or running")
+
+    def _run(self, task_id: str, func: Callable, *args):
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            # Forgotten before the future resolves: the task publishes its final status from `func`,
+            # and a client that resubmits right after seeing it must not be rejected
+            with self._lock:
+                self._running -= 1
+                self._forget(task_id)
+
+    def _forget_cancelled(self, task_id: str, future: Future) -> None:
+        if not future.cancelled():
+            return
+        with self._lock:
+            if self._futures.get(task_id) is future:
+                self._forget(task_id)
+
+    def _forget(self, task_id: str) -> None:
+        self._futures.pop(task_id, None)
+        self._cancel_events.pop(task_id, None)
+
+
+SAVE_TASK_QUEUE = SaveTaskQueue(SAVE_DRAFT_WORKERS, SAVE_DRAFT_QUEUE_SIZE)
@@ -30,6 +30,41 @@ PORT = 9000
 OSS_CONFIG = []
 MP4_OSS_CONFIG=[]
 
+# 草稿存储配置。backend 为 memory 时草稿仅保存在进程内存中，为 sqlite 时写入 path 指定的数据库，重启后可恢复
+# max_memory_mb 为内存中草稿的估算内存上限，超出时按 LRU 淘汰；memory 后端淘汰的草稿暂存到 spill_path（每个进程一个文件，文件名中加入进程号，已退出进程留下的文件在启动时清理）
+DRAFT_STORE_CONFIG = {
+    "backend": "memory",
+    "path": os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp", "drafts.db"),
+    "max_memory_mb": 1024,
+    "spill_path": os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp", "draft_spill.db"),
+}
+
+# 素材下载配置。chunk_size_kb 为每次读取写入的块大小，pool_size 为所有下载线程共享的连接池中每个主机保留的连接数，
+# progress_interval_seconds 为打印下载进度的最小间隔
+DOWNLOAD_CONFIG = {
+    "chunk_size_kb": 1024,
+    "pool_size": 16,
+    "progress_interval_seconds": 2.0,
+}
+
+# 素材元数据探测配置。workers 为并发探测数，探测结果按 URL（及 ETag/Last-Modified）缓存在 cache_path 中
+MEDIA_PROBE_CONFIG = {
+    "workers": 8,
+    "cache_path": os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp", "media_metadata.db"),
+    "head_timeout_seconds": 5,
+}
+
+# 素材缓存配置。下载过的素材按内容保存在 path 目录中供所有草稿共用，总大小超过 max_size_mb 时按 LRU 淘汰
+ASSET_CACHE_CONFIG = {
+    "enabled": True,
+    "path": os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp", "asset_cache"),
+    "max_size_mb": 10240,
+}
+
+# 异步保存草稿的并发数，以及最多允许排队等待的任务数
+SAVE_DRAFT_WORKERS = 4
+SAVE_DRAFT_QUEUE_SIZE = 100
+
 # 尝试加载本地配置文件
 if os.path.exists(CONFIG_FILE_PATH):
     try:
@@ -80,6 +115,28 @@ if os.path.exists(CONFIG_FILE_PATH):
             if "mp4_oss_config" in local_config:
                 MP4_OSS_CONFIG = local_config["mp4_oss_config"]
 
+            # 更新异步保存草稿配置
+            if "save_draft_workers" in local_config:
+                SAVE_DRAFT_WORKERS = local_config["save_draft_workers"]
+            if "save_draft_queue_size" in local_config:
+                SAVE_DRAFT_QUEUE_SIZE = local_config["save_draft_queue_size"]
+
+            # 更新素材下载配置
+            if "download" in local_config:
+                DOWNLOAD_CONFIG.update(local_config["download"])
+
+            # 更新素材元数据探测配置
+            if "media_probe" in local_config:
+                MEDIA_PROBE_CONFIG.update(local_config["media_probe"])
+
+            # 更新素材缓存配置
+            if "asset_cache" in local_config:
+                ASSET_CACHE_CONFIG.update(local_config["asset_cache"])
+
+            # 更新草稿存储配置
+            if "draft_store" in local_config:
+                DRAFT_STORE_CONFIG.update(local_config["draft_store"])
+
     except Exception as e:
         # 配置文件加载失败，使用默认配置
         pass
@@ -0,0 +1,68 @@
+import os
+
+
+def _fake_download(contents, calls):
+    def download(url, local_filename):
+        calls.append(url)
+        with open(local_filename, "wb") as file:
+            file.write(contents[url])
+        return True
+    return download
+
+
+def test_repeated_assets_are_downloaded_once(tmp_path):
+    from asset_cache import AssetCache
+
+    cache = AssetCache(str(tmp_path / "cache"), max_bytes=1024 * 1024)
+    contents = {"https://example.com/bgm.mp3": b"music" * 100}
+    calls = []
+    download = _fake_download(contents, calls)
+
+    for draft_id in ("draft-a", "draft-b", "draft-c"):
+        target = tmp_path / draft_id / "assets" / "audio" / "bgm.mp3"
+        assert cache.fetch("https://example.com/bgm.mp3", str(target), download)
+        assert target.read_bytes() == contents["https://example.com/bgm.mp3"]
+
+    assert calls == ["https://example.com/bgm.mp3"]
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["bytes_saved"] == 2 * 500
+    assert stats["entries"] == 1
+
+
+def test_identical_content_is_stored_once_and_evicted_by_size(tmp_path):
+    from asset_cache import AssetCache
+
+    cache = AssetCache(str(tmp_path / "cache"), max_bytes=250)
+    contents = {
+        "https://example.com/a.png": b"a" * 100,
+        "https://mirror.example.com/a.png": b"a" * 100,
+        "https://example.com/b.png": b"b" * 100,
+        "https://example.com/c.png": b"c" * 100,
+    }
+    calls = []
+    download = _fake_download(contents, calls)
+
+    for index, url in enumerate(contents):
+        assert cache.fetch(url, str(tmp_path / "draft" / str(index)), download)
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["size_bytes"] == 200
+    assert stats["evictions"] == 1
+    # The least recently used blob (shared by both "a" URLs) was evicted
+    assert cache.lookup("https://example.com/a.png") is None
+    assert cache.lookup("https://mirror.example.com/a.png") is None
+    assert cache.lookup("https://example.com/c.png") is not None
+    # Draft copies survive eviction of the blob they were linked from
+    assert os.path.exists(tmp_path / "draft" / "0")
+
+
+def test_failed_download_is_not_cached(tmp_path):
+    from asset_cache import AssetCache
+
+    cache = AssetCache(str(tmp_path / "cache"), max_bytes=1024)
+    assert not cache.fetch("https://example.com/missing.mp4", str(tmp_path / "out.mp4"), lambda url, path: False)
+    assert cache.lookup("https://example.com/missing.mp4") is None
+    assert not [name for name in os.listdir(tmp_path / "cache") if name.startswith("incoming-")]
@@ -0,0 +1,41 @@
+import pytest
+
+
+def test_resolver_follows_catalog_order_per_environment():
+    import pyJianYingDraft as draft
+    from pyJianYingDraft.metadata import get_catalog_resolver
+
+    capcut, jianying = get_catalog_resolver(True), get_catalog_resolver(False)
+    song = next(iter(draft.CapCut_Speech_to_song_effect_type))
+    tone = next(iter(draft.Tone_effect_type))
+
+    assert capcut.resolve("audio_effect", song.name) is song
+    assert jianying.resolve("audio_effect", tone.name) is tone
+    assert capcut.resolve("mask", "Circle") is draft.CapCut_Mask_type.Circle
+    assert jianying.resolve("intro", "渐显") is draft.Intro_type.渐显
+
+
+def test_resolver_matches_getattr_probing():
+    import pyJianYingDraft as draft
+    from pyJianYingDraft.metadata import get_catalog_resolver
+
+    resolver = get_catalog_resolver(False)
+    for catalog in (draft.Audio_scene_effect_type, draft.Tone_effect_type, draft.Speech_to_song_type):
+        for effect in catalog:
+            expected = next(getattr(candidate, effect.name)
+                            for candidate in (draft.Audio_scene_effect_type, draft.Tone_effect_type, draft.Speech_to_song_type)
+                            if effect.name in candidate.__members__)
+            assert resolver.resolve("audio_effect", effect.name) is expected
+
+
+def test_unknown_names_and_categories():
+    from pyJianYingDraft.metadata import get_catalog_resolver
+
+    resolver = get_catalog_resolver(True)
+
+    assert resolver.resolve("font", "not a font") is None
+    assert resolver.resolve("font", "name") is None
+    assert "思源中宋" in resolver.names("font")
+    assert resolver.suggest("font", "思源中")[0] == "思源中宋"
+    with pytest.raises(KeyError):
+        resolver.resolve("sticker", "anything")
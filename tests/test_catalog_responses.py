@@ -0,0 +1,73 @@
+import gzip
+import json
+
+import pytest
+
+
+@pytest.fixture
+def client():
+    import capcut_server
+
+    return capcut_server.app.test_client()
+
+
+def test_types_response_matches_catalog_members(client):
+    import pyJianYingDraft as draft
+    from settings.local import IS_CAPCUT_ENV
+
+    response = client.get("/get_mask_types")
+    mask_type = draft.CapCut_Mask_type if IS_CAPCUT_ENV else draft.Mask_type
+
+    assert response.status_code == 200
+    assert response.json == {"success": True, "error": "",
+                             "output": [{"name": name} for name in mask_type.__members__]}
+    assert response.headers["Cache-Control"] == "public, max-age=3600"
+    assert response.headers["ETag"].startswith('"')
+
+
+def test_audio_effect_params_are_scaled(client):
+    output = client.get("/get_audio_effect_types").json["output"]
+
+    with_params = next(effect for effect in output if effect["params"])
+    assert {"name", "type", "params"} == set(with_params)
+    assert with_params["params"][0]["max_value"] in (100, 100.0)
+
+
+def test_conditional_request_returns_304(client):
+    first = client.get("/get_font_types")
+    etag = first.headers["ETag"]
+
+    repeated = client.get("/get_font_types", headers={"If-None-Match": etag})
+    assert repeated.status_code == 304
+    assert repeated.data == b""
+    assert repeated.headers["ETag"] == etag
+
+    assert client.get("/get_font_types", headers={"If-None-Match": '"stale"'}).status_code == 200
+    assert client.get("/get_transition_types").headers["ETag"] != etag
+
+
+def test_catalog_bundles_every_types_endpoint(client):
+    compressed = client.get("/catalog", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/catalog")
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+    assert "Content-Encoding" not in plain.headers
+    catalog = json.loads(gzip.decompress(compressed.data))
+    assert catalog == plain.json
+    assert catalog["output"]["text_intro"] == client.get("/get_text_intro_types").json["output"]
+    assert len(catalog["output"]) == 12
+
+    cached = client.get("/catalog", headers={"Accept-Encoding": "gzip",
+                                             "If-None-Match": compressed.headers["ETag"]})
+    assert cached.status_code == 304
+
+
+def test_responses_are_encoded_once_per_environment():
+    from catalog_responses import get_catalog_responses
+
+    assert get_catalog_responses(True) is get_catalog_responses(True)
+    capcut, jianying = get_catalog_responses(True), get_catalog_responses(False)
+    assert capcut.types["intro_animation"].etag != jianying.types["intro_animation"].etag
+    assert capcut.types["font"].body == jianying.types["font"].body
@@ -0,0 +1,89 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def search():
+    from pyJianYingDraft.metadata import get_catalog_search
+
+    return get_catalog_search(False)
+
+
+def names(page):
+    return [hit.member.name for hit in page.hits]
+
+
+def test_prefix_and_substring_match_a_linear_scan(search):
+    import pyJianYingDraft as draft
+
+    scene_names = [effect.name for effect in draft.Video_scene_effect_type]
+
+    assert names(search.search("爱心", "prefix", category="scene_effect", limit=500)) == \
+        [name for name in scene_names if name.startswith("爱心")]
+    assert names(search.search("光", category="scene_effect", limit=500)) == \
+        [name for name in scene_names if "光" in name]
+    assert names(search.search("Kira", category="scene_effect", limit=500)) == \
+        [name for name in scene_names if "kira" in name.lower()]
+
+
+def test_fuzzy_ranks_by_similarity(search):
+    page = search.search("爱心光坡", "fuzzy")
+
+    assert page.hits[0].score < 1
+    assert [hit.score for hit in page.hits] == sorted((hit.score for hit in page.hits), reverse=True)
+    assert "爱心光波" in names(page)[:3]
+    assert search.search("爱心光波", "fuzzy").hits[0].score == 1
+
+
+def test_filters_by_category_vip_and_params(search):
+    page = search.search("", category="font", is_vip=False, limit=500)
+    assert page.total == len(page.hits)
+    assert all(hit.category == "font" and not hit.member.value.is_vip for hit in page.hits)
+
+    param = "effects_adjust_blur"
+    assert param in search.param_names()
+    page = search.search("", is_vip=True, params=[param], limit=500)
+    assert page.hits
+    assert all(hit.member.value.is_vip and param in [p.name for p in hit.member.value.params] for hit in page.hits)
+    assert search.search("", params=[param, "no such param"]).total == 0
+
+
+@pytest.mark.parametrize("mode", ["substring", "fuzzy"])
+def test_cursor_pages_cover_every_result_once(search, mode):
+    full = search.search("爱心", mode, limit=1000)
+    collected, cursor = [], None
+    while True:
+        page = search.search("爱心", mode, cursor=cursor, limit=7)
+        assert page.total == full.total
+        collected.extend(page.hits)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert collected == full.hits
+
+
+def test_invalid_arguments(search):
+    with pytest.raises(ValueError):
+        search.search("a", "regex")
+    with pytest.raises(ValueError):
+        search.search("a", category="mask")
+    with pytest.raises(ValueError):
+        search.search("a", cursor="not a cursor")
+
+
+def test_search_endpoint():
+    import capcut_server
+
+    client = capcut_server.app.test_client()
+    first = client.get("/search_effects", query_string={"limit": 2}).json
+    assert first["success"]
+    assert len(first["output"]["items"]) == 2
+    assert {"name", "category", "type", "is_vip", "score", "params"} == set(first["output"]["items"][0])
+
+    second = client.get("/search_effects",
+                        query_string={"limit": 2, "cursor": first["output"]["next_cursor"]}).json
+    assert second["output"]["total"] == first["output"]["total"]
+    assert second["output"]["items"][0]["name"] not in [item["name"] for item in first["output"]["items"]]
+
+    assert not client.get("/search_effects", query_string={"is_vip": "maybe"}).json["success"]
+    assert not client.get("/search_effects", query_string={"mode": "regex"}).json["success"]
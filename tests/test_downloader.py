@@ -0,0 +1,198 @@
+import threading
+import time
+
+import pytest
+
+
+def wait_for_followers(downloader, url, count, release, timeout=5):
+    """Wait until `count` callers joined the flight of `url`, failing the test once `timeout` passes"""
+    deadline = time.monotonic() + timeout
+    while len(getattr(downloader._FLIGHTS.get(url), "followers", [])) < count:
+        if time.monotonic() > deadline:
+            release.set()  # let the blocked threads finish before failing
+            pytest.fail(f"{count} callers did not join the download of {url} within {timeout}s")
+        time.sleep(0.001)
+
+
+def test_concurrent_downloads_of_one_url_hit_the_network_once(tmp_path, monkeypatch):
+    import downloader
+
+    release = threading.Event()
+    fetched = []
+
+    def fake_download(url, local_filename, max_retries, timeout):
+        fetched.append(url)
+        release.wait(5)
+        with open(local_filename, "wb") as file:
+            file.write(b"x" * 4096)
+        return True
+
+    monkeypatch.setattr(downloader, "_download_remote_file", fake_download)
+    before = downloader.get_download_stats()
+
+    results = {}
+
+    def save(index):
+        target = tmp_path / f"draft-{index}" / "video.mp4"
+        target.parent.mkdir()
+        results[index] = downloader.download_file("https://example.com/video.mp4", str(target))
+
+    threads = [threading.Thread(target=save, args=(index,)) for index in range(6)]
+    for thread in threads:
+        thread.start()
+    # Let every caller join the flight before the first download finishes
+    wait_for_followers(downloader, "https://example.com/video.mp4", 5, release)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert fetched == ["https://example.com/video.mp4"]
+    assert all(results.values()) and len(results) == 6
+    for index in range(6):
+        assert (tmp_path / f"draft-{index}" / "video.mp4").read_bytes() == b"x" * 4096
+    after = downloader.get_download_stats()
+    assert after["deduplicated"] - before["deduplicated"] == 5
+    assert after["deduplicated_bytes"] - before["deduplicated_bytes"] == 5 * 4096
+    assert after["in_flight"] == 0
+
+
+def test_failed_download_fails_all_waiters(tmp_path, monkeypatch):
+    import downloader
+
+    release = threading.Event()
+    monkeypatch.setattr(downloader, "_download_remote_file", lambda *args: release.wait(5) and False)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda i=i: results.append(
+            downloader.download_file("https://example.com/broken.mp4", str(tmp_path / f"{i}.mp4"))))
+        for i in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    wait_for_followers(downloader, "https://example.com/broken.mp4", 2, release)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [False, False, False]
+
+
+def test_interrupted_download_resumes_with_range(tmp_path, monkeypatch):
+    import http.server
+    import downloader
+
+    payload = bytes(range(256)) * 400
+    requests_seen = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            range_header = self.headers.get("Range")
+            requests_seen.append(range_header)
+            if range_header and self.headers.get("If-Range") == '"v1"':
+                start = int(range_header[len("bytes="):-1])
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+                self.send_header("Content-Length", str(len(payload) - start))
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                self.wfile.write(payload[start:])
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            # Drop the connection halfway through the first transfer
+            self.wfile.write(payload[:len(payload) // 2])
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(downloader.time, "sleep", lambda seconds: None)
+    monkeypatch.setitem(downloader.DOWNLOAD_CONFIG, "chunk_size_kb", 4)
+    try:
+        target = tmp_path / "video.mp4"
+        assert downloader.download_file(f"http://127.0.0.1:{server.server_port}/video.mp4", str(target))
+    finally:
+        server.shutdown()
+
+    assert target.read_bytes() == payload
+    # The retry only fetched what was missing
+    assert len(requests_seen) == 2 and requests_seen[0] is None
+    resumed_at = int(requests_seen[1][len("bytes="):-1])
+    assert 0 < resumed_at <= len(payload) // 2
+    assert not (tmp_path / "video.mp4.part").exists()
+
+
+def test_resume_never_mixes_compressed_offsets(tmp_path, monkeypatch):
+    import gzip
+    import http.server
+    import downloader
+
+    payload = bytes(range(256)) * 400
+    requests_seen = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append((self.path, self.headers.get("Accept-Encoding"), self.headers.get("Range")))
+            range_header = self.headers.get("Range")
+            # /compressed.mp4 is gzipped whatever the client asks for, /video.mp4 only if the client accepts gzip
+            if self.path == "/compressed.mp4" or "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                body, encoding = gzip.compress(payload), "gzip"
+            else:
+                body, encoding = payload, None
+            start = int(range_header[len("bytes="):-1]) if range_header else 0
+            self.send_response(206 if start else 200)
+            if start:
+                self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(len(body) - start))
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            if len(requests_seen) % 2:
+                # Drop the connection halfway through the first transfer of each file
+                self.wfile.write(body[start:start + (len(body) - start) // 2])
+                self.close_connection = True
+            else:
+                self.wfile.write(body[start:])
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(downloader.time, "sleep", lambda seconds: None)
+    monkeypatch.setitem(downloader.DOWNLOAD_CONFIG, "chunk_size_kb", 4)
+    try:
+        for name in ("video.mp4", "compressed.mp4"):
+            assert downloader.download_file(f"http://127.0.0.1:{server.server_port}/{name}", str(tmp_path / name))
+    finally:
+        server.shutdown()
+
+    assert (tmp_path / "video.mp4").read_bytes() == payload
+    assert (tmp_path / "compressed.mp4").read_bytes() == payload
+    assert all(encoding == "identity" for _, encoding, _ in requests_seen)
+    # The plain transfer resumes, the one compressed anyway starts over
+    assert requests_seen[1][2] is not None
+    assert requests_seen[3] == ("/compressed.mp4", "identity", None)
+
+def test_download_threads_share_one_connection_pool():
+    import downloader
+    from settings.local import DOWNLOAD_CONFIG
+
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(downloader.get_session())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(session is downloader.get_session() for session in sessions)
+    adapter = downloader.get_session().get_adapter("https://example.com")
+    assert adapter._pool_maxsize == DOWNLOAD_CONFIG["pool_size"]
@@ -0,0 +1,122 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+THREADS = 8
+CALLS_PER_THREAD = 25
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    # Switch threads far more often than the default 5ms to provoke interleaved edits
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _add_texts(draft_id, offset, count):
+    from add_text_impl import add_text_impl
+
+    for i in range(count):
+        start = offset + i
+        add_text_impl(f"text {start}", start, start + 1, draft_id=draft_id, track_name="text_main")
+
+
+def test_concurrent_edits_on_one_draft_are_serialized():
+    from create_draft import create_draft
+    from draft_cache import DRAFT_CACHE
+
+    _, draft_id = create_draft()
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        futures = [
+            executor.submit(_add_texts, draft_id, worker * CALLS_PER_THREAD, CALLS_PER_THREAD)
+            for worker in range(THREADS)
+        ]
+        for future in futures:
+            future.result()
+
+    script = DRAFT_CACHE[draft_id]
+    segments = script.tracks["text_main"].segments
+    assert len(segments) == THREADS * CALLS_PER_THREAD
+    assert len(script.materials.texts) == THREADS * CALLS_PER_THREAD
+    starts = sorted(seg.target_timerange.start for seg in segments)
+    assert starts == [i * 1_000_000 for i in range(THREADS * CALLS_PER_THREAD)]
+
+
+def test_concurrent_edits_on_many_drafts():
+    from create_draft import create_draft
+    from draft_cache import DRAFT_CACHE
+
+    draft_ids = [create_draft()[1] for _ in range(THREADS)]
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        futures = [executor.submit(_add_texts, draft_id, 0, CALLS_PER_THREAD) for draft_id in draft_ids]
+        for future in futures:
+            future.result()
+
+    for draft_id in draft_ids:
+        assert len(DRAFT_CACHE[draft_id].tracks["text_main"].segments) == CALLS_PER_THREAD
+
+
+def test_overlapping_edit_is_rejected_under_concurrency():
+    from add_text_impl import add_text_impl
+    from create_draft import create_draft
+    from draft_cache import DRAFT_CACHE
+
+    _, draft_id = create_draft()
+
+    def add_same_slot(_):
+        try:
+            add_text_impl("same slot", 0, 1, draft_id=draft_id, track_name="text_main")
+            return True
+        except Exception:
+            return False
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = list(executor.map(add_same_slot, range(THREADS)))
+
+    # The overlap check and the append happen under one lock, so exactly one call wins the slot
+    assert results.count(True) == 1
+    assert len(DRAFT_CACHE[draft_id].tracks["text_main"].segments) == 1
+
+
+def test_media_probes_do_not_hold_the_draft_lock(monkeypatch):
+    import threading
+
+    import pyJianYingDraft as draft
+    import save_draft_impl
+    from add_text_impl import add_text_impl
+    from create_draft import create_draft
+    from draft_cache import DRAFT_CACHE
+
+    script, draft_id = create_draft()
+    script.add_material(draft.Video_material(material_type="video", replace_path="/tmp/clip.mp4",
+                                             remote_url="https://example.com/clip.mp4", material_name="clip.mp4",
+                                             duration=10_000_000, width=1080, height=1920))
+    DRAFT_CACHE[draft_id] = script
+    probing, release = threading.Event(), threading.Event()
+
+    def slow_probe_media(items):
+        items = list(items)
+        if items:
+            probing.set()
+            release.wait(5)
+        return {item: {"width": 640, "height": 360, "duration": 4.0} for item in items}
+
+    monkeypatch.setattr(save_draft_impl, "probe_media", slow_probe_media)
+    query = threading.Thread(target=save_draft_impl.query_script_impl, args=(draft_id,))
+    query.start()
+    assert probing.wait(5)
+
+    edit = threading.Thread(target=add_text_impl, args=("during probe", 0, 1),
+                            kwargs={"draft_id": draft_id, "track_name": "text_main"})
+    edit.start()
+    edit.join(5)
+    finished_during_probe = not edit.is_alive()
+    release.set()
+    query.join(5)
+
+    assert finished_during_probe
+    assert DRAFT_CACHE[draft_id].materials.videos[0].width == 640
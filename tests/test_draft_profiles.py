@@ -65,6 +65,27 @@ def test_write_profile_content_updates_main_mirrors_and_timeline(tmp_path):
     assert layout["dockItems"][0]["timelineIds"] == ["timeline-fixed"]
 
 
+def test_write_profile_content_takes_encoded_bytes_and_known_timeline_id(tmp_path, monkeypatch):
+    import draft_profiles
+    from draft_profiles import get_draft_profile, write_profile_content
+
+    draft_dir = tmp_path / "draft"
+    (draft_dir / "Timelines" / "timeline-1").mkdir(parents=True)
+    data = json.dumps({"id": "timeline-fixed", "tracks": [], "name": "草稿"}, ensure_ascii=False).encode("utf-8")
+
+    def fail_loads(*args, **kwargs):
+        raise AssertionError("content should not be parsed when the timeline id is given")
+
+    monkeypatch.setattr(draft_profiles.json, "loads", fail_loads)
+    written = write_profile_content(get_draft_profile("jianying_pro_10"), draft_dir, data, "timeline-fixed")
+    monkeypatch.undo()
+
+    content_files = [path for path in written if path.name != "project.json" and path.name != "project.json.bak"]
+    assert draft_dir / "Timelines" / "timeline-fixed" / "template.tmp" in content_files
+    assert all(path.read_bytes() == data for path in content_files)
+    assert len({path.stat().st_ino for path in content_files}) == len(content_files)
+
+
 def test_script_dumps_uses_requested_profile_platform_and_mask_key():
     import pyJianYingDraft as draft
     from draft_profiles import get_draft_profile
@@ -125,7 +146,7 @@ def test_save_draft_writes_to_requested_draft_folder(tmp_path, monkeypatch):
     create_task(draft_id)
 
     monkeypatch.setattr(save_draft_impl, "get_draft_profile", lambda: get_draft_profile("jianying_pro_10"))
-    monkeypatch.setattr(save_draft_impl, "update_media_metadata", lambda script, task_id=None: None)
+    monkeypatch.setattr(save_draft_impl, "update_media_metadata", lambda script, task_id=None, probes=None: None)
     monkeypatch.setattr(save_draft_impl, "IS_UPLOAD_DRAFT", False)
 
     save_draft_impl.save_draft_background(draft_id, str(tmp_path), draft_id)
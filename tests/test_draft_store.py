@@ -0,0 +1,252 @@
+import json
+
+
+def test_sqlite_store_reloads_drafts_after_restart(tmp_path):
+    import pyJianYingDraft as draft
+    from draft_store import build_draft_store
+
+    db_path = str(tmp_path / "drafts.db")
+    script = draft.Script_file(1080, 1920)
+    script.add_track(draft.Track_type.text)
+    script.add_segment(draft.Text_segment("hello", draft.trange("0s", "1s")))
+
+    store = build_draft_store("sqlite", db_path)
+    store.put("draft-1", script)
+
+    # A fresh store over the same database plays the role of a restarted process
+    restarted = build_draft_store("sqlite", db_path)
+    assert "draft-1" in restarted
+    reloaded = restarted["draft-1"]
+    assert json.loads(reloaded.dumps())["tracks"] == json.loads(script.dumps())["tracks"]
+    assert restarted.get("missing") is None
+
+
+def test_memory_store_evicts_least_recently_used():
+    import pyJianYingDraft as draft
+    from draft_store import MemoryDraftStore, estimate_draft_size
+
+    scripts = {key: draft.Script_file(1080, 1920) for key in "abc"}
+    store = MemoryDraftStore(max_bytes=2 * estimate_draft_size(scripts["a"]))
+    store.put("a", scripts["a"])
+    store.put("b", scripts["b"])
+    store.get("a")
+    store.put("c", scripts["c"])
+
+    assert "a" in store
+    assert "b" not in store
+    assert "c" in store
+
+
+def test_memory_store_spills_evicted_drafts_by_size_budget(tmp_path):
+    import pyJianYingDraft as draft
+    from draft_store import MemoryDraftStore, SqliteDraftStore, estimate_draft_size
+
+    small = draft.Script_file(1080, 1920)
+    large = draft.Script_file(1080, 1920)
+    large.add_track(draft.Track_type.text)
+    for i in range(50):
+        large.add_segment(draft.Text_segment(f"line {i}", draft.trange(f"{i}s", "1s")))
+    assert estimate_draft_size(large) > estimate_draft_size(small)
+
+    budget = estimate_draft_size(large) + estimate_draft_size(small)
+    store = MemoryDraftStore(budget, backing_store=SqliteDraftStore(str(tmp_path / "spill.db")))
+    store.put("large", large)
+    store.put("small-1", small)
+    store.put("small-2", draft.Script_file(1080, 1920))
+
+    stats = store.stats()
+    assert stats["evictions"] == 1
+    assert stats["spills"] == 1
+    assert stats["estimated_bytes"] <= budget
+    # The evicted draft is reloaded from disk instead of being lost
+    assert len(store["large"].tracks["text"].segments) == 50
+    assert store.stats()["reloads"] == 1
+
+
+def test_shared_store_rejects_stale_writes_from_another_worker(tmp_path):
+    import pytest
+    import pyJianYingDraft as draft
+    from draft_store import DraftVersionConflict, build_draft_store
+
+    db_path = str(tmp_path / "drafts.db")
+    worker_a = build_draft_store("sqlite", db_path)
+    worker_b = build_draft_store("sqlite", db_path)
+    worker_a.put("draft-1", draft.Script_file(1080, 1920))
+
+    script_a = worker_a.get("draft-1")
+    script_b = worker_b.get("draft-1")
+    script_a.add_track(draft.Track_type.text)
+    worker_a.put("draft-1", script_a)
+
+    script_b.add_track(draft.Track_type.audio)
+    with pytest.raises(DraftVersionConflict):
+        worker_b.put("draft-1", script_b)
+
+    # Worker B now sees worker A's edit instead of its stale copy
+    assert "text" in worker_b.get("draft-1").tracks
+    assert worker_b.stats()["conflicts"] == 1
+
+
+def test_locked_edit_is_replayed_after_conflicting_write(tmp_path):
+    import pyJianYingDraft as draft
+    from draft_cache import with_draft_lock
+    from draft_store import build_draft_store
+
+    db_path = str(tmp_path / "drafts.db")
+    worker_a = build_draft_store("sqlite", db_path)
+    worker_b = build_draft_store("sqlite", db_path)
+    worker_a.put("draft-1", draft.Script_file(1080, 1920))
+    attempts = []
+
+    @with_draft_lock
+    def add_text_track(draft_id):
+        script = worker_a.get(draft_id)
+        if not attempts:
+            # Another worker saves the same draft between our read and our write
+            other = worker_b.get(draft_id)
+            other.add_track(draft.Track_type.audio)
+            worker_b.put(draft_id, other)
+        attempts.append(draft_id)
+        script.add_track(draft.Track_type.text)
+        worker_a.put(draft_id, script)
+
+    add_text_track(draft_id="draft-1")
+
+    assert len(attempts) == 2
+    tracks = build_draft_store("sqlite", db_path).get("draft-1").tracks
+    assert {"audio", "text"} <= set(tracks)
+
+
+def test_spill_file_is_per_process(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    import pyJianYingDraft as draft
+    from draft_store import SqliteDraftStore, build_draft_store
+
+    spill_path = str(tmp_path / "draft_spill.db")
+    # Drafts another live worker has spilled to its own file
+    other_worker = SqliteDraftStore(str(tmp_path / f"draft_spill.{os.getppid()}.db"))
+    other_worker.put("theirs", draft.Script_file(1080, 1920))
+    # File left behind by a worker that exited
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    SqliteDraftStore(str(tmp_path / f"draft_spill.{exited.pid}.db")).put("stale", draft.Script_file(1080, 1920))
+
+    store = build_draft_store("memory", max_memory_mb=0, spill_path=spill_path)
+    store.put("ours", draft.Script_file(1080, 1920))
+    store.put("evicts-ours", draft.Script_file(1080, 1920))
+
+    assert store.backing_store.database_path() == str(tmp_path / f"draft_spill.{os.getpid()}.db")
+    assert "ours" in store.backing_store.keys()
+    assert other_worker.keys() == ["theirs"]
+    if os.name != "nt":
+        assert not any(name.startswith(f"draft_spill.{exited.pid}.") for name in os.listdir(tmp_path))
+
+
+def test_draft_in_use_is_not_evicted(tmp_path):
+    import threading
+
+    import pyJianYingDraft as draft
+    from draft_cache import draft_lock
+    from draft_store import MemoryDraftStore, SqliteDraftStore, estimate_draft_size
+
+    size = estimate_draft_size(draft.Script_file(1080, 1920))
+    store = MemoryDraftStore(2 * size, backing_store=SqliteDraftStore(str(tmp_path / "spill.db")), draft_lock=draft_lock)
+    store.put("edited", draft.Script_file(1080, 1920))
+    store.put("idle", draft.Script_file(1080, 1920))
+    locked, release = threading.Event(), threading.Event()
+
+    def edit():
+        with draft_lock("edited"):
+            locked.set()
+            release.wait(5)
+
+    editor = threading.Thread(target=edit)
+    editor.start()
+    assert locked.wait(5)
+    store.put("new", draft.Script_file(1080, 1920))
+    release.set()
+    editor.join(5)
+
+    # The least recently used draft is being edited, so the next one is spilled instead
+    assert list(store._entries) == ["edited", "new"]
+    assert store.backing_store.keys() == ["idle"]
+
+    # Loading a spilled draft back removes it from disk
+    store.get("idle")
+    assert store.backing_store.keys() == ["edited"]
+    assert store.stats()["spills"] == 2
+
+
+def test_spill_runs_outside_the_store_lock(tmp_path):
+    import threading
+
+    import pyJianYingDraft as draft
+    from draft_store import MemoryDraftStore, SqliteDraftStore, estimate_draft_size
+
+    class SlowSpillStore(SqliteDraftStore):
+        def put(self, key, script, expected_version=None):
+            if key == "first":
+                spilling.set()
+                release.wait(5)
+            return super().put(key, script, expected_version)
+
+    spilling, release = threading.Event(), threading.Event()
+    size = estimate_draft_size(draft.Script_file(1080, 1920))
+    store = MemoryDraftStore(size, backing_store=SlowSpillStore(str(tmp_path / "spill.db")))
+    first = draft.Script_file(1080, 1920)
+    store.put("first", first)
+    writer = threading.Thread(target=store.put, args=("second", draft.Script_file(1080, 1920)))
+    writer.start()
+    assert spilling.wait(5)
+
+    # Other drafts stay readable during the spill, and the draft being spilled is served from memory
+    reader_results = []
+    reader = threading.Thread(target=lambda: reader_results.extend([store.get("second"), store.get("first")]))
+    reader.start()
+    reader.join(5)
+    finished_during_spill = not reader.is_alive()
+    release.set()
+    writer.join(5)
+    reader.join(5)
+
+    assert finished_during_spill
+    assert reader_results[1] is first
+    # It was loaded back before the spill finished, so the copy on disk was dropped
+    assert store.backing_store.keys() == ["second"]
+
+
+def test_save_replays_metadata_update_after_conflicting_write(tmp_path, monkeypatch):
+    import pyJianYingDraft as draft
+    import draft_cache
+    import save_draft_impl
+    from draft_store import build_draft_store
+    from save_task_cache import create_task, get_task_status
+
+    db_path = str(tmp_path / "drafts.db")
+    worker_a = build_draft_store("sqlite", db_path)
+    worker_b = build_draft_store("sqlite", db_path)
+    worker_a.put("saved-draft", draft.Script_file(1080, 1920))
+    monkeypatch.setattr(draft_cache, "DRAFT_CACHE", worker_a)
+    monkeypatch.setattr(save_draft_impl, "DRAFT_CACHE", worker_a)
+    monkeypatch.setattr(save_draft_impl, "IS_UPLOAD_DRAFT", False)
+    attempts = []
+
+    def update_media_metadata(script, task_id=None, probes=None):
+        if not attempts:
+            # Another worker adds a track between our read and our write
+            other = worker_b.get("saved-draft")
+            other.add_track(draft.Track_type.audio)
+            worker_b.put("saved-draft", other)
+        attempts.append(script)
+
+    monkeypatch.setattr(save_draft_impl, "update_media_metadata", update_media_metadata)
+    create_task("saved-draft")
+
+    save_draft_impl.save_draft_background("saved-draft", str(tmp_path / "out"), "saved-draft")
+
+    assert get_task_status("saved-draft")["status"] == "completed"
+    assert len(attempts) == 2
+    assert "audio" in build_draft_store("sqlite", db_path).get("saved-draft").tracks
@@ -0,0 +1,35 @@
+import pytest
+
+
+def _linear_from_name(enum_cls, name):
+    """The previous Effect_enum.from_name"""
+    name = name.lower().replace(" ", "").replace("_", "")
+    for effect in enum_cls:
+        if effect.name.lower().replace(" ", "").replace("_", "") == name:
+            return effect
+    return None
+
+
+def test_from_name_matches_linear_scan():
+    import pyJianYingDraft as draft
+
+    for enum_cls in (draft.Video_scene_effect_type, draft.CapCut_Video_scene_effect_type, draft.Filter_type, draft.Intro_type):
+        for effect in enum_cls:
+            for query in (effect.name, effect.name.upper(), effect.name.replace("_", " ")):
+                assert enum_cls.from_name(query) is _linear_from_name(enum_cls, query)
+
+
+def test_from_name_suggests_close_names():
+    import pyJianYingDraft as draft
+
+    with pytest.raises(ValueError, match="did you mean: Glitch"):
+        draft.CapCut_Video_scene_effect_type.from_name("glich")
+
+
+def test_suggest_ranks_by_similarity_and_respects_limit():
+    import pyJianYingDraft as draft
+
+    effects = draft.CapCut_Video_scene_effect_type
+    assert effects.suggest("Glitch")[0] is effects.from_name("Glitch")
+    assert len(effects.suggest("Glitch", limit=2)) <= 2
+    assert effects.suggest("zzzzzz") == []
@@ -0,0 +1,116 @@
+import pickle
+
+
+def _video_segment():
+    import pyJianYingDraft as draft
+
+    material = draft.Video_material(material_type="photo", replace_path="/tmp/frame.png", remote_url="https://example.com/frame.png",
+                                    material_name="frame.png", duration=10_000_000, width=1080, height=1920)
+    return draft.Video_segment(material, draft.Timerange(0, 1_000_000))
+
+
+def test_unchanged_segment_reuses_previous_export():
+    segment = _video_segment()
+
+    first = segment.export_cached_json()
+
+    assert segment.export_cached_json() is first
+    assert first == segment.export_json()
+
+
+def test_segment_methods_mark_the_segment_dirty():
+    import pyJianYingDraft as draft
+    from pyJianYingDraft.keyframe import Keyframe_property
+    from pyJianYingDraft.text_segment import TextStyleRange
+
+    segment = draft.Text_segment("hello", draft.Timerange(0, 1_000_000))
+    edits = [
+        lambda: segment.add_keyframe(Keyframe_property.alpha, 0, 0.3),
+        lambda: segment.add_keyframe(Keyframe_property.alpha, 100, 0.6),
+        lambda: segment.add_text_style(TextStyleRange(0, 2, draft.Text_style(size=20.0))),
+        lambda: setattr(segment, "start", 500_000),
+        lambda: setattr(segment, "duration", 2_000_000),
+    ]
+    for edit in edits:
+        before = segment.export_cached_json()
+        edit()
+        assert segment.export_cached_json() is not before
+        assert segment.export_cached_json() == segment.export_json()
+
+
+def test_direct_edits_are_picked_up_without_mark_dirty():
+    import pyJianYingDraft as draft
+
+    segment = _video_segment()
+    segment.source_timerange = draft.Timerange(0, 1_000_000)
+    edits = [
+        lambda: setattr(segment.target_timerange, "start", 250_000),
+        lambda: setattr(segment.source_timerange, "duration", 500_000),
+        lambda: setattr(segment.clip_settings, "transform_x", 0.5),
+        lambda: setattr(segment.speed, "speed", 2.0),
+        lambda: setattr(segment, "volume", 0.3),
+        lambda: setattr(segment, "target_timerange", draft.Timerange(0, 3_000_000)),
+    ]
+    for edit in edits:
+        before = segment.export_cached_json()
+        edit()
+        assert segment.export_cached_json() is not before
+        assert segment.export_cached_json() == segment.export_json()
+
+
+def test_other_in_place_edits_are_exported_after_mark_dirty():
+    from pyJianYingDraft.keyframe import Keyframe_property
+
+    segment = _video_segment()
+    segment.add_keyframe(Keyframe_property.alpha, 0, 0.3)
+    segment.export_cached_json()
+
+    segment.common_keyframes[0].keyframes[0].time_offset = 100
+    assert segment.export_cached_json()["common_keyframes"][0]["keyframe_list"][0]["time_offset"] == 0
+
+    segment.mark_dirty()
+    assert segment.export_cached_json()["common_keyframes"][0]["keyframe_list"][0]["time_offset"] == 100
+
+
+def test_track_export_picks_up_marked_edits():
+    import pyJianYingDraft as draft
+
+    script = draft.Script_file(1080, 1920)
+    script.add_track(draft.Track_type.text)
+    segments = [draft.Text_segment(f"line {index}", draft.Timerange(index * 1_000_000, 1_000_000)) for index in range(3)]
+    for segment in segments:
+        script.add_segment(segment)
+    script.dumps()
+
+    segments[2].start = 2_500_000
+
+    exported = script.export_content()["tracks"][0]["segments"]
+    assert [seg["target_timerange"]["start"] for seg in exported] == [0, 1_000_000, 2_500_000]
+    assert all(seg["render_index"] == 15000 for seg in exported)
+    assert "render_index" not in segments[0].export_cached_json()
+
+
+def test_fit_segment_to_duration_marks_the_segment_dirty():
+    import pyJianYingDraft as draft
+    from save_draft_impl import _fit_segment_to_duration
+
+    material = draft.Video_material(material_type="video", replace_path="/tmp/clip.mp4", remote_url="https://example.com/clip.mp4",
+                                    material_name="clip.mp4", duration=10_000_000, width=1080, height=1920)
+    segment = draft.Video_segment(material, draft.Timerange(0, 1_000_000),
+                                  source_timerange=draft.Timerange(0, 1_000_000), speed=1.0)
+    segment.export_cached_json()
+
+    _fit_segment_to_duration(segment, 400_000, "Video")
+
+    assert segment.export_cached_json()["target_timerange"]["duration"] == 400_000
+
+
+def test_pickled_segment_drops_the_cache():
+    segment = _video_segment()
+    segment.export_cached_json()
+
+    restored = pickle.loads(pickle.dumps(segment))
+
+    assert "_export_cache" not in restored.__dict__
+    restored.duration = 2_000_000
+    assert restored.export_cached_json()["target_timerange"]["duration"] == 2_000_000
@@ -0,0 +1,39 @@
+import pytest
+
+
+@pytest.mark.parametrize("extension, options", [
+    ("png", {}),
+    ("gif", {}),
+    ("jpg", {}),
+    ("jpg", {"progressive": True, "exif": b"Exif\x00\x00" + b"\x00" * 40000}),
+    ("webp", {"lossless": True}),
+    ("webp", {"lossless": False}),
+])
+def test_header_dimensions_match_full_decode(tmp_path, extension, options):
+    from PIL import Image
+    from image_size import get_image_size
+
+    path = str(tmp_path / f"image.{extension}")
+    Image.new("RGB", (321, 123), (200, 30, 60)).save(path, **options)
+
+    assert get_image_size(path) == (321, 123)
+
+
+def test_webp_with_alpha_uses_extended_header(tmp_path):
+    from PIL import Image
+    from image_size import read_head, sniff_image_size
+
+    path = str(tmp_path / "alpha.webp")
+    Image.new("RGBA", (77, 99), (0, 0, 0, 0)).save(path, lossless=False)
+
+    assert sniff_image_size(read_head(path, 64)) == (77, 99)
+
+
+def test_unknown_formats_are_not_guessed(tmp_path):
+    from image_size import get_image_size, sniff_image_size
+
+    path = tmp_path / "image.bmp"
+    path.write_bytes(b"BM" + b"\x00" * 100)
+
+    assert get_image_size(str(path)) is None
+    assert sniff_image_size(b"\x89PNG\r\n\x1a\n") is None
@@ -0,0 +1,110 @@
+import threading
+import time
+
+
+def test_probes_run_concurrently_and_are_cached(tmp_path, monkeypatch):
+    import media_probe
+
+    monkeypatch.setattr(media_probe, "MEDIA_METADATA_CACHE", media_probe.MediaMetadataCache(str(tmp_path / "media.db")))
+    monkeypatch.setattr(media_probe, "content_validator", lambda url: '"etag-1"')
+    monkeypatch.setitem(media_probe.MEDIA_PROBE_CONFIG, "workers", 4)
+
+    active = []
+    peak = [0]
+    calls = []
+    lock = threading.Lock()
+
+    def fake_probe(url):
+        with lock:
+            calls.append(url)
+            active.append(url)
+            peak[0] = max(peak[0], len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(url)
+        return {"width": 640, "height": 360, "duration": 1.5}
+
+    monkeypatch.setitem(media_probe.PROBERS, media_probe.VIDEO, fake_probe)
+    items = [(f"https://example.com/{index}.mp4", media_probe.VIDEO) for index in range(8)]
+
+    results = media_probe.probe_media(items + items[:2])
+    assert len(results) == 8
+    assert all(result["duration"] == 1.5 for result in results.values())
+    assert sorted(calls) == sorted(url for url, _ in items)
+    assert 1 < peak[0] <= 4
+
+    # A second draft using the same media does not probe again
+    calls.clear()
+    media_probe.probe_media(items)
+    assert calls == []
+
+    # Changed content is probed again
+    monkeypatch.setattr(media_probe, "content_validator", lambda url: '"etag-2"')
+    media_probe.probe_media(items[:1])
+    assert calls == [items[0][0]]
+
+
+def test_failed_probes_are_not_cached(tmp_path, monkeypatch):
+    import media_probe
+
+    monkeypatch.setattr(media_probe, "MEDIA_METADATA_CACHE", media_probe.MediaMetadataCache(str(tmp_path / "media.db")))
+    monkeypatch.setattr(media_probe, "content_validator", lambda url: None)
+
+    def broken_probe(url):
+        raise RuntimeError("ffprobe failed")
+
+    monkeypatch.setitem(media_probe.PROBERS, media_probe.PHOTO, broken_probe)
+    assert media_probe.probe_one("https://example.com/a.png", media_probe.PHOTO) is None
+    assert media_probe.MEDIA_METADATA_CACHE.get("https://example.com/a.png", media_probe.PHOTO, None) is None
+
+
+def _fake_ffprobe(monkeypatch, payload):
+    import json
+    import subprocess
+    import media_probe
+
+    calls = []
+
+    def run(command, **kwargs):
+        calls.append(command)
+        return subprocess.CompletedProcess(command, 0, stdout=json.dumps(payload), stderr="")
+
+    monkeypatch.setattr(media_probe.subprocess, "run", run)
+    return calls
+
+
+def test_single_ffprobe_serves_audio_video_and_duration_queries(monkeypatch):
+    import media_probe
+    from get_duration_impl import get_video_duration
+
+    calls = _fake_ffprobe(monkeypatch, {
+        "streams": [
+            {"codec_type": "video", "codec_name": "h264", "width": 1920, "height": 1080, "duration": "12.5"},
+            {"codec_type": "audio", "codec_name": "aac", "duration": "12.48"},
+        ],
+        "format": {"duration": "12.52", "format_name": "mov,mp4,m4a,3gp,3g2,mj2"},
+    })
+
+    info = media_probe.inspect_media("https://example.com/clip.mp4")
+    assert info["duration"] == 12.5
+    assert (info["width"], info["height"]) == (1920, 1080)
+    assert (info["video_codec"], info["audio_codec"]) == ("h264", "aac")
+    assert info["stream_types"] == ["video", "audio"]
+
+    assert media_probe.PROBERS[media_probe.VIDEO]("https://example.com/clip.mp4") == {
+        "width": 1920, "height": 1080, "duration": 12.5}
+    # An "audio" material that turns out to contain video is detected by the same single call
+    assert media_probe.PROBERS[media_probe.AUDIO]("https://example.com/clip.mp4")["has_video"] is True
+    assert get_video_duration("https://example.com/clip.mp4") == {"success": True, "output": 12.5, "error": None}
+    assert len(calls) == 4
+
+
+def test_audio_duration_falls_back_to_container(monkeypatch):
+    import media_probe
+
+    _fake_ffprobe(monkeypatch, {
+        "streams": [{"codec_type": "audio", "codec_name": "mp3"}],
+        "format": {"duration": "3.25", "format_name": "mp3"},
+    })
+
+    assert media_probe.PROBERS[media_probe.AUDIO]("https://example.com/a.mp3") == {"has_video": False, "duration": 3.25}
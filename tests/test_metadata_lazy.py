@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_does_not_build_effect_catalogs():
+    code = (
+        "import sys, pyJianYingDraft\n"
+        "print(sorted(m.rsplit('.', 1)[1] for m in sys.modules if m.startswith('pyJianYingDraft.metadata.')))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+
+    assert output.strip() == "['capcut_mask_meta', 'catalog', 'catalog_search', 'effect_meta', 'mask_meta']"
+
+
+def test_catalogs_load_on_first_access():
+    import pyJianYingDraft as draft
+    from pyJianYingDraft import metadata
+    from pyJianYingDraft.metadata.video_effect_meta import Video_scene_effect_type
+
+    assert draft.Video_scene_effect_type is Video_scene_effect_type
+    assert metadata.Video_scene_effect_type is Video_scene_effect_type
+    assert set(metadata._LAZY_IMPORTS) <= set(dir(draft))
+    for name in draft.__all__:
+        assert getattr(draft, name) is not None
@@ -0,0 +1,44 @@
+import random
+from types import SimpleNamespace
+
+
+def _segment(index, start, duration):
+    from pyJianYingDraft import Timerange
+
+    timerange = Timerange(start, duration)
+    return SimpleNamespace(
+        segment_id=f"seg-{index}",
+        target_timerange=timerange,
+        overlaps=lambda other: timerange.overlaps(other.target_timerange),
+    )
+
+
+def _pairwise_resolution(segments):
+    """The original quadratic resolver, kept as the reference semantics"""
+    to_remove = set()
+    for i in range(len(segments)):
+        if i in to_remove:
+            continue
+        for j in range(len(segments)):
+            if i == j or j in to_remove:
+                continue
+            if segments[i].overlaps(segments[j]):
+                to_remove.add(max(i, j))
+    return [segment for index, segment in enumerate(segments) if index not in to_remove]
+
+
+def test_sweep_matches_pairwise_resolution():
+    from save_draft_impl import resolve_segment_overlaps
+
+    rng = random.Random(20240601)
+    for _ in range(300):
+        segments = [
+            _segment(index, rng.randrange(0, 50), rng.choice([0, 1, 2, 5, 10, 20]))
+            for index in range(rng.randrange(0, 40))
+        ]
+        track = SimpleNamespace(segments=list(segments))
+        removed = resolve_segment_overlaps(track)
+
+        expected = _pairwise_resolution(segments)
+        assert [seg.segment_id for seg in track.segments] == [seg.segment_id for seg in expected]
+        assert len(removed) + len(track.segments) == len(segments)
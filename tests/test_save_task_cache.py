@@ -0,0 +1,131 @@
+import threading
+
+
+def test_finished_tasks_expire_after_ttl(monkeypatch):
+    import save_task_cache
+    from save_task_cache import TaskStatusStore
+
+    now = [1000.0]
+    monkeypatch.setattr(save_task_cache.time, "monotonic", lambda: now[0])
+    store = TaskStatusStore(finished_ttl=60, max_finished=2)
+
+    store.update("running", status="processing")
+    store.update("done", status="completed", progress=100)
+    now[0] += 30
+    assert store.get("done")["progress"] == 100
+
+    now[0] += 31
+    assert store.get("done") is None
+    # Unfinished tasks are never expired
+    assert store.get("running")["status"] == "processing"
+
+    for task_id in ("a", "b", "c"):
+        store.update(task_id, status="failed")
+    assert store.get("a") is None
+    assert store.get("c")["status"] == "failed"
+
+
+def test_multi_field_updates_are_atomic():
+    from save_task_cache import TaskStatusStore
+
+    store = TaskStatusStore()
+    store.update("task", status="processing")
+    stop = threading.Event()
+    torn_reads = []
+
+    def writer():
+        for completed in range(1, 2001):
+            store.update("task", completed_files=completed, progress=completed, message=f"{completed}")
+        stop.set()
+
+    def reader():
+        while not stop.is_set():
+            status = store.get("task")
+            if not (status["completed_files"] == status["progress"] == int(status["message"])):
+                torn_reads.append(status)
+
+    store.update("task", message="0")
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert torn_reads == []
+    assert store.get("task")["completed_files"] == 2000
+
+
+def test_wait_returns_on_change_or_timeout():
+    from save_task_cache import TaskStatusStore
+
+    store = TaskStatusStore()
+    store.update("task", status="processing", progress=10)
+    version = store.get("task")["version"]
+
+    assert store.wait("task", version, timeout=0.01)["version"] == version
+    assert store.wait("missing", 0, timeout=0.01) is None
+
+    timer = threading.Timer(0.05, store.update, args=("task",), kwargs={"progress": 50})
+    timer.start()
+    changed = store.wait("task", version, timeout=5)
+    timer.join()
+    assert changed["progress"] == 50
+    assert changed["version"] > version
+
+
+def test_status_stream_pushes_each_change_until_finished():
+    import capcut_server
+    from save_task_cache import create_task, update_task_fields
+
+    create_task("streamed")
+
+    def progress():
+        for percent in (40, 80):
+            update_task_fields("streamed", progress=percent)
+        update_task_fields("streamed", status="completed", progress=100)
+
+    timer = threading.Timer(0.05, progress)
+    timer.start()
+    client = capcut_server.app.test_client()
+    body = client.get("/stream_draft_status?task_id=streamed").get_data(as_text=True)
+    timer.join()
+
+    events = [event for event in body.split("\n\n") if event.startswith("id:")]
+    assert events, body
+    assert '"status": "completed"' in events[-1]
+    versions = [int(event.split("\n")[0][4:]) for event in events]
+    assert versions == sorted(set(versions))
+
+
+def test_status_endpoints_reject_malformed_versions():
+    import capcut_server
+    from save_task_cache import create_task
+
+    create_task("malformed")
+    client = capcut_server.app.test_client()
+
+    streamed = client.get("/stream_draft_status?task_id=malformed", headers={"Last-Event-ID": "abc"})
+    polled = client.post("/query_draft_status", json={"task_id": "malformed", "timeout": "soon"})
+
+    assert streamed.status_code == 200 and streamed.json["success"] is False
+    assert polled.status_code == 200 and polled.json["success"] is False
+    assert "timeout" in polled.json["error"]
+
+
+def test_reconnecting_to_a_finished_stream_stops_the_client():
+    import capcut_server
+    from save_task_cache import create_task, get_task_status, update_task_fields
+
+    create_task("finished")
+    update_task_fields("finished", status="completed", progress=100)
+    final_version = get_task_status("finished")["version"]
+    client = capcut_server.app.test_client()
+
+    first = client.get("/stream_draft_status?task_id=finished").get_data(as_text=True)
+    reconnect = client.get("/stream_draft_status?task_id=finished", headers={"Last-Event-ID": str(final_version)})
+    behind = client.get("/stream_draft_status?task_id=finished",
+                        headers={"Last-Event-ID": str(final_version - 1)}).get_data(as_text=True)
+
+    assert first.startswith(f"id: {final_version}\n") and '"status": "completed"' in first
+    assert reconnect.status_code == 204
+    assert '"status": "completed"' in behind
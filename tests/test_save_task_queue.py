@@ -0,0 +1,153 @@
+import os
+import threading
+
+import pytest
+
+
+def test_queue_rejects_submissions_beyond_depth_limit():
+    from save_task_queue import SaveTaskQueue, TaskAlreadyQueued, TaskQueueFull
+
+    queue = SaveTaskQueue(max_workers=1, max_queue_size=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+
+    queue.submit("running", blocking)
+    assert started.wait(5)
+    queue.submit("waiting", blocking)
+
+    with pytest.raises(TaskAlreadyQueued):
+        queue.submit("waiting", blocking)
+    with pytest.raises(TaskQueueFull):
+        queue.submit("rejected", blocking)
+    assert queue.stats()["waiting"] == 1
+
+    assert queue.cancel("waiting") == "cancelled"
+    assert queue.cancel("running") == "cancelling"
+    assert queue.cancel("unknown") == "not_found"
+    release.set()
+
+
+def test_async_save_can_be_cancelled_while_queued(monkeypatch):
+    import save_draft_impl
+    from save_task_cache import get_task_status
+    from save_task_queue import SaveTaskQueue
+
+    queue = SaveTaskQueue(max_workers=1, max_queue_size=4)
+    monkeypatch.setattr(save_draft_impl, "SAVE_TASK_QUEUE", queue)
+    release = threading.Event()
+    queue.submit("blocker", release.wait, 5)
+
+    result = save_draft_impl.save_draft_impl("queued-draft", is_async=True)
+    assert result == {"success": True, "task_id": "queued-draft", "draft_url": ""}
+    assert get_task_status("queued-draft")["status"] == "initialized"
+
+    cancelled = save_draft_impl.cancel_save_task("queued-draft")
+    release.set()
+
+    assert cancelled == {"success": True, "status": "cancelled"}
+    assert get_task_status("queued-draft")["status"] == "cancelled"
+
+
+def test_download_script_runs_outside_the_save_queue(tmp_path, monkeypatch):
+    import save_draft_impl
+
+    monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    script_data = {"materials": {"audios": [], "videos": []}}
+
+    result = save_draft_impl.download_script("downloaded-draft", str(tmp_path), script_data)
+
+    assert result == {"success": True, "message": "Draft downloaded-draft and its assets downloaded successfully"}
+    assert (tmp_path / "downloaded-draft").is_dir()
+
+
+def test_duplicate_save_leaves_the_queued_task_untouched(monkeypatch):
+    import save_draft_impl
+    from save_task_cache import get_task_status, update_task_fields
+    from save_task_queue import SaveTaskQueue
+
+    queue = SaveTaskQueue(max_workers=1, max_queue_size=4)
+    monkeypatch.setattr(save_draft_impl, "SAVE_TASK_QUEUE", queue)
+    release = threading.Event()
+    queue.submit("blocker", release.wait, 5)
+
+    assert save_draft_impl.save_draft_impl("busy-draft", is_async=True)["success"]
+    update_task_fields("busy-draft", status="processing", progress=40)
+    before = get_task_status("busy-draft")
+
+    duplicate = save_draft_impl.save_draft_impl("busy-draft", is_async=True)
+    synchronous = save_draft_impl.save_draft_impl("busy-draft")
+
+    assert not duplicate["success"] and "already queued" in duplicate["error"]
+    assert not synchronous["success"] and "already queued" in synchronous["error"]
+    assert get_task_status("busy-draft") == before
+    assert queue.cancel("busy-draft") == "cancelled"
+    release.set()
+
+
+def test_inline_run_blocks_queueing_the_same_task():
+    from save_task_queue import SaveTaskQueue, TaskAlreadyQueued
+
+    queue = SaveTaskQueue(max_workers=1, max_queue_size=1)
+    accepted = []
+
+    def inline():
+        with pytest.raises(TaskAlreadyQueued):
+            queue.submit("draft", accepted.append, "queued", on_accept=lambda: accepted.append("rejected"))
+        return "saved"
+
+    assert queue.run("draft", inline, on_accept=lambda: accepted.append("inline")) == "saved"
+    assert accepted == ["inline"]
+    queue.submit("draft", lambda: None)
+
+
+def test_full_queue_leaves_the_last_save_status_untouched(monkeypatch):
+    import save_draft_impl
+    from save_task_cache import create_task, get_task_status, update_task_fields
+    from save_task_queue import SaveTaskQueue
+
+    queue = SaveTaskQueue(max_workers=1, max_queue_size=1)
+    monkeypatch.setattr(save_draft_impl, "SAVE_TASK_QUEUE", queue)
+    release = threading.Event()
+    queue.run("saved-draft", lambda: None, on_accept=lambda: create_task("saved-draft"))
+    update_task_fields("saved-draft", status="completed", progress=100, draft_url="https://example.com/draft.zip")
+    before = get_task_status("saved-draft")
+    started = threading.Event()
+    queue.submit("blocker", lambda: started.set() or release.wait(5))
+    assert started.wait(5)
+    queue.submit("waiting", release.wait, 5)
+
+    result = save_draft_impl.save_draft_impl("saved-draft", is_async=True)
+    rejected = save_draft_impl.save_draft_impl("never-saved-draft", is_async=True)
+    release.set()
+
+    assert not result["success"] and "full" in result["error"]
+    assert not rejected["success"]
+    assert get_task_status("saved-draft") == before
+    assert get_task_status("never-saved-draft")["status"] == "not_found"
+
+
+def test_finished_task_can_be_resubmitted_at_once():
+    from save_task_queue import SaveTaskQueue
+
+    queue = SaveTaskQueue(max_workers=1, max_queue_size=1)
+    for _ in range(50):
+        gate = threading.Event()
+        queue.submit("draft", gate.wait, 5)
+        future = queue._futures["draft"]
+        gate.set()
+        # The task is forgotten before its future resolves, so resubmitting never races the cleanup
+        assert future.result(5)
+
+    release, started, ran = threading.Event(), threading.Event(), threading.Event()
+    queue.submit("blocker", lambda: started.set() or release.wait(5))
+    assert started.wait(5)
+    queue.submit("cancelled", ran.set)
+    assert queue.cancel("cancelled") == "cancelled"
+    assert queue.stats()["waiting"] == 0
+    queue.submit("cancelled", lambda: None)
+    release.set()
+    assert not ran.is_set()
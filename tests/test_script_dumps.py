@@ -0,0 +1,61 @@
+import json
+
+
+def _script():
+    import pyJianYingDraft as draft
+
+    script = draft.Script_file(1080, 1920)
+    script.add_track(draft.Track_type.text)
+    for index in range(5):
+        script.add_segment(draft.Text_segment(f"第{index}行", draft.Timerange(index * 1_000_000, 1_000_000)))
+    return script
+
+
+def test_compact_dumps_matches_pretty_output():
+    script = _script()
+
+    pretty = script.dumps()
+    compact = script.dumps(indent=None)
+
+    assert json.loads(compact) == json.loads(pretty)
+    assert "\n" in pretty
+    assert "\n" not in compact and len(compact) < len(pretty)
+    # Non-ASCII text is kept as is rather than escaped
+    assert "第0行" in compact
+
+
+def test_compact_dumps_without_orjson(monkeypatch):
+    from pyJianYingDraft import script_file
+
+    script = _script()
+    expected = json.loads(script.dumps(indent=None))
+
+    monkeypatch.setattr(script_file, "orjson", None)
+
+    assert json.loads(script.dumps(indent=None)) == expected
+
+
+def test_dumps_compact_falls_back_for_unsupported_values():
+    from pyJianYingDraft.script_file import dumps_compact
+
+    assert json.loads(dumps_compact({"big": 2 ** 70})) == {"big": 2 ** 70}
+
+
+def test_template_is_parsed_once_and_copied_per_draft():
+    import os
+
+    import pyJianYingDraft as draft
+    from pyJianYingDraft import script_file
+
+    template_path = os.path.join(os.path.dirname(script_file.__file__), draft.Script_file.TEMPLATE_FILE)
+    with open(template_path, "r", encoding="utf-8") as f:
+        template = json.load(f)
+
+    first = draft.Script_file(1080, 1920)
+    parsed = script_file._template_snapshot.cache_info().misses
+    second = draft.Script_file(1080, 1920)
+
+    assert script_file._template_snapshot.cache_info().misses == parsed
+    assert first.content == template and second.content == template
+    first.content["materials"]["videos"].append({"id": "changed"})
+    assert second.content == template
@@ -0,0 +1,59 @@
+import pickle
+
+
+def _shared_animation_segments(count):
+    import pyJianYingDraft as draft
+    from pyJianYingDraft.animation import Segment_animations
+
+    material = draft.Video_material(material_type="photo", replace_path="/tmp/frame.png", remote_url="https://example.com/frame.png",
+                                    material_name="frame.png", duration=10_000_000, width=1080, height=1920)
+    segments = [draft.Video_segment(material, draft.Timerange(index * 1_000_000, 1_000_000)) for index in range(count)]
+    animations = Segment_animations()
+    for segment in segments:
+        segment.animations_instance = animations
+    return segments
+
+
+def test_shared_materials_are_added_once():
+    import pyJianYingDraft as draft
+
+    script = draft.Script_file(1080, 1920)
+    script.add_track(draft.Track_type.video)
+    for segment in _shared_animation_segments(5):
+        script.add_segment(segment)
+
+    assert len(script.materials.animations) == 1
+    assert len(script.materials.videos) == 1
+    assert script.materials.animations[0] in script.materials
+
+
+def test_index_follows_appends_and_invalidation():
+    from pyJianYingDraft.script_file import Script_material
+
+    materials = Script_material()
+    animations = _shared_animation_segments(1)[0].animations_instance
+    assert animations not in materials
+
+    materials.animations.append(animations)
+    assert animations in materials
+
+    materials.animations.remove(animations)
+    materials.invalidate_index()
+    assert animations not in materials
+
+    materials.animations = [animations]
+    assert animations in materials
+
+
+def test_index_survives_pickling():
+    import pyJianYingDraft as draft
+
+    script = draft.Script_file(1080, 1920)
+    script.add_track(draft.Track_type.video)
+    for segment in _shared_animation_segments(2):
+        script.add_segment(segment)
+
+    restored = pickle.loads(pickle.dumps(script))
+
+    assert restored.materials.animations[0] in restored.materials
+    assert restored.materials.videos[0] in restored.materials
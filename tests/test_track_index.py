@@ -0,0 +1,83 @@
+import random
+
+
+def _text_segment(start, duration):
+    import pyJianYingDraft as draft
+
+    return draft.Text_segment("line", draft.Timerange(start, duration))
+
+
+def test_indexed_overlap_check_and_lookup_match_linear_scan():
+    import pyJianYingDraft as draft
+    from pyJianYingDraft.track import Track
+    from pyJianYingDraft.exceptions import SegmentOverlap
+
+    rng = random.Random(7)
+    for _ in range(100):
+        track = Track(draft.Track_type.text, "text", 0, False)
+        for _ in range(60):
+            segment = _text_segment(rng.randrange(0, 200), rng.choice([0, 1, 3, 10]))
+            expected_overlap = any(seg.overlaps(segment) for seg in track.segments)
+            try:
+                track.add_segment(segment)
+                overlapped = False
+            except SegmentOverlap:
+                overlapped = True
+            assert overlapped == expected_overlap
+
+        for time in range(-1, 215):
+            expected = next((seg for seg in track.segments
+                             if seg.target_timerange.start <= time <= seg.target_timerange.end), None)
+            assert track.segment_at(time) is expected
+
+
+def test_index_follows_segment_edits():
+    import pyJianYingDraft as draft
+    from pyJianYingDraft.track import Track
+    from pyJianYingDraft.exceptions import SegmentOverlap
+
+    track = Track(draft.Track_type.text, "text", 0, False)
+    first, second = _text_segment(0, 10), _text_segment(10, 10)
+    track.add_segment(first).add_segment(second)
+
+    # Removing a segment is picked up automatically
+    track.segments.remove(second)
+    assert track.segment_at(15) is None
+    track.add_segment(_text_segment(10, 10))
+
+    # Replacing or editing a timerange is picked up as well
+    first.target_timerange = draft.Timerange(0, 5)
+    assert track.segment_at(7) is None
+    track.add_segment(_text_segment(5, 5))
+    try:
+        track.add_segment(_text_segment(3, 1))
+        raise AssertionError("overlap not detected")
+    except SegmentOverlap:
+        pass
+
+
+def test_index_follows_in_place_timerange_edits():
+    import pyJianYingDraft as draft
+    from pyJianYingDraft.track import Track
+    from pyJianYingDraft.exceptions import SegmentOverlap
+
+    track = Track(draft.Track_type.text, "text", 0, False)
+    first, second, third = _text_segment(0, 10), _text_segment(10, 10), _text_segment(20, 10)
+    track.add_segment(first).add_segment(second).add_segment(third)
+
+    second.start = 40
+    assert track.segment_at(15) is None
+    assert track.segment_at(45) is second
+    track.add_segment(_text_segment(10, 10))
+
+    third.duration = 15
+    assert track.segment_at(33) is third
+    try:
+        track.add_segment(_text_segment(30, 5))
+        raise AssertionError("overlap not detected")
+    except SegmentOverlap:
+        pass
+
+    first.target_timerange.duration = 5
+    track.add_segment(_text_segment(5, 5))
+    assert track.segment_at(7).target_timerange.start == 5
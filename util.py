@@ -8,6 +8,9 @@ import functools
 import time
 from settings.local import DRAFT_DOMAIN, PREVIEW_ROUTER, IS_CAPCUT_ENV
 
+# Linux FICLONE ioctl, clones a file on copy-on-write filesystems (btrfs, xfs) without copying data
+FICLONE = 0x40049409
+
 def hex_to_rgb(hex_color: str) -> tuple:
     """Convert hexadecimal color code to RGB tuple (range 0.0-1.0)"""
     hex_color = hex_color.lstrip('#')
@@ -93,3 +96,29 @@ def timing_decorator(func_name):
 
 def generate_draft_url(draft_id):
     return f"{DRAFT_DOMAIN}{PREVIEW_ROUTER}?draft_id={draft_id}&is_capcut={1 if IS_CAPCUT_ENV else 0}"
+
+def link_or_copy(src: str, dst: str) -> str:
+    """Materialize `src` at `dst` as cheaply as the filesystem allows
+
+    :return: "hardlink", "reflink" or "copy"
+    """
+    directory = os.path.dirname(dst)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        # Different filesystem or links not supported
+        pass
+    try:
+        import fcntl
+        with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+        return "reflink"
+    except (ImportError, OSError):
+        pass
+    shutil.copyfile(src, dst)
+    return "copy"